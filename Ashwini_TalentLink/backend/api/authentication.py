@@ -0,0 +1,172 @@
+import threading
+import time
+
+from django.contrib.auth import get_user_model
+from django.utils.functional import SimpleLazyObject
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken, TokenError
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+USER_TYPE_CLAIM = 'user_type'
+# user_type claim of users without a profile yet: no role-gated permission
+# matches it, but they can still authenticate (e.g. to create the profile)
+NO_PROFILE = 'none'
+
+
+# --- Revocation ---------------------------------------------------------------
+# Tokens carry the user's role, so a role change or deactivation has to
+# invalidate the tokens issued before it. We remember, per user id, the time of
+# the last such change and reject tokens issued ("iat") before it. The set is
+# kept in memory, per process; an entry is dropped once every access token it
+# could reject has expired anyway.
+
+class RevocationList:
+    def __init__(self):
+        self._revoked = {}
+        self._lock = threading.Lock()
+
+    # keys are str(user_id): the token claim may be a string
+
+    def revoke(self, user_id, user_type=None):
+        """Revoke older tokens; `user_type` is the role that stays valid (None for none)."""
+        now = int(time.time())
+        with self._lock:
+            self._prune(now)
+            self._revoked[str(user_id)] = (now, user_type)
+
+    def _prune(self, now):
+        # tokens issued before `revoked_at` expire by revoked_at + lifetime
+        cutoff = now - api_settings.ACCESS_TOKEN_LIFETIME.total_seconds()
+        for user_id in [key for key, (revoked_at, _) in self._revoked.items() if revoked_at < cutoff]:
+            del self._revoked[user_id]
+
+    def __len__(self):
+        return len(self._revoked)
+
+    def is_revoked(self, user_id, issued_at, user_type):
+        entry = self._revoked.get(str(user_id))
+        if entry is None:
+            return False
+        revoked_at, valid_type = entry
+        if issued_at is None or issued_at < revoked_at:
+            return True
+        # "iat" has one-second resolution: within the revocation's own second
+        # only tokens that already carry the new role are accepted
+        return issued_at == revoked_at and (valid_type is None or user_type != valid_type)
+
+    def clear(self):
+        with self._lock:
+            self._revoked.clear()
+
+
+revocations = RevocationList()
+
+
+# --- Tokens -------------------------------------------------------------------
+
+def current_user_type(user_id):
+    """Role of an active user (NO_PROFILE without a profile), or None if the user is inactive or gone."""
+    rows = list(
+        get_user_model().objects.filter(pk=user_id, is_active=True)
+        .values_list('profile__user_type', flat=True)
+    )
+    if not rows:
+        return None
+    return rows[0] or NO_PROFILE
+
+
+class RoleRefreshToken(RefreshToken):
+    """Refresh token whose access tokens carry the user's current role."""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        profile = getattr(user, 'profile', None)
+        token[USER_TYPE_CLAIM] = profile.user_type if profile is not None else NO_PROFILE
+        return token
+
+    @property
+    def access_token(self):
+        # re-read the role on refresh so a role change only costs one refresh
+        user_id = self.payload.get(api_settings.USER_ID_CLAIM)
+        user_type = current_user_type(user_id)
+        if user_type is None:
+            raise TokenError('User is inactive or no longer exists')
+        self.payload[USER_TYPE_CLAIM] = user_type
+        return super().access_token
+
+
+class RoleTokenObtainPairSerializer(TokenObtainPairSerializer):
+    token_class = RoleRefreshToken
+
+
+class RoleTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = RoleRefreshToken
+
+
+# --- Request user -------------------------------------------------------------
+
+class ClaimProfile:
+    """Stand-in for user.profile that knows user_type from the token."""
+
+    def __init__(self, user, user_type):
+        self._user = user
+        self.user_type = user_type
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            # private / probing lookups (e.g. LazyObject's _mask_wrapped) stay local
+            raise AttributeError(name)
+        # anything but user_type needs the real profile row
+        return getattr(self._user._wrapped_profile(), name)
+
+
+class ClaimUser(SimpleLazyObject):
+    """
+    Lazy user built from token claims.
+
+    id/pk, is_authenticated and profile.user_type come from the token; reading
+    any other attribute loads the real User row (once) and proxies to it.
+    """
+
+    def __init__(self, user_id, user_type):
+        user_id = get_user_model()._meta.pk.to_python(user_id)
+        super().__init__(lambda: get_user_model().objects.get(pk=user_id))
+        self.__dict__['id'] = user_id
+        self.__dict__['pk'] = user_id
+        self.__dict__['profile'] = ClaimProfile(self, user_type)
+
+    is_authenticated = True
+    is_anonymous = False
+    is_active = True  # deactivating a user revokes their tokens
+
+    def __bool__(self):
+        # `request.user and ...` in permission checks must not load the row
+        return True
+
+    def _wrapped_profile(self):
+        return self.__getattr__('profile')
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that trusts the signed user_id / user_type claims instead
+    of loading the user and profile on every request. Tokens without a role
+    claim (issued before it existed) fall back to the normal lookup.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken('Token contained no recognizable user identification')
+
+        user_type = validated_token.get(USER_TYPE_CLAIM)
+        if revocations.is_revoked(user_id, validated_token.get('iat'), user_type):
+            raise AuthenticationFailed('Token has been revoked', code='token_revoked')
+
+        if user_type is None:
+            return super().get_user(validated_token)
+        return ClaimUser(user_id, user_type)
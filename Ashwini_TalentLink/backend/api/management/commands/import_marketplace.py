@@ -0,0 +1,265 @@
+import csv
+import json
+import os
+import time
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from api.models import Profile, Project, Skill, User
+from api.skill_catalogue import bump_skills_version
+
+PROJECT_FIELDS = ('title', 'description', 'budget', 'duration', 'status')
+PROFILE_FIELDS = ('user_type', 'headline', 'bio', 'hourly_rate', 'portfolio_link')
+
+
+class RowError(Exception):
+    pass
+
+
+def read_rows(handle, file_format):
+    """Yields one dict per CSV row / JSONL line, or a RowError for a line that isn't a JSON object."""
+    if file_format == 'csv':
+        yield from csv.DictReader(handle)
+        return
+    for line in handle:
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as exc:
+            yield RowError(f"invalid JSON: {exc}")
+            continue
+        yield row if isinstance(row, dict) else RowError("expected a JSON object")
+
+
+def skill_names(value):
+    # a JSON list, or one "Python, Django" string (CSV)
+    if value in (None, ''):
+        return []
+    names = value if isinstance(value, list) else str(value).split(',')
+    return list(dict.fromkeys(str(name).strip() for name in names if str(name).strip()))
+
+
+def check_username(row, field):
+    """
+    `row` with its username `field` as a string, or a RowError in its place
+    when the value is a list, object or boolean and can't be looked up.
+    """
+    if isinstance(row, RowError):
+        return row
+    value = row.get(field)
+    if value is None or isinstance(value, str):
+        return row
+    if isinstance(value, int) and not isinstance(value, bool):
+        return {**row, field: str(value)}
+    return RowError(f"{field} must be a string, got {json.dumps(value)}")
+
+
+def error_message(exc):
+    if isinstance(exc, ValidationError):
+        return '; '.join(f"{field}: {' '.join(messages)}" for field, messages in exc.message_dict.items())
+    return str(exc)
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream projects or profiles from a CSV / JSONL file into the database with batched bulk_create. "
+        "Progress is checkpointed after every batch so an interrupted import can be resumed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=['projects', 'profiles'])
+        parser.add_argument('path')
+        parser.add_argument('--format', choices=['csv', 'jsonl'], help="Default: from the file extension.")
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--checkpoint', help="Checkpoint file. Default: <path>.checkpoint")
+        parser.add_argument('--resume', action='store_true', help="Continue after the rows in the checkpoint.")
+        parser.add_argument('--restart', action='store_true', help="Ignore an existing checkpoint.")
+        parser.add_argument('--create-skills', action='store_true', help="Create unknown skill names instead of rejecting the row.")
+
+    def handle(self, *args, **options):
+        kind, path = options['kind'], options['path']
+        file_format = options['format'] or ('csv' if path.lower().endswith('.csv') else 'jsonl')
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError("--batch-size must be positive.")
+        self.create_skills = options['create_skills']
+        checkpoint_path = options['checkpoint'] or path + '.checkpoint'
+
+        done = imported = 0
+        if os.path.exists(checkpoint_path) and not options['restart']:
+            if not options['resume']:
+                raise CommandError(f"{checkpoint_path} exists; pass --resume to continue that import or --restart to ignore it.")
+            done, imported = self.read_checkpoint(checkpoint_path, kind, path)
+            self.stdout.write(f"Resuming after row {done}.")
+
+        # every skill name -> id, loaded once; users are looked up per batch and remembered
+        self.skills = dict(Skill.objects.values_list('name', 'id'))
+        self.user_ids = {}
+        import_batch = self.import_projects if kind == 'projects' else self.import_profiles
+
+        failed = 0
+        skipped = done
+        started = time.monotonic()
+        try:
+            handle = open(path, newline='', encoding='utf-8-sig')
+        except OSError as exc:
+            raise CommandError(exc)
+        with handle:
+            rows = read_rows(handle, file_format)
+            for _ in islice(rows, done):
+                pass
+            while True:
+                batch = list(islice(rows, batch_size))
+                if not batch:
+                    break
+                created, errors = import_batch(batch, done + 1)
+                done += len(batch)
+                imported += created
+                failed += len(errors)
+                # after the batch's commit: a crash in between re-imports at most this batch
+                self.write_checkpoint(checkpoint_path, kind, path, done, imported)
+                for row_number, message in errors:
+                    self.stderr.write(f"row {row_number}: {message}")
+                self.report(done, done - skipped, imported, failed, started)
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {imported} {kind} ({failed} row(s) rejected this run) in {elapsed:.1f}s, "
+            f"{self.rate(done - skipped, elapsed)} rows/s. Checkpoint: {checkpoint_path}"
+        ))
+
+    # --- Batches ------------------------------------------------------------
+
+    def import_projects(self, batch, first_row):
+        batch = [check_username(row, 'client') for row in batch]
+        wanted = {row.get('client') for row in batch if isinstance(row, dict)} - self.user_ids.keys()
+        self.user_ids.update(User.objects.filter(username__in=wanted).values_list('username', 'id'))
+
+        projects, skills, errors = [], [], []
+        for row_number, row in enumerate(batch, first_row):
+            try:
+                if isinstance(row, RowError):
+                    raise row
+                client_id = self.user_ids.get(row.get('client'))
+                if client_id is None:
+                    raise RowError(f"unknown client {row.get('client')!r}")
+                names = self.resolve_skills(row.get('skills_required'))
+                project = Project(client_id=client_id, **self.values(row, PROJECT_FIELDS))
+                project.clean_fields(exclude=['client'])
+            except (RowError, ValidationError) as exc:
+                errors.append((row_number, error_message(exc)))
+                continue
+            projects.append(project)
+            skills.append(names)
+
+        with transaction.atomic():
+            self.add_missing_skills(skills)
+            Project.objects.bulk_create(projects)
+            Through = Project.skills_required.through
+            Through.objects.bulk_create([
+                Through(project_id=project.pk, skill_id=self.skills[name])
+                for project, names in zip(projects, skills) for name in names
+            ])
+        return len(projects), errors
+
+    def import_profiles(self, batch, first_row):
+        batch = [check_username(row, 'username') for row in batch]
+        usernames = {row.get('username') for row in batch if isinstance(row, dict)}
+        wanted = usernames - self.user_ids.keys()
+        self.user_ids.update(User.objects.filter(username__in=wanted).values_list('username', 'id'))
+        existing_ids = [self.user_ids[name] for name in usernames if name in self.user_ids]
+        taken = set(Profile.objects.filter(user_id__in=existing_ids).values_list('user_id', flat=True))
+
+        profiles, skills, new_users, errors = [], [], [], []
+        seen = set()
+        for row_number, row in enumerate(batch, first_row):
+            try:
+                if isinstance(row, RowError):
+                    raise row
+                username = row.get('username')
+                if not username:
+                    raise RowError("username is required")
+                if username in seen or self.user_ids.get(username) in taken:
+                    raise RowError(f"{username!r} already has a profile")
+                names = self.resolve_skills(row.get('skills'))
+                profile = Profile(**self.values(row, PROFILE_FIELDS))
+                profile.clean_fields(exclude=['user', 'profile_picture'])
+                user = None
+                if username not in self.user_ids:
+                    # no usable password: the person sets one through a reset
+                    user = User(username=username, email=row.get('email') or '', password=make_password(None))
+                    user.clean_fields(exclude=['password'])
+            except (RowError, ValidationError) as exc:
+                errors.append((row_number, error_message(exc)))
+                continue
+            seen.add(username)
+            profiles.append((username, profile))
+            skills.append(names)
+            if user is not None:
+                new_users.append(user)
+
+        with transaction.atomic():
+            self.add_missing_skills(skills)
+            User.objects.bulk_create(new_users)
+            self.user_ids.update((user.username, user.pk) for user in new_users)
+            for username, profile in profiles:
+                profile.user_id = self.user_ids[username]
+            Profile.objects.bulk_create([profile for _, profile in profiles])
+            Through = Profile.skills.through
+            Through.objects.bulk_create([
+                Through(profile_id=profile.pk, skill_id=self.skills[name])
+                for (_, profile), names in zip(profiles, skills) for name in names
+            ])
+        return len(profiles), errors
+
+    def values(self, row, fields):
+        # blank cells fall back to the model defaults
+        return {field: row[field] for field in fields if row.get(field) not in (None, '')}
+
+    def resolve_skills(self, value):
+        names = skill_names(value)
+        too_long = [name for name in names if len(name) > Skill._meta.get_field('name').max_length]
+        if too_long:
+            raise RowError(f"skill name too long: {too_long[0][:20]}...")
+        unknown = [name for name in names if name not in self.skills]
+        if unknown and not self.create_skills:
+            raise RowError(f"unknown skill(s): {', '.join(unknown)}")
+        return names
+
+    def add_missing_skills(self, skill_lists):
+        missing = {name for names in skill_lists for name in names} - self.skills.keys()
+        if not missing:
+            return
+        Skill.objects.bulk_create([Skill(name=name) for name in missing], ignore_conflicts=True)
+        # ignore_conflicts leaves pks unset, so read them back
+        self.skills.update(Skill.objects.filter(name__in=missing).values_list('name', 'id'))
+        # bulk_create sends no post_save; the skill list snapshot still has to move
+        bump_skills_version()
+
+    # --- Checkpoints & progress ---------------------------------------------
+
+    def read_checkpoint(self, checkpoint_path, kind, path):
+        with open(checkpoint_path, encoding='utf-8') as handle:
+            checkpoint = json.load(handle)
+        if checkpoint.get('kind') != kind or checkpoint.get('path') != os.path.abspath(path):
+            raise CommandError(f"{checkpoint_path} belongs to an import of {checkpoint.get('kind')} from {checkpoint.get('path')}.")
+        return checkpoint['rows'], checkpoint['imported']
+
+    def write_checkpoint(self, checkpoint_path, kind, path, rows, imported):
+        checkpoint = {'kind': kind, 'path': os.path.abspath(path), 'rows': rows, 'imported': imported}
+        partial = checkpoint_path + '.tmp'
+        with open(partial, 'w', encoding='utf-8') as handle:
+            json.dump(checkpoint, handle)
+        os.replace(partial, checkpoint_path)
+
+    def report(self, done, read, imported, failed, started):
+        rate = self.rate(read, time.monotonic() - started)
+        self.stdout.write(f"{done} rows read, {imported} imported, {failed} rejected - {rate} rows/s")
+
+    def rate(self, rows, elapsed):
+        return f"{rows / elapsed:.0f}" if elapsed > 0 else "-"
@@ -14,6 +14,15 @@ class Skill(models.Model):
     def __str__(self):
         return self.name
 
+class CatalogueVersion(models.Model):
+    # one row per cached catalogue (see api/skill_catalogue.py); every process
+    # compares its snapshot's version with the row's
+    name = models.CharField(max_length=50, primary_key=True)
+    version = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.name} v{self.version}"
+
 class Profile(models.Model):
     USER_TYPE_CHOICES = (
         ('freelancer', 'Freelancer'),
@@ -0,0 +1,58 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .authentication import NO_PROFILE, revocations
+from .models import Profile, Skill
+from .skill_catalogue import bump_skills_version
+
+
+# Tokens carry user_type, so revoke them whenever it (or the account) changes
+
+def revoke_on_commit(user_id, user_type=None):
+    transaction.on_commit(lambda: revocations.revoke(user_id, user_type))
+
+
+@receiver(pre_save, sender=Profile)
+def profile_role_changing(sender, instance, **kwargs):
+    if instance.pk is None:
+        return
+    old_type = Profile.objects.filter(pk=instance.pk).values_list('user_type', flat=True).first()
+    if old_type is not None and old_type != instance.user_type:
+        revoke_on_commit(instance.user_id, instance.user_type)
+
+
+@receiver(post_save, sender=Profile)
+def profile_created(sender, instance, created, **kwargs):
+    # tokens issued before the profile carry user_type "none"
+    if created:
+        revoke_on_commit(instance.user_id, instance.user_type)
+
+
+
+@receiver(post_delete, sender=Profile)
+def profile_deleted(sender, instance, **kwargs):
+    # the role goes with the profile; new tokens carry "none"
+    revoke_on_commit(instance.user_id, NO_PROFILE)
+
+@receiver(pre_save, sender=settings.AUTH_USER_MODEL)
+def user_deactivating(sender, instance, **kwargs):
+    if instance.pk is None or instance.is_active:
+        return
+    was_active = sender.objects.filter(pk=instance.pk, is_active=True).exists()
+    if was_active:
+        revoke_on_commit(instance.pk)
+
+
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def user_deleted(sender, instance, **kwargs):
+    revoke_on_commit(instance.pk)
+
+
+# Every process rebuilds its skill list snapshot once the version moves
+
+@receiver(post_save, sender=Skill)
+@receiver(post_delete, sender=Skill)
+def skill_changed(sender, instance, **kwargs):
+    bump_skills_version()
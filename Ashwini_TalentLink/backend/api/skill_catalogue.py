@@ -0,0 +1,95 @@
+import hashlib
+import threading
+import time
+from collections import namedtuple
+
+from django.db import transaction
+from django.db.models import F
+from rest_framework.renderers import JSONRenderer
+
+from .models import CatalogueVersion, Skill
+from .serializers import SkillSerializer
+
+SKILLS_CATALOGUE = 'skills'
+
+
+# --- Version stamp ------------------------------------------------------------
+# Every process keeps its own copy of the encoded skill list, tagged with the
+# version it was built from. The version is a row in the database (shared by
+# all workers); api/signals.py bumps it inside the transaction that changes a
+# Skill, and each process rebuilds once it reads a new number.
+
+def skills_version():
+    version = (
+        CatalogueVersion.objects.filter(pk=SKILLS_CATALOGUE)
+        .values_list('version', flat=True)
+        .first()
+    )
+    return 0 if version is None else version
+
+
+def bump_skills_version():
+    # same transaction as the skill change: no process can see the new rows
+    # under the old version, or the new version before the rows
+    bumped = CatalogueVersion.objects.filter(pk=SKILLS_CATALOGUE).update(version=F('version') + 1)
+    if not bumped:
+        CatalogueVersion.objects.bulk_create(
+            [CatalogueVersion(name=SKILLS_CATALOGUE, version=1)], ignore_conflicts=True
+        )
+    # this process needn't wait for its next poll
+    transaction.on_commit(skill_catalogue.expire)
+
+
+# --- Snapshot -----------------------------------------------------------------
+
+Snapshot = namedtuple('Snapshot', 'version etag body')
+
+
+class SkillCatalogue:
+    """
+    The JSON of the full skill list, encoded once per version and shared by
+    every request of the process. The version row is read at most once every
+    `poll_interval` seconds, so between polls a request touches no database
+    at all; the skills themselves are only queried when the version has moved.
+    Changes made by another process show up within one poll interval.
+    """
+
+    def __init__(self, poll_interval=2.0):
+        self.poll_interval = poll_interval
+        self._snapshot = None
+        self._checked_at = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        snapshot = self._snapshot
+        if snapshot is not None and not self._poll_due():
+            return snapshot
+        with self._lock:
+            # another thread may have polled while we waited
+            if self._snapshot is None or self._poll_due():
+                version = skills_version()
+                if self._snapshot is None or self._snapshot.version != version:
+                    self._snapshot = self.build(version)
+                self._checked_at = time.monotonic()
+            return self._snapshot
+
+    def _poll_due(self):
+        return self._checked_at is None or time.monotonic() - self._checked_at >= self.poll_interval
+
+    def build(self, version):
+        # ordered, so the same rows always hash to the same ETag
+        skills = Skill.objects.order_by('pk')
+        body = JSONRenderer().render(SkillSerializer(skills, many=True).data)
+        return Snapshot(version, '"%s"' % hashlib.sha1(body).hexdigest(), body)
+
+    def expire(self):
+        """Make the next get() read the version row."""
+        self._checked_at = None
+
+    def clear(self):
+        with self._lock:
+            self._snapshot = None
+            self._checked_at = None
+
+
+skill_catalogue = SkillCatalogue()
@@ -1,3 +1,267 @@
+import json
+import os
+import tempfile
+import time
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import F
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .authentication import NO_PROFILE, USER_TYPE_CLAIM, revocations
+from .models import CatalogueVersion, Profile, Project, Skill, User
+from .skill_catalogue import SKILLS_CATALOGUE, skill_catalogue
+
+
+class SkillCatalogueTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.python = Skill.objects.create(name='Python')
+        Skill.objects.create(name='Django')
+
+    def setUp(self):
+        cache.clear()
+        skill_catalogue.clear()
+
+    def get(self, **headers):
+        return self.client.get('/api/skills/', **headers)
+
+    def test_steady_state_skips_the_database(self):
+        response = self.get()
+        self.assertEqual([skill['name'] for skill in response.json()], ['Python', 'Django'])
+        self.assertIn('max-age=', response['Cache-Control'])
+
+        with CaptureQueriesContext(connection) as queries:
+            again = self.get()
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(again.content, response.content)
+        self.assertEqual(again['ETag'], response['ETag'])
+
+    def test_if_none_match_gets_not_modified(self):
+        etag = self.get()['ETag']
+        response = self.get(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_skill_change_rebuilds_the_snapshot(self):
+        etag = self.get()['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            Skill.objects.create(name='React')
+        response = self.get(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertIn('React', [skill['name'] for skill in response.json()])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.python.delete()
+        self.assertNotIn('Python', [skill['name'] for skill in self.get().json()])
+
+    def test_version_bumped_by_another_process_is_picked_up(self):
+        self.get()
+        # as if another worker had changed a skill: the rows and the version
+        # row move, but no signal runs in this process
+        Skill.objects.filter(pk=self.python.pk).update(name='Python 3')
+        CatalogueVersion.objects.filter(pk=SKILLS_CATALOGUE).update(version=F('version') + 1)
+        # served from the snapshot until the next poll of the version row
+        self.assertEqual(self.get().json()[0]['name'], 'Python')
+        with mock.patch.object(skill_catalogue, 'poll_interval', 0):
+            self.assertEqual(self.get().json()[0]['name'], 'Python 3')
+
+
+class ImportMarketplaceTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.client_user = User.objects.create_user(username='acme', password='pass')
+        Skill.objects.create(name='Python')
+        Skill.objects.create(name='Django')
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def write(self, name, text):
+        path = os.path.join(self.directory, name)
+        with open(path, 'w', encoding='utf-8') as handle:
+            handle.write(text)
+        return path
+
+    def run_import(self, *args, **options):
+        stdout, stderr = StringIO(), StringIO()
+        call_command('import_marketplace', *args, stdout=stdout, stderr=stderr, **options)
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_projects_from_csv(self):
+        path = self.write('projects.csv', (
+            'client,title,description,budget,duration,skills_required\n'
+            'acme,Shop,Build a shop,1500.00,30,"Python, Django"\n'
+            'ghost,Blog,Write a blog,200,,Python\n'
+            'acme,API,REST API,900,,Rust\n'
+            'acme,Site,Landing page,300,,\n'
+        ))
+        with self.assertNumQueries(6):
+            # skill map, clients, then one batch: savepoint + release, projects, through rows
+            stdout, stderr = self.run_import('projects', path, batch_size=10)
+
+        self.assertIn('rows/s', stdout)
+        self.assertIn("row 2: unknown client 'ghost'", stderr)
+        self.assertIn('row 3: unknown skill(s): Rust', stderr)
+        shop = Project.objects.get(title='Shop')
+        self.assertEqual((shop.client, str(shop.budget), shop.status), (self.client_user, '1500.00', 'open'))
+        self.assertEqual(sorted(shop.skills_required.values_list('name', flat=True)), ['Django', 'Python'])
+        self.assertFalse(Project.objects.get(title='Site').skills_required.exists())
+
+    def test_profiles_from_jsonl_create_users_and_skills(self):
+        path = self.write('profiles.jsonl', '\n'.join([
+            json.dumps({'username': 'acme', 'user_type': 'client', 'skills': ['Python']}),
+            json.dumps({'username': 'dev', 'email': 'dev@example.com', 'hourly_rate': '40', 'skills': ['Go', 'Python']}),
+            json.dumps({'username': 'dev', 'bio': 'twice'}),
+            '{not json',
+        ]))
+        stdout, stderr = self.run_import('profiles', path, create_skills=True)
+
+        self.assertIn("row 3: 'dev' already has a profile", stderr)
+        self.assertIn('row 4: invalid JSON', stderr)
+        dev = Profile.objects.get(user__username='dev')
+        self.assertEqual((dev.user.email, str(dev.hourly_rate), dev.user.has_usable_password()), ('dev@example.com', '40.00', False))
+        self.assertEqual(sorted(dev.skills.values_list('name', flat=True)), ['Go', 'Python'])
+        self.assertEqual(Profile.objects.get(user=self.client_user).user_type, 'client')
+
+    def test_non_string_usernames_are_rejected_per_row(self):
+        path = self.write('projects.jsonl', '\n'.join(json.dumps(row) for row in [
+            {'client': ['acme'], 'title': 'List', 'description': 'd', 'budget': '10'},
+            {'client': {'name': 'acme'}, 'title': 'Object', 'description': 'd', 'budget': '10'},
+            {'client': 'acme', 'title': 'Fine', 'description': 'd', 'budget': '10'},
+            {'client': 7, 'title': 'Number', 'description': 'd', 'budget': '10'},
+        ]))
+        _, stderr = self.run_import('projects', path)
+
+        self.assertIn('row 1: client must be a string, got ["acme"]', stderr)
+        self.assertIn('row 2: client must be a string, got {"name": "acme"}', stderr)
+        self.assertIn("row 4: unknown client '7'", stderr)
+        self.assertEqual(list(Project.objects.values_list('title', flat=True)), ['Fine'])
+
+        path = self.write('profiles.jsonl', '\n'.join(json.dumps(row) for row in [
+            {'username': ['dev']}, {'username': True}, {'username': 'dev'},
+        ]))
+        _, stderr = self.run_import('profiles', path)
+
+        self.assertIn('row 1: username must be a string, got ["dev"]', stderr)
+        self.assertIn('row 2: username must be a string, got true', stderr)
+        self.assertEqual(list(Profile.objects.values_list('user__username', flat=True)), ['dev'])
+
+    def test_resume_continues_after_the_checkpoint(self):
+        lines = ['client,title,description,budget'] + ['acme,P%d,desc,10' % i for i in range(5)]
+        path = self.write('projects.csv', '\n'.join(lines))
+        checkpoint = path + '.checkpoint'
+        with open(checkpoint, 'w') as handle:
+            # as left by a run that stopped after two committed rows
+            json.dump({'kind': 'projects', 'path': os.path.abspath(path), 'rows': 2, 'imported': 2}, handle)
+
+        with self.assertRaisesMessage(Exception, '--resume'):
+            self.run_import('projects', path)
+        stdout, _ = self.run_import('projects', path, resume=True, batch_size=2)
+
+        self.assertIn('Resuming after row 2.', stdout)
+        self.assertEqual(sorted(Project.objects.values_list('title', flat=True)), ['P2', 'P3', 'P4'])
+        with open(checkpoint) as handle:
+            self.assertEqual(json.load(handle)['rows'], 5)
+
+
+class ClaimsAuthenticationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.client_user = User.objects.create_user(username='client', password='pass12345')
+        cls.profile = Profile.objects.create(user=cls.client_user, user_type='client')
+        cls.admin = User.objects.create_superuser(username='admin', email='admin@example.com', password='pass12345')
+
+    def setUp(self):
+        revocations.clear()
+
+    def obtain(self, username):
+        response = self.client.post('/api/token/', {'username': username, 'password': 'pass12345'})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def auth(self, access):
+        return {'HTTP_AUTHORIZATION': f'Bearer {access}'}
+
+    def test_token_carries_the_role(self):
+        tokens = self.obtain('client')
+        self.assertEqual(AccessToken(tokens['access'])[USER_TYPE_CLAIM], 'client')
+        refreshed = self.client.post('/api/token/refresh/', {'refresh': tokens['refresh']})
+        self.assertEqual(refreshed.status_code, 200)
+        self.assertEqual(AccessToken(refreshed.json()['access'])[USER_TYPE_CLAIM], 'client')
+
+    def test_claims_authenticate_without_loading_user_or_profile(self):
+        access = self.obtain('client')['access']
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/projects/', **self.auth(access))
+        self.assertEqual(response.status_code, 200)
+        # just the (empty) project list: no user or profile lookups
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('"api_user"', queries[0]['sql'])
+        self.assertNotIn('"api_profile"', queries[0]['sql'])
+
+    def test_user_without_profile_can_authenticate_and_create_one(self):
+        tokens = self.obtain('admin')
+        self.assertEqual(AccessToken(tokens['access'])[USER_TYPE_CLAIM], NO_PROFILE)
+        refreshed = self.client.post('/api/token/refresh/', {'refresh': tokens['refresh']})
+        self.assertEqual(refreshed.status_code, 200)
+
+        # no role yet, so client-only endpoints refuse
+        response = self.client.post('/api/projects/', {'title': 'x'}, **self.auth(tokens['access']))
+        self.assertEqual(response.status_code, 403)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/profiles/', {'user_type': 'client', 'skill_ids': []},
+                                        **self.auth(tokens['access']))
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Profile.objects.get(user=self.admin).user_type, 'client')
+
+    def test_role_change_revokes_older_tokens(self):
+        tokens = self.obtain('client')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.profile.user_type = 'freelancer'
+            self.profile.save()
+        # issued before (or in the same second as) the change, with the old role
+        response = self.client.get('/api/projects/', **self.auth(tokens['access']))
+        self.assertEqual(response.status_code, 401)
+
+        refreshed = self.client.post('/api/token/refresh/', {'refresh': tokens['refresh']})
+        access = refreshed.json()['access']
+        self.assertEqual(AccessToken(access)[USER_TYPE_CLAIM], 'freelancer')
+        self.assertEqual(self.client.get('/api/projects/', **self.auth(access)).status_code, 200)
+
+    def test_profile_delete_revokes_older_tokens(self):
+        access = self.obtain('client')['access']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.profile.delete()
+
+        response = self.client.post('/api/projects/', {'title': 'x'}, **self.auth(access))
+        self.assertEqual(response.status_code, 401)
+        access = self.obtain('client')['access']
+        self.assertEqual(AccessToken(access)[USER_TYPE_CLAIM], NO_PROFILE)
+        response = self.client.post('/api/projects/', {'title': 'x'}, **self.auth(access))
+        self.assertEqual(response.status_code, 403)
+
+    def test_deactivated_user_cannot_refresh(self):
+        tokens = self.obtain('client')
+        self.client_user.is_active = False
+        self.client_user.save()
+        response = self.client.post('/api/token/refresh/', {'refresh': tokens['refresh']})
+        self.assertEqual(response.status_code, 401)
 
-# Create your tests here.
+    def test_old_revocations_are_pruned(self):
+        revocations.revoke(1)
+        lifetime = api_settings.ACCESS_TOKEN_LIFETIME.total_seconds()
+        with mock.patch('time.time', return_value=time.time() + lifetime + 2):
+            revocations.revoke(2)
+        self.assertEqual(len(revocations), 1)
+        self.assertFalse(revocations.is_revoked(1, 0, 'client'))
@@ -1,11 +1,14 @@
 from rest_framework import viewsets, permissions, generics
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
 from .models import User, Profile, Skill, Project, Proposal
 from .serializers import (
     RegisterSerializer, UserSerializer, ProfileSerializer, SkillSerializer,
     ProjectSerializer, ProposalSerializer
 )
+from .skill_catalogue import skill_catalogue
 
 # --- (Permissions classes remain the same) ---
 class IsClient(permissions.BasePermission):
@@ -31,12 +34,31 @@ class ProfileViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return Profile.objects.filter(user=self.request.user)
+        return Profile.objects.filter(user_id=self.request.user.pk)
+
+    def perform_create(self, serializer):
+        serializer.save(user_id=self.request.user.pk)
 
 class SkillViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = Skill.objects.all()
     serializer_class = SkillSerializer
     permission_classes = [permissions.AllowAny]
+    # clients may reuse the list this long without asking; after that the
+    # ETag makes revalidation a 304
+    catalogue_max_age = 60 * 10
+
+    def list(self, request, *args, **kwargs):
+        if request.accepted_renderer.format != 'json':
+            return super().list(request, *args, **kwargs)
+        # served from the in-memory snapshot (api/skill_catalogue.py), no ORM
+        snapshot = skill_catalogue.get()
+        if snapshot.etag in parse_etags(request.META.get('HTTP_IF_NONE_MATCH', '')):
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(snapshot.body, content_type='application/json')
+        response['ETag'] = snapshot.etag
+        response['Cache-Control'] = 'public, max-age=%d' % self.catalogue_max_age
+        return response
 
 # --- UPDATED ProjectViewSet ---
 class ProjectViewSet(viewsets.ModelViewSet):
@@ -64,7 +86,7 @@ class ProjectViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         user = self.request.user
         if user.is_authenticated and hasattr(user, 'profile') and user.profile.user_type == 'client':
-            return self.queryset.filter(client=user)
+            return self.queryset.filter(client_id=user.pk)
         # Freelancers and guests can see all open projects
         return self.queryset.filter(status='open')
 
@@ -87,8 +109,8 @@ class ProposalViewSet(viewsets.ModelViewSet):
         user = self.request.user
         if hasattr(user, 'profile') and user.profile.user_type == 'freelancer':
             # A freelancer can see all proposals they have submitted
-            return self.queryset.filter(freelancer=user)
+            return self.queryset.filter(freelancer_id=user.pk)
         elif hasattr(user, 'profile') and user.profile.user_type == 'client':
             # A client can see all proposals submitted to their projects
-            return self.queryset.filter(project__client=user)
+            return self.queryset.filter(project__client_id=user.pk)
         return Proposal.objects.none()
\ No newline at end of file
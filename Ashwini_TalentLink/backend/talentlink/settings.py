@@ -64,10 +64,17 @@ CORS_ALLOWED_ORIGINS = [
 # Configure DRF to use JWT
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        # JWTAuthentication that reads user_id / user_type from the token claims
+        'api.authentication.ClaimsJWTAuthentication',
     )
 }
 
+SIMPLE_JWT = {
+    # put user_type in the tokens (see api/authentication.py)
+    'TOKEN_OBTAIN_SERIALIZER': 'api.authentication.RoleTokenObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'api.authentication.RoleTokenRefreshSerializer',
+}
+
 
 AUTH_USER_MODEL = 'api.User'
 
@@ -13,4 +13,14 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# needs the app registry, so it's imported once Django is set up
+from core.realtime import websocket_application  # noqa: E402
+
+
+async def application(scope, receive, send):
+    # WebSocket messaging (core/realtime.py) next to the regular HTTP app
+    if scope['type'] == 'websocket':
+        return await websocket_application(scope, receive, send)
+    return await django_application(scope, receive, send)
@@ -31,6 +31,7 @@ INSTALLED_APPS = [
 
 # === Middleware ===
 MIDDLEWARE = [
+    'core.metrics.RequestMetricsMiddleware',  # outermost, so it times everything below
     'corsheaders.middleware.CorsMiddleware',  # Must be high up
     'django.middleware.common.CommonMiddleware',
 
@@ -45,6 +46,7 @@ MIDDLEWARE = [
 # === URL & WSGI ===
 ROOT_URLCONF = 'backend.urls'
 WSGI_APPLICATION = 'backend.wsgi.application'
+ASGI_APPLICATION = 'backend.asgi.application'  # adds /ws/messages/ (core/realtime.py)
 
 # === Templates ===
 TEMPLATES = [
@@ -113,6 +115,29 @@ SIMPLE_JWT = {
     'AUTH_TOKEN_CLASSES': ('rest_framework_simplejwt.tokens.AccessToken',),
 }
 
+# === Metrics ===
+# Per-endpoint latency / SQL / size stats, scraped from /metrics (core/metrics.py)
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'True') == 'True'
+
+# === Cache ===
+# Holds the versioned project responses (core/response_cache.py). The local
+# memory cache is per process; use a shared backend (Redis / Memcached) with
+# several workers so a project change invalidates every worker's copy.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+# === Real-time messaging ===
+# Channel layer used by the /ws/messages/ socket. The default only reaches sockets
+# of the same process; point BACKEND at a shared layer (e.g.
+# channels_redis.core.RedisChannelLayer) when running several workers.
+MESSAGE_CHANNEL_LAYER = {
+    'BACKEND': 'core.realtime.InMemoryChannelLayer',
+    'CONFIG': {'capacity': 100},
+}
+
 # === CORS ===
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",
@@ -0,0 +1,48 @@
+from django.db.models import CharField, Count, F, Value
+from rest_framework.exceptions import ValidationError
+
+from .models import Project
+
+PROJECT_FACETS = ('skills', 'duration')
+
+
+def requested_facets(request):
+    """The ?facets=skills,duration names, validated (empty when not asked for)."""
+    value = request.query_params.get('facets')
+    if not value:
+        return []
+    facets = list(dict.fromkeys(name.strip() for name in value.split(',') if name.strip()))
+    unknown = [name for name in facets if name not in PROJECT_FACETS]
+    if unknown:
+        raise ValidationError({'facets': 'Unknown facet(s): %s. Choose from %s.' % (
+            ', '.join(unknown), ', '.join(PROJECT_FACETS))})
+    return facets
+
+
+def project_facets(queryset, facets):
+    """
+    {facet: {value: number of projects}} over the projects in `queryset`,
+    most common first. Every facet is a GROUP BY over the filtered ids; they
+    are sent as one UNION ALL statement.
+    """
+    ids = queryset.order_by().values('pk')
+    groupings = []
+    if 'skills' in facets:
+        groupings.append(
+            Project.skills.through.objects.filter(project_id__in=ids).order_by()
+            .annotate(facet=Value('skills', output_field=CharField()), value=F('skill__name'))
+            .values_list('facet', 'value').annotate(n=Count('pk'))
+        )
+    if 'duration' in facets:
+        groupings.append(
+            Project.objects.filter(pk__in=ids).order_by()
+            .annotate(facet=Value('duration', output_field=CharField()), value=F('duration'))
+            .values_list('facet', 'value').annotate(n=Count('pk'))
+        )
+    counts = {name: {} for name in facets}
+    if not groupings:
+        return counts
+    rows = groupings[0].union(*groupings[1:], all=True)
+    for facet, value, n in sorted(rows, key=lambda row: (-row[2], row[1])):
+        counts[facet][value] = n
+    return counts
@@ -0,0 +1,74 @@
+import time
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from rest_framework.test import APIClient
+
+from core.models import Project, Skill, User
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure project list / detail throughput uncached, from the response cache "
+        "and as 304s. Runs against a throwaway test database, never the real one."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--projects', type=int, default=2000)
+        parser.add_argument('--requests', type=int, default=500, help="Requests per scenario.")
+        parser.add_argument('--page-size', type=int, default=20)
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            self.seed(options['projects'])
+            self.run(options['requests'], options['page_size'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+    def seed(self, count):
+        client_user = User.objects.create_user(
+            username='loadtest', email='loadtest@example.com', password='pass', role='client'
+        )
+        skills = Skill.objects.bulk_create([Skill(name='Skill %d' % i) for i in range(20)])
+        projects = Project.objects.bulk_create([
+            Project(client=client_user, title='Project %d' % i, description='Load test project %d' % i,
+                    budget=100 + i, duration='%d weeks' % (i % 8 + 1))
+            for i in range(count)
+        ])
+        Through = Project.skills.through
+        Through.objects.bulk_create([
+            Through(project_id=project.pk, skill_id=skills[(project.pk + k) % len(skills)].pk)
+            for project in projects for k in range(3)
+        ])
+
+    def run(self, requests, page_size):
+        client = APIClient()
+        detail_pk = Project.objects.order_by('pk').values_list('pk', flat=True)[0]
+        endpoints = (
+            ('list', '/api/projects/', {'page_size': page_size}),
+            ('detail', '/api/projects/%d/' % detail_pk, {}),
+        )
+        for name, path, params in endpoints:
+            uncached = self.throughput(requests, lambda: (cache.clear(), client.get(path, params)))
+            response = client.get(path, params)
+            if response.status_code != 200:
+                raise CommandError('GET %s returned %d' % (path, response.status_code))
+            etag = response['ETag']
+            hit = self.throughput(requests, lambda: client.get(path, params))
+            not_modified = self.throughput(requests, lambda: client.get(path, params, HTTP_IF_NONE_MATCH=etag))
+            self.stdout.write(
+                '%-7s %8.0f req/s uncached  %8.0f req/s hit  %8.0f req/s 304'
+                % (name + ':', uncached, hit, not_modified)
+            )
+
+    def throughput(self, requests, send):
+        started = time.perf_counter()
+        for _ in range(requests):
+            send()
+        return requests / (time.perf_counter() - started)
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from core.models import Project
+from core.search import fts_enabled, rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Re-create the project full-text index if it is missing and refill it from the project and skill tables."
+
+    def handle(self, *args, **options):
+        if not fts_enabled():
+            self.stdout.write("Full-text search needs SQLite; nothing to rebuild.")
+            return
+        rebuild_index()
+        self.stdout.write(self.style.SUCCESS("Re-indexed %d project(s)." % Project.objects.count()))
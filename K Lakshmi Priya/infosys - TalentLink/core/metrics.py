@@ -0,0 +1,150 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse
+
+# Upper bounds (seconds) of the request duration histogram buckets
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class RequestMetrics:
+    """
+    Per (url name, method) request statistics, rendered in Prometheus text format.
+    Everything lives in process memory; each worker exposes its own numbers.
+    """
+
+    def __init__(self, buckets=DURATION_BUCKETS):
+        self.buckets = buckets
+        self.lock = threading.Lock()
+        self.series = {}
+        self.cache_lookups = {}  # (view, outcome) -> count, see core/response_cache.py
+
+    def observe(self, view, method, duration, queries, sql_time, response_bytes):
+        key = (view, method)
+        with self.lock:
+            stats = self.series.get(key)
+            if stats is None:
+                stats = self.series[key] = {
+                    'buckets': [0] * (len(self.buckets) + 1),
+                    'count': 0,
+                    'duration': 0.0,
+                    'queries': 0,
+                    'sql_time': 0.0,
+                    'bytes': 0,
+                }
+            stats['buckets'][bisect_left(self.buckets, duration)] += 1
+            stats['count'] += 1
+            stats['duration'] += duration
+            stats['queries'] += queries
+            stats['sql_time'] += sql_time
+            stats['bytes'] += response_bytes
+
+    def observe_cache(self, view, outcome):
+        key = (view, outcome)
+        with self.lock:
+            self.cache_lookups[key] = self.cache_lookups.get(key, 0) + 1
+
+    def reset(self):
+        with self.lock:
+            self.series.clear()
+            self.cache_lookups.clear()
+
+    def render(self):
+        with self.lock:
+            series = sorted((key, dict(stats, buckets=list(stats['buckets']))) for key, stats in self.series.items())
+            cache_lookups = sorted(self.cache_lookups.items())
+
+        lines = [
+            '# HELP http_request_duration_seconds Wall time spent handling the request.',
+            '# TYPE http_request_duration_seconds histogram',
+        ]
+        for (view, method), stats in series:
+            labels = 'view="%s",method="%s"' % (_escape(view), _escape(method))
+            cumulative = 0
+            for bound, hits in zip(self.buckets, stats['buckets']):
+                cumulative += hits
+                lines.append('http_request_duration_seconds_bucket{%s,le="%s"} %d' % (labels, bound, cumulative))
+            lines.append('http_request_duration_seconds_bucket{%s,le="+Inf"} %d' % (labels, stats['count']))
+            lines.append('http_request_duration_seconds_sum{%s} %r' % (labels, stats['duration']))
+            lines.append('http_request_duration_seconds_count{%s} %d' % (labels, stats['count']))
+
+        counters = (
+            ('http_request_sql_queries_total', 'SQL queries run while handling requests.', 'queries', '%d'),
+            ('http_request_sql_seconds_total', 'Time spent in SQL while handling requests.', 'sql_time', '%r'),
+            ('http_response_size_bytes_total', 'Bytes of response body sent.', 'bytes', '%d'),
+        )
+        for name, help_text, field, fmt in counters:
+            lines.append('# HELP %s %s' % (name, help_text))
+            lines.append('# TYPE %s counter' % name)
+            for (view, method), stats in series:
+                labels = 'view="%s",method="%s"' % (_escape(view), _escape(method))
+                lines.append(('%s{%s} ' + fmt) % (name, labels, stats[field]))
+
+        lines.append('# HELP http_response_cache_total Response cache lookups by outcome (hit, miss, not_modified).')
+        lines.append('# TYPE http_response_cache_total counter')
+        for (view, outcome), count in cache_lookups:
+            lines.append('http_response_cache_total{view="%s",outcome="%s"} %d' % (_escape(view), outcome, count))
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+request_metrics = RequestMetrics()
+
+
+class QueryStats:
+    """execute_wrapper that counts queries and the time spent running them."""
+
+    def __init__(self):
+        self.count = 0
+        self.time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.time += time.perf_counter() - start
+            self.count += 1
+
+
+class RequestMetricsMiddleware:
+    """
+    Records duration, SQL query count / time and response size for every request,
+    labelled with the resolved URL name (e.g. "projects-list") and HTTP method.
+    Disable with METRICS_ENABLED = False.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'METRICS_ENABLED', True)
+
+    def __call__(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+
+        query_stats = QueryStats()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(query_stats))
+            response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        match = getattr(request, 'resolver_match', None)
+        if match is not None and match.url_name == 'metrics':
+            return response
+        view = (match.view_name or match._func_path) if match is not None else 'unmatched'
+        size = 0 if response.streaming else len(response.content)
+        request_metrics.observe(view, request.method, duration, query_stats.count, query_stats.time, size)
+        return response
+
+
+def metrics_view(request):
+    return HttpResponse(request_metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,27 @@
+from django.db import migrations
+
+from core.search import CREATE_FTS_SQL, DROP_FTS_SQL, REINDEX_SQL
+
+
+def create_fts_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(CREATE_FTS_SQL)
+    schema_editor.execute(REINDEX_SQL)
+
+
+def drop_fts_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(DROP_FTS_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_remove_project_skills_required_project_skills_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts_index, drop_fts_index),
+    ]
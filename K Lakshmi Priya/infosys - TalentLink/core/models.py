@@ -48,6 +48,12 @@ class Project(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at=models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # keyset pagination of the project feed (core/pagination.py)
+            models.Index(fields=['created_at', 'id'], name='core_project_feed_idx'),
+        ]
+
     def __str__(self):
         return self.title
 
@@ -0,0 +1,280 @@
+import asyncio
+import json
+import logging
+import uuid
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.utils.module_loading import import_string
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+
+from .models import Message, User
+
+logger = logging.getLogger(__name__)
+
+WEBSOCKET_PATH = '/ws/messages/'
+MAX_CONTENT_LENGTH = 5000
+
+
+# --- Channel layer ------------------------------------------------------------
+
+class InMemoryChannelLayer:
+    """
+    Process-local channel layer with the async API of Django Channels' layers
+    (new_channel / send / receive / group_add / group_discard / group_send), so a
+    shared layer such as channels_redis can take its place through the
+    MESSAGE_CHANNEL_LAYER setting once there is more than one worker.
+    Messages for a channel whose queue is full are dropped.
+    """
+    extensions = ['groups']
+
+    def __init__(self, capacity=100):
+        self.capacity = capacity
+        self.channels = {}      # channel name -> asyncio.Queue
+        self.groups = {}        # group name -> set of channel names
+        self.memberships = {}   # channel name -> set of group names
+
+    async def new_channel(self, prefix='specific.'):
+        name = prefix + uuid.uuid4().hex
+        self.channels[name] = asyncio.Queue(self.capacity)
+        self.memberships[name] = set()
+        return name
+
+    async def send(self, channel, message):
+        queue = self.channels.get(channel)
+        if queue is not None and not queue.full():
+            queue.put_nowait(message)
+
+    async def receive(self, channel):
+        return await self.channels[channel].get()
+
+    async def group_add(self, group, channel):
+        self.groups.setdefault(group, set()).add(channel)
+        self.memberships.setdefault(channel, set()).add(group)
+
+    async def group_discard(self, group, channel):
+        members = self.groups.get(group)
+        if members is not None:
+            members.discard(channel)
+            if not members:
+                del self.groups[group]
+        groups = self.memberships.get(channel)
+        if groups is not None:
+            groups.discard(group)
+            if not groups:
+                # a socket's channel goes away with its last group
+                del self.memberships[channel]
+                self.channels.pop(channel, None)
+
+    async def group_send(self, group, message):
+        for channel in list(self.groups.get(group, ())):
+            await self.send(channel, message)
+
+
+def user_group(user_id):
+    return 'user.%s' % user_id
+
+
+# --- Persistence --------------------------------------------------------------
+
+def store_messages(messages):
+    """Insert the messages whose receiver exists with one bulk_create; others keep pk None."""
+    receiver_ids = set(
+        User.objects.filter(pk__in={message.receiver_id for message in messages}).values_list('pk', flat=True)
+    )
+    Message.objects.bulk_create([message for message in messages if message.receiver_id in receiver_ids])
+
+
+class MessageBatcher:
+    """
+    Collects messages received over sockets and stores them with one
+    bulk_create per batch, at most `flush_interval` seconds after the first one
+    arrives (sooner once `batch_size` are waiting). Only then is each stored
+    message pushed to its receiver, with its id, and the sender gets an "ack"
+    with the same id and timestamp; a message that wasn't stored is never
+    pushed. Messages still waiting when the process stops are lost.
+    """
+
+    def __init__(self, layer, batch_size=200, flush_interval=0.05):
+        self.layer = layer
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.pending = []
+        self.full = None
+        self.task = None
+
+    def add(self, message, reply_channel, ref):
+        self.pending.append((message, reply_channel, ref))
+        if self.task is None or self.task.done():
+            self.full = asyncio.Event()
+            self.task = asyncio.get_running_loop().create_task(self._flush_soon())
+        if len(self.pending) >= self.batch_size:
+            self.full.set()
+
+    async def _flush_soon(self):
+        try:
+            await asyncio.wait_for(self.full.wait(), self.flush_interval)
+        except asyncio.TimeoutError:
+            pass
+        while self.pending:
+            batch, self.pending = self.pending[:self.batch_size], self.pending[self.batch_size:]
+            await self.flush(batch)
+
+    async def flush(self, batch):
+        try:
+            await sync_to_async(store_messages)([message for message, _, _ in batch])
+        except Exception:
+            logger.exception('Storing %d messages failed', len(batch))
+        for message, reply_channel, ref in batch:
+            if message.pk is None:
+                reply = {'type': 'error', 'ref': ref, 'error': 'Message could not be delivered'}
+            else:
+                await self.push(message)
+                reply = {'type': 'ack', 'ref': ref, 'id': message.pk, 'timestamp': message.timestamp.isoformat()}
+            try:
+                await self.layer.send(reply_channel, reply)
+            except Exception:
+                # e.g. ChannelFull from another layer; the row is stored either way
+                logger.warning('Dropped reply for message %s', message.pk)
+
+    async def push(self, message):
+        try:
+            await self.layer.group_send(user_group(message.receiver_id), {
+                'type': 'message',
+                'message': {
+                    'id': message.pk,
+                    'sender': message.sender_id,
+                    'receiver': message.receiver_id,
+                    'content': message.content,
+                    'timestamp': message.timestamp.isoformat(),
+                },
+            })
+        except Exception:
+            # stored either way; the receiver sees it in the message list
+            logger.warning('Could not push message %s', message.pk)
+
+
+_channel_layer = None
+_message_batcher = None
+
+
+def get_channel_layer():
+    """The layer configured by MESSAGE_CHANNEL_LAYER ({'BACKEND': path, 'CONFIG': kwargs})."""
+    global _channel_layer
+    if _channel_layer is None:
+        config = getattr(settings, 'MESSAGE_CHANNEL_LAYER', {})
+        backend = import_string(config.get('BACKEND', 'core.realtime.InMemoryChannelLayer'))
+        _channel_layer = backend(**config.get('CONFIG', {}))
+    return _channel_layer
+
+
+def get_message_batcher():
+    global _message_batcher
+    if _message_batcher is None:
+        _message_batcher = MessageBatcher(get_channel_layer())
+    return _message_batcher
+
+
+# --- WebSocket endpoint -------------------------------------------------------
+
+def authenticate_socket(scope):
+    """User for the access token in ?token= (or an Authorization header), else None."""
+    auth = JWTAuthentication()
+    raw_token = parse_qs(scope.get('query_string', b'').decode('latin-1')).get('token', [None])[0]
+    if raw_token is None:
+        header = dict(scope.get('headers', [])).get(b'authorization')
+        raw_token = auth.get_raw_token(header) if header else None
+    if not raw_token:
+        return None
+    try:
+        return auth.get_user(auth.get_validated_token(raw_token))
+    except (InvalidToken, AuthenticationFailed):
+        return None
+
+
+async def websocket_application(scope, receive, send):
+    """
+    ASGI app for ws://<host>/ws/messages/?token=<access token>.
+
+    JSON text frames:
+        client -> server    {"type": "message", "receiver": 7, "content": "Hi", "ref": "c1"}
+        server -> receiver  {"type": "message", "message": {"id": 42, "sender": 3, "receiver": 7, "content": "Hi", "timestamp": "..."}}
+        server -> sender    {"type": "ack", "ref": "c1", "id": 42, "timestamp": "..."}
+                            or {"type": "error", "ref": "c1", "error": "..."}
+    Both the push and the ack are sent once the message is stored.
+    """
+    event = await receive()
+    if event['type'] != 'websocket.connect':
+        return
+    if scope['path'] != WEBSOCKET_PATH:
+        await send({'type': 'websocket.close', 'code': 4404})
+        return
+    user = await sync_to_async(authenticate_socket)(scope)
+    if user is None:
+        await send({'type': 'websocket.close', 'code': 4401})
+        return
+    await send({'type': 'websocket.accept'})
+
+    layer = get_channel_layer()
+    channel = await layer.new_channel()
+    group = user_group(user.pk)
+    await layer.group_add(group, channel)
+
+    # one task reads the client's frames, the other writes whatever arrives
+    # on this socket's channel (pushed messages, acks, errors)
+    tasks = [
+        asyncio.ensure_future(_read_frames(receive, user.pk, layer, channel)),
+        asyncio.ensure_future(_write_frames(send, layer, channel)),
+    ]
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            task.result()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await layer.group_discard(group, channel)
+
+
+async def _read_frames(receive, user_id, layer, channel):
+    while True:
+        event = await receive()
+        if event['type'] == 'websocket.disconnect':
+            return
+        if event['type'] == 'websocket.receive':
+            await _handle_frame(event.get('text'), user_id, layer, channel)
+
+
+async def _write_frames(send, layer, channel):
+    while True:
+        message = await layer.receive(channel)
+        await send({'type': 'websocket.send', 'text': json.dumps(message)})
+
+
+async def _handle_frame(text, user_id, layer, channel):
+    try:
+        data = json.loads(text) if text is not None else None
+    except ValueError:
+        data = None
+    if not isinstance(data, dict) or data.get('type') != 'message':
+        await layer.send(channel, {'type': 'error', 'ref': None, 'error': 'Expected a JSON "message" frame'})
+        return
+
+    ref, receiver_id, content = data.get('ref'), data.get('receiver'), data.get('content')
+    error = None
+    if type(receiver_id) is not int:
+        error = 'receiver must be a user id'
+    elif not isinstance(content, str) or not content.strip():
+        error = 'content must be a non-empty string'
+    elif len(content) > MAX_CONTENT_LENGTH:
+        error = 'content is longer than %d characters' % MAX_CONTENT_LENGTH
+    if error is not None:
+        await layer.send(channel, {'type': 'error', 'ref': ref, 'error': error})
+        return
+
+    # pushed to the receiver by the batcher, once stored
+    message = Message(sender_id=user_id, receiver_id=receiver_id, content=content)
+    get_message_batcher().add(message, channel, ref)
@@ -0,0 +1,105 @@
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
+
+from .metrics import request_metrics
+
+PROJECTS_VERSION_KEY = 'projects:version'
+
+
+# --- Version counter ----------------------------------------------------------
+# Every cached project response is keyed by the current "projects version".
+# Bumping it (core/signals.py does so on any project / skill / proposal change) makes all
+# of them unreachable at once; the stale entries simply expire.
+
+def projects_version():
+    version = cache.get(PROJECTS_VERSION_KEY)
+    if version is None:
+        # start from the clock, not 1: after an eviction an old number could
+        # still have entries cached under it
+        cache.add(PROJECTS_VERSION_KEY, time.time_ns())
+        version = cache.get(PROJECTS_VERSION_KEY)
+    return version
+
+
+def bump_projects_version():
+    try:
+        cache.incr(PROJECTS_VERSION_KEY)
+    except ValueError:
+        cache.add(PROJECTS_VERSION_KEY, time.time_ns())
+
+
+def bump_projects_version_on_commit():
+    # after commit, so a request racing the write can't cache the old rows under the new version
+    transaction.on_commit(bump_projects_version)
+
+
+# --- Cached responses ---------------------------------------------------------
+
+class VersionedResponseCacheMixin:
+    """
+    Caches the rendered JSON of list / retrieve under
+    (projects version, action, pk, host, sorted query params, freelancer).
+
+    Responses carry a strong ETag (hash of the body) and "Cache-Control:
+    no-cache", so re-polling clients send If-None-Match and get a 304 straight
+    from the cache without the view touching the database. Lookups are
+    counted in /metrics as http_response_cache_total.
+    """
+    response_cache_timeout = 300
+    response_cache_prefix = 'projects'
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        if request.accepted_renderer.format != 'json':
+            # the browsable API page shows per-user forms
+            return handler(request, *args, **kwargs)
+
+        view = '%s-%s' % (self.basename, self.action)
+        key = self.response_cache_key(request)
+        entry = cache.get(key)
+        if entry is None:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+            # render here (DRF would in finalize_response) to store the bytes
+            response = self.finalize_response(request, response, *args, **kwargs)
+            response.render()
+            body = response.content
+            entry = ('"%s"' % hashlib.sha1(body).hexdigest(), body, response['Content-Type'])
+            cache.set(key, entry, self.response_cache_timeout)
+            outcome = 'miss'
+        else:
+            outcome = 'hit'
+
+        etag, body, content_type = entry
+        if etag in parse_etags(request.META.get('HTTP_IF_NONE_MATCH', '')):
+            response = HttpResponseNotModified()
+            outcome = 'not_modified'
+        else:
+            response = HttpResponse(body, content_type=content_type)
+        response['ETag'] = etag
+        response['Cache-Control'] = 'no-cache'
+        response['X-Cache'] = 'MISS' if outcome == 'miss' else 'HIT'
+        request_metrics.observe_cache(view, outcome)
+        return response
+
+    def response_cache_key(self, request):
+        params = urlencode(sorted(request.query_params.lists()), doseq=True)
+        # host and scheme end up in the pagination links; has_applied differs
+        # per freelancer, while clients and anonymous users share entries
+        user = request.user
+        viewer = user.pk if user.is_authenticated and user.role == 'freelancer' else ''
+        parts = (request.scheme, request.get_host(), self.action, self.kwargs.get(self.lookup_field, ''), params, viewer)
+        digest = hashlib.md5(repr(parts).encode()).hexdigest()
+        return '%s:%s:%s' % (self.response_cache_prefix, projects_version(), digest)
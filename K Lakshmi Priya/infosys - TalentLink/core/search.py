@@ -0,0 +1,87 @@
+from django.db import connection, transaction
+from django.db.models.expressions import RawSQL
+from rest_framework import filters
+
+# SQLite FTS5 index over project text, one row per project (rowid = project id).
+# The single definition of its schema: migration 0007 and rebuild_index() use it.
+FTS_TABLE = 'core_project_fts'
+
+CREATE_FTS_SQL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+    "USING fts5(title, description, skills, duration, budget)"
+)
+
+DROP_FTS_SQL = f"DROP TABLE IF EXISTS {FTS_TABLE}"
+
+# Rebuild rows straight from the project / skill tables
+REINDEX_SQL = (
+    f"INSERT INTO {FTS_TABLE} (rowid, title, description, skills, duration, budget) "
+    "SELECT p.id, p.title, p.description, "
+    "COALESCE((SELECT group_concat(s.name, ' ') FROM core_project_skills ps "
+    "JOIN core_skill s ON s.id = ps.skill_id WHERE ps.project_id = p.id), ''), "
+    "p.duration, CAST(p.budget AS TEXT) "
+    "FROM core_project p"
+)
+
+
+def fts_enabled():
+    return connection.vendor == 'sqlite'
+
+
+def index_projects(project_ids):
+    """Re-index the given projects (missing ids are just dropped from the index)."""
+    project_ids = [int(pk) for pk in project_ids]
+    if not project_ids or not fts_enabled():
+        return
+    placeholders = ', '.join(['%s'] * len(project_ids))
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})", project_ids)
+        cursor.execute(f"{REINDEX_SQL} WHERE p.id IN ({placeholders})", project_ids)
+
+
+def unindex_projects(project_ids):
+    project_ids = [int(pk) for pk in project_ids]
+    if not project_ids or not fts_enabled():
+        return
+    placeholders = ', '.join(['%s'] * len(project_ids))
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})", project_ids)
+
+
+def rebuild_index():
+    """Re-create the index if it is missing and refill it from every project (manage.py rebuild_search_index)."""
+    if not fts_enabled():
+        return
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(CREATE_FTS_SQL)
+        cursor.execute(f"DELETE FROM {FTS_TABLE}")
+        cursor.execute(REINDEX_SQL)
+
+
+def build_match_expression(terms):
+    # every term must match (implicit AND), each one as a quoted prefix query
+    # so user input can never be parsed as FTS5 syntax
+    return ' '.join('"%s"*' % term.replace('"', '""') for term in terms)
+
+
+class ProjectSearchFilter(filters.SearchFilter):
+    """
+    ?search= backed by the FTS5 index, ordered by bm25 relevance.
+    Falls back to the normal SearchFilter (LIKE over search_fields) on other databases.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        search_terms = self.get_search_terms(request)
+        if not search_terms or not fts_enabled():
+            return super().filter_queryset(request, queryset, view)
+
+        match = build_match_expression(search_terms)
+        table = queryset.model._meta.db_table
+        matched_ids = RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", (match,))
+        rank = RawSQL(
+            f"SELECT bm25({FTS_TABLE}) FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH %s AND rowid = {table}.id",
+            (match,),
+        )
+        # bm25() is lower-is-better
+        return queryset.filter(pk__in=matched_ids).annotate(search_rank=rank).order_by('search_rank', '-id')
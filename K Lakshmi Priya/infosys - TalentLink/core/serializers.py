@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from .models import Profile, PortfolioItem, Project, Proposal, Skill
+from .fields import BulkPrimaryKeyRelatedField
 
 User = get_user_model()
 
@@ -43,8 +44,8 @@ class ProfileSerializer(serializers.ModelSerializer):
     # Read skills as nested objects for display
     skills = SkillSerializer(many=True, read_only=True)
     
-    # Write skills with IDs (many=True) for updates
-    skill_ids = serializers.PrimaryKeyRelatedField(
+    # Write skills with IDs (many=True) for updates, resolved in one query
+    skill_ids = BulkPrimaryKeyRelatedField(
         many=True,
         write_only=True,
         queryset=Skill.objects.all(),
@@ -84,8 +85,8 @@ class SkillSerializer(serializers.ModelSerializer):
         fields = ['id', 'name']
 
 class ProjectSerializer(serializers.ModelSerializer):
-    # Accept skill IDs (many=True) for create/update
-    skill_ids = serializers.PrimaryKeyRelatedField(
+    # Accept skill IDs (many=True) for create/update, resolved in one query
+    skill_ids = BulkPrimaryKeyRelatedField(
         many=True,
         write_only=True,
         queryset=Skill.objects.all(),
@@ -99,11 +100,16 @@ class ProjectSerializer(serializers.ModelSerializer):
     # Show client ID (read-only)
     client = serializers.PrimaryKeyRelatedField(read_only=True)
 
+    # Annotated by ProjectViewSet on list / retrieve, left out elsewhere
+    proposal_count = serializers.IntegerField(read_only=True)
+    has_applied = serializers.BooleanField(read_only=True)
+
     class Meta:
         model = Project
         fields = [
             'id', 'client', 'title', 'description', 'budget',
-            'duration', 'skill_ids', 'skills', 'created_at'
+            'duration', 'skill_ids', 'skills', 'created_at',
+            'proposal_count', 'has_applied'
         ]
 
     def create(self, validated_data):
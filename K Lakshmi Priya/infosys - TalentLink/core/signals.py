@@ -0,0 +1,67 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from .models import Project, Proposal, Skill
+from .response_cache import bump_projects_version_on_commit
+from .search import index_projects, unindex_projects
+
+
+# Keep the project full-text index (core/search.py) in sync
+
+@receiver(post_save, sender=Project)
+def project_saved(sender, instance, **kwargs):
+    index_projects([instance.pk])
+
+
+@receiver(post_delete, sender=Project)
+def project_deleted(sender, instance, **kwargs):
+    unindex_projects([instance.pk])
+
+
+@receiver(m2m_changed, sender=Project.skills.through)
+def project_skills_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        # project.skills.add/remove/set/clear
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            index_projects([instance.pk])
+        return
+
+    # skill.project_set.add/remove/clear -> instance is a Skill, pk_set holds project ids
+    if action == 'pre_clear':
+        instance._fts_project_ids = list(instance.project_set.values_list('id', flat=True))
+    elif action == 'post_clear':
+        index_projects(getattr(instance, '_fts_project_ids', []))
+    elif action in ('post_add', 'post_remove'):
+        index_projects(pk_set or [])
+
+
+@receiver(post_save, sender=Skill)
+def skill_saved(sender, instance, created, **kwargs):
+    # a renamed skill changes the indexed text of every project using it
+    if not created:
+        index_projects(instance.project_set.values_list('id', flat=True))
+
+
+@receiver(pre_delete, sender=Skill)
+def skill_deleting(sender, instance, **kwargs):
+    instance._fts_project_ids = list(instance.project_set.values_list('id', flat=True))
+
+
+@receiver(post_delete, sender=Skill)
+def skill_deleted(sender, instance, **kwargs):
+    index_projects(getattr(instance, '_fts_project_ids', []))
+
+
+# Invalidate the cached project list / detail responses (core/response_cache.py)
+
+@receiver([post_save, post_delete], sender=Project)
+@receiver([post_save, post_delete], sender=Skill)
+@receiver([post_save, post_delete], sender=Proposal)  # proposal_count / has_applied
+def projects_changed(sender, **kwargs):
+    bump_projects_version_on_commit()
+
+
+@receiver(m2m_changed, sender=Project.skills.through)
+def project_skill_links_changed(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        bump_projects_version_on_commit()
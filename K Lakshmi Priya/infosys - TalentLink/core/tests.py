@@ -1,3 +1,505 @@
+import asyncio
+import csv
+import io
+import json
+import tracemalloc
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from asgiref.testing import ApplicationCommunicator
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import filters
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.tokens import AccessToken
+
+from backend.asgi import application
+from . import exports, realtime, search
+
+from .metrics import request_metrics
+from .serializers import ProfileSerializer, ProjectSerializer
+from .models import Message, Project, Proposal, Skill, User
+from .pagination import ProjectCursorPagination
+from .response_cache import PROJECTS_VERSION_KEY
+from .search import ProjectSearchFilter
+from .views import ProjectViewSet
+
+
+class ProjectSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.client_user = User.objects.create_user(
+            username='client', email='client@example.com', password='pass', role='client'
+        )
+        cls.python = Skill.objects.create(name='Python')
+        cls.react = Skill.objects.create(name='React')
+        cls.django = Skill.objects.create(name='Django')
+
+        rows = [
+            ('Python backend API', 'Build a REST API', '2 weeks', 500, [cls.python, cls.django]),
+            ('React dashboard', 'Charts and tables', '1 month', 1200, [cls.react]),
+            ('Landing page', 'Static marketing site', '3 days', 150, []),
+            ('Data cleanup', 'One-off scripts', '2 weeks', 300, [cls.python]),
+            ('Full stack app', 'React frontend with Django backend', '2 months', 5000, [cls.react, cls.django]),
+        ]
+        for title, description, duration, budget, skills in rows:
+            project = Project.objects.create(
+                client=cls.client_user, title=title, description=description,
+                duration=duration, budget=budget,
+            )
+            project.skills.set(skills)
+
+    def search(self, backend, term):
+        request = Request(APIRequestFactory().get('/api/projects/', {'search': term}))
+        queryset = backend.filter_queryset(request, Project.objects.all(), ProjectViewSet)
+        return set(queryset.values_list('title', flat=True))
+
+    def test_matches_like_search_on_reference_dataset(self):
+        terms = ['python', 'React', 'django', 'weeks', '2 weeks', 'landing', 'api', '500', 'month', 'nothing']
+        for term in terms:
+            with self.subTest(term=term):
+                self.assertEqual(
+                    self.search(ProjectSearchFilter(), term),
+                    self.search(filters.SearchFilter(), term),
+                )
+
+    def test_searches_description(self):
+        self.assertEqual(self.search(ProjectSearchFilter(), 'marketing'), {'Landing page'})
+
+    def test_ranked_by_relevance(self):
+        request = Request(APIRequestFactory().get('/api/projects/', {'search': 'react'}))
+        queryset = ProjectSearchFilter().filter_queryset(request, Project.objects.all(), ProjectViewSet)
+        # bm25: the project named after the skill ranks ahead of one that only mentions it
+        self.assertEqual(list(queryset.values_list('title', flat=True)), ['React dashboard', 'Full stack app'])
+
+    def test_index_follows_skill_changes(self):
+        landing = Project.objects.get(title='Landing page')
+        landing.skills.add(self.react)
+        self.assertIn('Landing page', self.search(ProjectSearchFilter(), 'react'))
+
+        self.react.project_set.remove(landing)
+        self.assertNotIn('Landing page', self.search(ProjectSearchFilter(), 'react'))
+
+        self.python.name = 'Golang'
+        self.python.save()
+        self.assertEqual(self.search(ProjectSearchFilter(), 'golang'), {'Python backend API', 'Data cleanup'})
+
+    def test_rebuild_command_restores_a_lost_index(self):
+        with connection.cursor() as cursor:
+            cursor.execute(search.DROP_FTS_SQL)
+        stdout = io.StringIO()
+        call_command('rebuild_search_index', stdout=stdout)
+
+        self.assertIn('Re-indexed 5 project(s).', stdout.getvalue())
+        self.assertEqual(self.search(ProjectSearchFilter(), 'django'), {'Python backend API', 'Full stack app'})
+
+    def test_index_follows_project_delete(self):
+        Project.objects.get(title='Landing page').delete()
+        self.assertEqual(self.search(ProjectSearchFilter(), 'landing'), set())
+
+
+class ProjectCursorPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        client_user = User.objects.create_user(
+            username='client', email='client@example.com', password='pass', role='client'
+        )
+        Project.objects.bulk_create([
+            Project(client=client_user, title=f'Project {i}', description='', budget=100, duration='1 week')
+            for i in range(25)
+        ])
+        # several rows share a timestamp so ties are broken on id
+        Project.objects.filter(id__lte=10).update(created_at=timezone.now())
+
+    def paginate(self, params):
+        paginator = ProjectCursorPagination()
+        request = Request(APIRequestFactory().get('/api/projects/', params))
+        page = paginator.paginate_queryset(Project.objects.all(), request)
+        return paginator, page
+
+    def cursor_from(self, link):
+        return Request(APIRequestFactory().get(link)).query_params['cursor']
+
+    def test_walks_every_row_once_without_count(self):
+        expected = list(Project.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+        seen, params = [], {'page_size': 10}
+        while True:
+            with self.assertNumQueries(1):
+                paginator, page = self.paginate(params)
+            seen += [p.id for p in page]
+            next_link = paginator.get_next_link()
+            if next_link is None:
+                break
+            params = {'page_size': 10, 'cursor': self.cursor_from(next_link)}
+        self.assertEqual(seen, expected)
+
+    def test_previous_link_returns_prior_page(self):
+        first_paginator, first = self.paginate({'page_size': 10})
+        second_paginator, second = self.paginate({'page_size': 10, 'cursor': self.cursor_from(first_paginator.get_next_link())})
+        _, back = self.paginate({'page_size': 10, 'cursor': self.cursor_from(second_paginator.get_previous_link())})
+        self.assertEqual([p.id for p in back], [p.id for p in first])
+
+    def test_offset_paging_is_opt_in(self):
+        paginator, page = self.paginate({'offset': 20, 'limit': 10})
+        self.assertEqual(len(page), 5)
+        self.assertEqual(paginator.get_paginated_response([]).data['count'], 25)
+
+    def test_invalid_cursor(self):
+        with self.assertRaises(NotFound):
+            self.paginate({'cursor': 'garbage'})
+
+
+class RequestMetricsTests(TestCase):
+    def setUp(self):
+        request_metrics.reset()
+        cache.clear()
+
+    def test_records_router_endpoints(self):
+        self.client.get('/api/projects/')
+        self.client.get('/api/projects/')
+
+        body = self.client.get('/metrics').content.decode()
+        self.assertIn('http_request_duration_seconds_count{view="projects-list",method="GET"} 2', body)
+        self.assertIn('http_request_duration_seconds_bucket{view="projects-list",method="GET",le="+Inf"} 2', body)
+        # the second request is answered from the response cache
+        self.assertIn('http_request_sql_queries_total{view="projects-list",method="GET"} 1', body)
+        self.assertIn('http_response_cache_total{view="projects-list",outcome="hit"} 1', body)
+        self.assertIn('http_response_size_bytes_total{view="projects-list",method="GET"}', body)
+        # the scrape itself isn't recorded
+        self.assertNotIn('view="metrics"', body)
+
+
+class SkillIdsFieldTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.skills = Skill.objects.bulk_create([Skill(name=f'Skill {i}') for i in range(30)])
+
+    def project_data(self, skill_ids):
+        return {'title': 'Tagged', 'description': 'x', 'budget': 10, 'duration': '1 week', 'skill_ids': skill_ids}
+
+    def test_resolves_all_ids_in_one_query(self):
+        skill_ids = [skill.id for skill in self.skills]
+        serializer = ProjectSerializer(data=self.project_data(skill_ids))
+        with self.assertNumQueries(1):
+            self.assertTrue(serializer.is_valid(), serializer.errors)
+        self.assertEqual([skill.id for skill in serializer.validated_data['skills']], skill_ids)
+
+    def test_reports_every_missing_id(self):
+        serializer = ProfileSerializer(data={'full_name': 'x', 'skill_ids': [self.skills[0].id, 9998, 9999]})
+        self.assertFalse(serializer.is_valid())
+        self.assertEqual(serializer.errors['skill_ids'], ['Invalid pk(s) 9998, 9999 - object(s) do not exist.'])
+
+    def test_rejects_non_pk_values(self):
+        serializer = ProjectSerializer(data=self.project_data(['abc']))
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('Incorrect type', serializer.errors['skill_ids'][0])
+
+
+class RealtimeMessagingTests(TestCase):
+    def setUp(self):
+        # the layer and batcher hold asyncio objects bound to one event loop
+        realtime._channel_layer = realtime._message_batcher = None
+
+    def make_users(self, count):
+        User.objects.bulk_create([
+            User(username='user%d' % i, email='user%d@example.com' % i, role='freelancer') for i in range(count)
+        ])
+        return list(User.objects.order_by('id'))
+
+    async def connect(self, user=None, token=None):
+        if token is None:
+            token = str(AccessToken.for_user(user))
+        socket = ApplicationCommunicator(application, {
+            'type': 'websocket',
+            'path': '/ws/messages/',
+            'query_string': ('token=%s' % token).encode(),
+            'headers': [],
+        })
+        await socket.send_input({'type': 'websocket.connect'})
+        return socket, await socket.receive_output(5)
+
+    async def send_json(self, socket, data):
+        await socket.send_input({'type': 'websocket.receive', 'text': json.dumps(data)})
+
+    async def receive_json(self, socket):
+        return json.loads((await socket.receive_output(5))['text'])
+
+    async def close(self, socket):
+        await socket.send_input({'type': 'websocket.disconnect', 'code': 1000})
+        await socket.wait(5)
+
+    async def test_rejects_invalid_token(self):
+        _, event = await self.connect(token='not-a-token')
+        self.assertEqual(event, {'type': 'websocket.close', 'code': 4401})
+
+    async def test_pushes_to_receiver_and_acks_sender(self):
+        alice, bob = await sync_to_async(self.make_users)(2)
+        alice_socket, event = await self.connect(alice)
+        self.assertEqual(event['type'], 'websocket.accept')
+        bob_socket, _ = await self.connect(bob)
+
+        await self.send_json(alice_socket, {'type': 'message', 'receiver': bob.pk, 'content': 'Hi Bob', 'ref': 'c1'})
+
+        pushed = await self.receive_json(bob_socket)
+        self.assertEqual(pushed['type'], 'message')
+        self.assertEqual(pushed['message']['sender'], alice.pk)
+        self.assertEqual(pushed['message']['content'], 'Hi Bob')
+        ack = await self.receive_json(alice_socket)
+        self.assertEqual(ack['type'], 'ack')
+        self.assertEqual(ack['ref'], 'c1')
+        self.assertEqual((pushed['message']['id'], pushed['message']['timestamp']), (ack['id'], ack['timestamp']))
+        stored = await Message.objects.aget(pk=ack['id'])
+        self.assertEqual((stored.sender_id, stored.receiver_id, stored.content), (alice.pk, bob.pk, 'Hi Bob'))
+
+        await self.close(alice_socket)
+        await self.close(bob_socket)
+
+    async def test_unstored_messages_are_not_pushed(self):
+        alice, bob = await sync_to_async(self.make_users)(2)
+        alice_socket, _ = await self.connect(alice)
+        bob_socket, _ = await self.connect(bob)
+
+        # as if bob's account went away between the frame and the flush
+        with mock.patch.object(realtime, 'store_messages'):
+            await self.send_json(alice_socket, {'type': 'message', 'receiver': bob.pk, 'content': 'Hi', 'ref': 'c1'})
+            error = await self.receive_json(alice_socket)
+        self.assertEqual((error['type'], error['ref']), ('error', 'c1'))
+        self.assertTrue(await bob_socket.receive_nothing(0.2))
+
+        await self.close(alice_socket)
+        await self.close(bob_socket)
+
+    async def test_reports_bad_frames_and_unknown_receivers(self):
+        (alice,) = await sync_to_async(self.make_users)(1)
+        socket, _ = await self.connect(alice)
+
+        await self.send_json(socket, {'type': 'message', 'receiver': alice.pk, 'content': '  ', 'ref': 'blank'})
+        self.assertEqual((await self.receive_json(socket))['ref'], 'blank')
+        await self.send_json(socket, {'type': 'message', 'receiver': 999999, 'content': 'Hello?', 'ref': 'lost'})
+        error = await self.receive_json(socket)
+        self.assertEqual((error['type'], error['ref']), ('error', 'lost'))
+        self.assertFalse(await Message.objects.aexists())
+
+        await self.close(socket)
+
+    async def test_thousand_concurrent_sockets(self):
+        count = 1000
+        users = await sync_to_async(self.make_users)(count)
+        sockets = [socket for socket, _ in await asyncio.gather(*(self.connect(user) for user in users))]
+
+        with mock.patch.object(realtime, 'store_messages', wraps=realtime.store_messages) as store:
+            for i, socket in enumerate(sockets):
+                receiver = users[(i + 1) % count]
+                await self.send_json(socket, {'type': 'message', 'receiver': receiver.pk, 'content': 'ping %d' % i})
+            frames = await asyncio.gather(*(self.receive_json(socket) for socket in sockets))
+            frames += await asyncio.gather(*(self.receive_json(socket) for socket in sockets))
+
+        pushed = [frame for frame in frames if frame['type'] == 'message']
+        self.assertEqual(len(pushed), count)
+        self.assertEqual(sum(frame['type'] == 'ack' for frame in frames), count)
+        self.assertEqual(await Message.objects.acount(), count)
+        # persisted in batches, not one INSERT per message
+        self.assertLessEqual(store.call_count, count // realtime.get_message_batcher().batch_size + 1)
+
+        await asyncio.gather(*(self.close(socket) for socket in sockets))
+
+
+class ProjectResponseCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.client_user = User.objects.create_user(
+            username='client', email='client@example.com', password='pass', role='client'
+        )
+        cls.python = Skill.objects.create(name='Python')
+        cls.project = Project.objects.create(
+            client=cls.client_user, title='Cached', description='', budget=100, duration='1 week'
+        )
+
+    def setUp(self):
+        cache.clear()
+        request_metrics.reset()
+
+    def test_second_request_is_a_hit_without_queries(self):
+        first = self.client.get('/api/projects/', {'page_size': 5})
+        self.assertEqual(first['X-Cache'], 'MISS')
+        with self.assertNumQueries(0):
+            second = self.client.get('/api/projects/', {'page_size': 5})
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second['ETag'], first['ETag'])
+
+    def test_matching_etag_gets_304(self):
+        etag = self.client.get('/api/projects/%d/' % self.project.pk)['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/projects/%d/' % self.project.pk, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertIn('http_response_cache_total{view="projects-retrieve",outcome="not_modified"} 1',
+                      request_metrics.render())
+
+    def test_query_params_are_normalized(self):
+        self.client.get('/api/projects/', {'page_size': 5, 'duration': '1 week'})
+        response = self.client.get('/api/projects/?duration=1+week&page_size=5')
+        self.assertEqual(response['X-Cache'], 'HIT')
+
+    def test_changes_bump_the_version(self):
+        etag = self.client.get('/api/projects/%d/' % self.project.pk)['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.skills.add(self.python)
+
+        response = self.client.get('/api/projects/%d/' % self.project.pk, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual([skill['name'] for skill in response.json()['skills']], ['Python'])
+
+        version = cache.get(PROJECTS_VERSION_KEY)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.python.name = 'Python 3'
+            self.python.save()
+        self.assertEqual(cache.get(PROJECTS_VERSION_KEY), version + 1)
+
+
+class ProposalExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.client_user = User.objects.create_user(
+            username='client', email='client@example.com', password='pass', role='client'
+        )
+        cls.project = Project.objects.create(
+            client=cls.client_user, title='Popular', description='', budget=100, duration='1 week'
+        )
+
+    def setUp(self):
+        self.api = APIClient()
+        self.api.force_authenticate(self.client_user)
+
+    def url(self):
+        return '/api/projects/%d/proposals/export.csv' % self.project.pk
+
+    def add_proposals(self, count, start=0):
+        freelancers = User.objects.bulk_create(
+            [User(username='freelancer%d' % i, email='freelancer%d@example.com' % i, role='freelancer')
+             for i in range(start, start + count)]
+        )
+        Proposal.objects.bulk_create([
+            Proposal(project=self.project, freelancer=freelancer, cover_letter='Hire me, "please"', proposed_rate=25)
+            for freelancer in freelancers
+        ])
+
+    def test_streams_every_proposal_with_names(self):
+        self.add_proposals(3)
+        Proposal.objects.filter(freelancer__username='freelancer0').update(cover_letter='=HYPERLINK("x")')
+        response = self.api.get(self.url())
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="project-%d-proposals.csv"' % self.project.pk)
+
+        rows = list(csv.reader(io.StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual(rows[0], [column for column, _ in exports.PROPOSAL_COLUMNS])
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows[1][2:8], ['Popular', rows[1][3], 'freelancer0', '\'=HYPERLINK("x")', '25.00', 'pending'])
+        self.assertEqual(rows[2][5], 'Hire me, "please"')
+
+    def test_only_the_owner_can_export(self):
+        other = User.objects.create_user(username='other', email='other@example.com', password='pass', role='client')
+        self.api.force_authenticate(other)
+        self.assertEqual(self.api.get(self.url()).status_code, 403)
+        self.api.force_authenticate(None)
+        self.assertEqual(self.api.get(self.url()).status_code, 401)
+
+    def export(self):
+        tracemalloc.start()
+        try:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.api.get(self.url())
+                size = sum(len(chunk) for chunk in response.streaming_content)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        return size, len(queries), peak
+
+    @mock.patch.object(exports, 'ROWS_PER_WRITE', 50)
+    @mock.patch.object(exports, 'CHUNK_SIZE', 100)
+    def test_memory_and_queries_do_not_grow_with_proposals(self):
+        self.add_proposals(300)
+        small_size, small_queries, small_peak = self.export()
+        self.add_proposals(2700, start=300)
+        large_size, large_queries, large_peak = self.export()
+
+        self.assertGreater(large_size, 9 * small_size)
+        # the project lookup and the one proposals query
+        self.assertEqual(large_queries, small_queries)
+        self.assertEqual(small_queries, 2)
+        # bounded by the chunk sizes, not the 10x larger export
+        self.assertLess(large_peak, small_peak * 1.5)
+
+
+class ProjectFeedTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.client_user = User.objects.create_user(
+            username='client', email='client@example.com', password='pass', role='client'
+        )
+        cls.freelancer = User.objects.create_user(
+            username='freelancer', email='freelancer@example.com', password='pass', role='freelancer'
+        )
+        other = User.objects.create_user(username='other', email='other@example.com', password='pass', role='freelancer')
+        python, react = Skill.objects.create(name='Python'), Skill.objects.create(name='React')
+        cls.projects = []
+        for title, duration, skills in (('API', '1 week', [python]), ('UI', '1 month', [react]), ('Both', '1 week', [python, react])):
+            project = Project.objects.create(client=cls.client_user, title=title, description='', budget=100, duration=duration)
+            project.skills.set(skills)
+            cls.projects.append(project)
+        api, ui, _ = cls.projects
+        Proposal.objects.create(project=api, freelancer=cls.freelancer, cover_letter='', proposed_rate=10)
+        Proposal.objects.create(project=api, freelancer=other, cover_letter='', proposed_rate=10)
+        Proposal.objects.create(project=ui, freelancer=other, cover_letter='', proposed_rate=10)
+
+    def setUp(self):
+        cache.clear()
+        self.api = APIClient()
+        self.api.force_authenticate(self.freelancer)
+
+    def feed(self, **params):
+        response = self.api.get('/api/projects/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_annotations_in_the_project_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            data = self.feed()
+        rows = {project['title']: (project['proposal_count'], project['has_applied']) for project in data['results']}
+        self.assertEqual(rows, {'API': (2, True), 'UI': (1, False), 'Both': (0, False)})
+        # the projects (with both subqueries) and their skills
+        self.assertEqual(len(queries), 2)
+
+    def test_cached_per_freelancer(self):
+        self.feed()
+        self.api.force_authenticate(None)
+        data = self.feed()
+        self.assertFalse(any(project['has_applied'] for project in data['results']))
+
+    def test_new_proposal_refreshes_the_feed(self):
+        self.feed()
+        with self.captureOnCommitCallbacks(execute=True):
+            Proposal.objects.create(project=self.projects[2], freelancer=self.freelancer, cover_letter='', proposed_rate=10)
+        both = [project for project in self.feed()['results'] if project['title'] == 'Both'][0]
+        self.assertEqual((both['proposal_count'], both['has_applied']), (1, True))
+
+    def test_facets_follow_filters(self):
+        with CaptureQueriesContext(connection) as queries:
+            data = self.feed(facets='skills,duration')
+        self.assertEqual(data['facets'], {
+            'skills': {'Python': 2, 'React': 2},
+            'duration': {'1 week': 2, '1 month': 1},
+        })
+        self.assertEqual(len(queries), 3)
+        data = self.feed(facets='skills', duration='1 week')
+        self.assertEqual(data['facets'], {'skills': {'Python': 2, 'React': 1}})
 
-# Create your tests here.
+    def test_unknown_facet(self):
+        self.assertEqual(self.api.get('/api/projects/', {'facets': 'budget'}).status_code, 400)
@@ -1,6 +1,7 @@
 
 
 from django.urls import path, include
+from rest_framework import permissions
 from rest_framework.routers import DefaultRouter
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from .views import RegisterView, UserDetailView, ProfileView, PortfolioItemViewSet, ProjectViewSet, ProposalViewSet, SkillViewSet, CustomLoginView
@@ -23,6 +24,11 @@ urlpatterns = [
     
     path('login/', CustomLoginView.as_view(), name='login'),
 
+    # no trailing slash, so the download keeps its .csv name
+    path('projects/<int:pk>/proposals/export.csv',
+         ProjectViewSet.as_view({'get': 'export_proposals'}, permission_classes=[permissions.IsAuthenticated]),
+         name='projects-proposals-export'),
+
 
     path('', include(router.urls)),
 ]
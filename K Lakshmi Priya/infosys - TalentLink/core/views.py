@@ -6,7 +6,14 @@ from rest_framework.response import Response
 from rest_framework.decorators import action
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.exceptions import PermissionDenied
+from django.db.models import Count, Exists, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
 from .models import Profile, PortfolioItem, Project, Proposal
+from .search import ProjectSearchFilter
+from .pagination import ProjectCursorPagination
+from .response_cache import VersionedResponseCacheMixin
+from .exports import proposals_csv_response
+from .facets import project_facets, requested_facets
 
 User = get_user_model()
 
@@ -52,17 +59,45 @@ class PortfolioItemViewSet(viewsets.ModelViewSet):
         profile = self.request.user.profile
         serializer.save(profile=profile)
 
-class ProjectViewSet(viewsets.ModelViewSet):
+class ProjectViewSet(VersionedResponseCacheMixin, viewsets.ModelViewSet):
     serializer_class = ProjectSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
-    filter_backends = [filters.SearchFilter, DjangoFilterBackend]
+    filter_backends = [ProjectSearchFilter, DjangoFilterBackend]
+    # used only when the FTS5 index is unavailable (non-SQLite databases)
     search_fields = ['skills__name', 'title', 'budget', 'duration']
     filterset_fields = ['budget', 'duration', 'skills__name']
+    pagination_class = ProjectCursorPagination
 
 
-    
     def get_queryset(self):
-        return Project.objects.all()
+        queryset = Project.objects.all()
+        if self.action in ('list', 'retrieve'):
+            queryset = self.annotate_feed(queryset.prefetch_related('skills'))
+        return queryset
+
+    def annotate_feed(self, queryset):
+        # proposal_count and has_applied come from correlated subqueries in the
+        # same SELECT, so the feed needs no /proposals/ call or per-row queries
+        proposal_count = (
+            Proposal.objects.filter(project=OuterRef('pk')).order_by()
+            .values('project').annotate(n=Count('pk')).values('n')
+        )
+        user = self.request.user
+        if user.is_authenticated and user.role == 'freelancer':
+            has_applied = Exists(Proposal.objects.filter(project=OuterRef('pk'), freelancer=user))
+        else:
+            has_applied = Value(False)
+        return queryset.annotate(
+            proposal_count=Coalesce(Subquery(proposal_count, output_field=IntegerField()), 0),
+            has_applied=has_applied,
+        )
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        facets = requested_facets(self.request)
+        if facets:
+            response.data['facets'] = project_facets(self.filter_queryset(self.get_queryset()), facets)
+        return response
 
     def perform_create(self, serializer):
         user = self.request.user
@@ -89,10 +124,18 @@ class ProjectViewSet(viewsets.ModelViewSet):
         user = request.user
         if user != project.client:
             return Response({"detail": "Not authorized to view proposals for this project."}, status=403)
-        proposals = project.proposals.all()
+        # the serializer reads freelancer.username and project.title
+        proposals = project.proposals.select_related('freelancer', 'project')
         serializer = ProposalSerializer(proposals, many=True)
         return Response(serializer.data)
 
+    # routed in core/urls.py as projects/<pk>/proposals/export.csv
+    def export_proposals(self, request, pk=None):
+        project = self.get_object()
+        if project.client_id != request.user.pk:
+            return Response({"detail": "Not authorized to view proposals for this project."}, status=403)
+        return proposals_csv_response(project)
+
 class ProposalViewSet(viewsets.ModelViewSet):
     serializer_class = ProposalSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -7,7 +7,8 @@ function ProjectList() {
   const token = localStorage.getItem("access");
 
   const [projects, setProjects] = useState([]);
-  const [proposals, setProposals] = useState([]);
+  const [nextPage, setNextPage] = useState(null);
+  const [facets, setFacets] = useState(null);
   const [loading, setLoading] = useState(true);
   const [searchTerm, setSearchTerm] = useState("");
   const [showMyProjectsOnly, setShowMyProjectsOnly] = useState(false);
@@ -33,12 +34,17 @@ function ProjectList() {
     }
   }, []);
 
+  // one request: each project carries has_applied / proposal_count, and the
+  // response carries the skill and duration counts of the whole result set
   const fetchProjects = async () => {
     try {
       const res = await api.get("/projects/", {
+        params: { facets: "skills,duration" },
         headers: token ? { Authorization: `Bearer ${token}` } : {},
       });
-      setProjects(res.data);
+      setProjects(res.data.results);
+      setNextPage(res.data.next);
+      setFacets(res.data.facets);
     } catch (err) {
       console.error("Failed to fetch projects:", err);
     } finally {
@@ -46,30 +52,19 @@ function ProjectList() {
     }
   };
 
-  const fetchProposals = async () => {
-    if (!isFreelancer || !token || !userId) return;
-
-    try {
-      const res = await api.get(`/proposals/?freelancer=${userId}`, {
-        headers: { Authorization: `Bearer ${token}` },
-      });
-      setProposals(res.data);
-    } catch (err) {
-      console.error("Failed to fetch proposals:", err);
-    }
-  };
-
   useEffect(() => {
     fetchProjects();
-    fetchProposals();
-  }, [token, isFreelancer, userId]);
+  }, [token]);
 
   const handleSearch = async () => {
     try {
-      const res = await api.get(`/projects/?search=${searchTerm}`, {
+      const res = await api.get("/projects/", {
+        params: { search: searchTerm, facets: "skills,duration" },
         headers: token ? { Authorization: `Bearer ${token}` } : {},
       });
-      setProjects(res.data);
+      setProjects(res.data.results);
+      setNextPage(res.data.next);
+      setFacets(res.data.facets);
       setShowMyProjectsOnly(false);
       setShowAppliedProjectsOnly(false);
     } catch (err) {
@@ -77,6 +72,20 @@ function ProjectList() {
     }
   };
 
+  // next/previous are absolute URLs carrying the page cursor
+  const loadMore = async () => {
+    if (!nextPage) return;
+    try {
+      const res = await api.get(nextPage, {
+        headers: token ? { Authorization: `Bearer ${token}` } : {},
+      });
+      setProjects((prev) => [...prev, ...res.data.results]);
+      setNextPage(res.data.next);
+    } catch (err) {
+      console.error("Failed to load more projects:", err);
+    }
+  };
+
   const handleDelete = async (id) => {
     if (!window.confirm("Are you sure you want to delete this project?")) return;
     try {
@@ -96,8 +105,7 @@ function ProjectList() {
       return projects.filter((p) => String(p.client) === String(userId));
     }
     if (isFreelancer && showAppliedProjectsOnly) {
-      const appliedProjectIds = new Set(proposals.map((proposal) => proposal.project));
-      return projects.filter((p) => appliedProjectIds.has(p.id));
+      return projects.filter((p) => p.has_applied);
     }
     return projects;
   })();
@@ -159,6 +167,19 @@ function ProjectList() {
         </button>
       </div>
 
+      {facets && (
+        <div style={{ marginBottom: "1rem", color: "#555" }}>
+          {Object.entries(facets).map(([facet, counts]) => (
+            <p key={facet} style={{ margin: "0.25rem 0" }}>
+              <strong>{facet === "skills" ? "Skills" : "Duration"}:</strong>{" "}
+              {Object.entries(counts)
+                .map(([value, count]) => `${value} (${count})`)
+                .join(", ")}
+            </p>
+          ))}
+        </div>
+      )}
+
       <div style={{ marginTop: "1rem" }}>
         {filteredProjects.length === 0 ? (
           <p>No projects available.</p>
@@ -182,9 +203,14 @@ function ProjectList() {
               <p>{p.description}</p>
               <p>
                 <strong>Budget:</strong> ${p.budget} |{" "}
-                <strong>Duration:</strong> {p.duration} days
+                <strong>Duration:</strong> {p.duration} days |{" "}
+                <strong>Proposals:</strong> {p.proposal_count}
               </p>
 
+              {isFreelancer && p.has_applied && (
+                <p style={{ color: "green" }}>(You applied)</p>
+              )}
+
               {isClient && String(p.client) === String(userId) && (
                 <p style={{ color: "green" }}>(Posted by you)</p>
               )}
@@ -196,6 +222,12 @@ function ProjectList() {
           ))
         )}
       </div>
+
+      {nextPage && (
+        <button onClick={loadMore} style={{ marginTop: "1rem" }}>
+          Load more
+        </button>
+      )}
     </div>
   );
 }
@@ -0,0 +1,67 @@
+from django.db import IntegrityError, transaction
+
+from .models import Profile, Skill
+from .serializers import ProfileBulkSerializer, clean_skill_names
+
+# Rows written per transaction by import_profiles
+BATCH_SIZE = 500
+
+
+def import_profiles(rows, batch_size=BATCH_SIZE):
+    """
+    Validate and insert a list of profile dicts (ProfileSerializer fields plus
+    optional skill_names).
+
+    Rows are processed in batches; each batch costs one email lookup and, in its
+    own transaction, one INSERT for the profiles and one for their skills. Bad
+    rows are skipped and reported, they never stop the rest of the import.
+
+    Returns (created_ids, errors) where errors is [{"index": i, "errors": {...}}].
+    """
+    created_ids, errors = [], []
+    for start in range(0, len(rows), batch_size):
+        batch = []
+        for index, row in enumerate(rows[start:start + batch_size], start):
+            serializer = ProfileBulkSerializer(data=row)
+            if serializer.is_valid():
+                batch.append((index, serializer.validated_data))
+            else:
+                errors.append({"index": index, "errors": serializer.errors})
+
+        batch = _drop_taken_emails(batch, errors)
+        if not batch:
+            continue
+
+        try:
+            with transaction.atomic():
+                created_ids.extend(_insert_batch([data for _, data in batch]))
+        except IntegrityError as exc:
+            # e.g. an email registered by another request since the lookup
+            errors.extend({"index": index, "errors": {"non_field_errors": [str(exc)]}} for index, _ in batch)
+
+    errors.sort(key=lambda error: error["index"])
+    return created_ids, errors
+
+
+def _drop_taken_emails(batch, errors):
+    taken = set(
+        Profile.objects.filter(email__in=[data["email"] for _, data in batch]).values_list("email", flat=True)
+    )
+    accepted = []
+    for index, data in batch:
+        if data["email"] in taken:
+            errors.append({"index": index, "errors": {"email": ["profile with this email already exists."]}})
+            continue
+        # later rows of the same import can't reuse it either
+        taken.add(data["email"])
+        accepted.append((index, data))
+    return accepted
+
+
+def _insert_batch(batch):
+    skill_names = [clean_skill_names(data.pop("skill_names", [])) for data in batch]
+    profiles = Profile.objects.bulk_create([Profile(**data) for data in batch])
+    Skill.objects.bulk_create(
+        [Skill(profile=profile, name=name) for profile, names in zip(profiles, skill_names) for name in names]
+    )
+    return [profile.pk for profile in profiles]
@@ -0,0 +1,21 @@
+import os
+import tempfile
+from contextlib import contextmanager
+
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+
+@contextmanager
+def throwaway_database():
+    """A migrated, empty SQLite file for a benchmark to fill; db.sqlite3 is never touched."""
+    with tempfile.TemporaryDirectory() as directory:
+        old_name = connection.settings_dict["NAME"]
+        connection.settings_dict["TEST"]["NAME"] = os.path.join(directory, "benchmark.sqlite3")
+        setup_test_environment()
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            yield
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
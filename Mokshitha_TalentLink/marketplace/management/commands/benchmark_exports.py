@@ -0,0 +1,62 @@
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+
+from marketplace.management.benchmarks import throwaway_database
+from marketplace.models import Message, Profile
+
+BATCH = 10_000
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway database with messages and report the time and peak Python memory "
+        "(tracemalloc) of consuming /api/messages/?format=ndjson and ?format=csv in full."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1_000_000)
+        parser.add_argument("--with-json", action="store_true", help="Also measure the plain JSON list, for comparison.")
+
+    def handle(self, *args, **options):
+        formats = ["ndjson", "csv"] + (["json"] if options["with_json"] else [])
+        with throwaway_database():
+            self.seed(options["rows"])
+            for export_format in formats:
+                elapsed, peak, size = self.consume(export_format)
+                self.stdout.write(
+                    f"{export_format:>6}: {elapsed:6.1f} s, peak {peak / 2**20:7.1f} MB, "
+                    f"{size / 2**20:7.1f} MB of output"
+                )
+
+    def seed(self, rows):
+        started = time.perf_counter()
+        alice = Profile.objects.create(user_name="alice", email="alice@example.com")
+        bob = Profile.objects.create(user_name="bob", email="bob@example.com")
+        for start in range(0, rows, BATCH):
+            Message.objects.bulk_create([
+                Message(sender=alice, receiver=bob, content=f'message {i}, with "quotes"')
+                for i in range(start, min(start + BATCH, rows))
+            ])
+        self.stdout.write(f"Seeded {rows} messages in {time.perf_counter() - started:.0f} s")
+
+    def consume(self, export_format):
+        client = Client()
+        params = {} if export_format == "json" else {"format": export_format}
+        tracemalloc.start()
+        try:
+            started = time.perf_counter()
+            response = client.get("/api/messages/", params)
+            if response.status_code != 200:
+                raise CommandError(f"?format={export_format} returned {response.status_code}")
+            if response.streaming:
+                size = sum(len(chunk) for chunk in response.streaming_content)
+            else:
+                size = len(response.content)
+            elapsed = time.perf_counter() - started
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return elapsed, peak, size
@@ -0,0 +1,72 @@
+import asyncio
+import statistics
+import time
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient
+
+from marketplace.management.benchmarks import throwaway_database
+from marketplace.models import Skill
+
+PASSWORD = "s3cret-pass"
+
+
+def percentile(latencies, fraction):
+    return latencies[max(0, int(len(latencies) * fraction) - 1)]
+
+
+class Command(BaseCommand):
+    help = (
+        "Time GET /api/skills/ on the ASGI handler while concurrent logins hash passwords, "
+        "and report read p50 / p99 idle and during the storm. Uses a throwaway database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--logins", type=int, default=32, help="Concurrent logins in the storm.")
+        parser.add_argument("--reads", type=int, default=100, help="Sequential reads timed per phase.")
+
+    def handle(self, *args, **options):
+        with throwaway_database():
+            User.objects.create(username="alice", password=make_password(PASSWORD))
+            Skill.objects.create(name="Django")
+            started = time.perf_counter()
+            make_password(PASSWORD)
+            self.stdout.write(f"One password hash: {(time.perf_counter() - started) * 1000:.0f} ms")
+            idle, during, finished = asyncio.run(self.measure(options["logins"], options["reads"]))
+
+        for label, latencies in (("idle", idle), (f"during {options['logins']} logins", during)):
+            self.stdout.write(
+                f"reads {label:>20}: p50 {statistics.median(latencies) * 1000:7.1f} ms   "
+                f"p99 {percentile(latencies, 0.99) * 1000:7.1f} ms"
+            )
+        # the storm should outlast the reads, or they weren't measured under load
+        self.stdout.write(f"{finished} of {options['logins']} logins had finished when the reads did")
+
+    async def measure(self, logins, reads):
+        client = AsyncClient()
+
+        async def read_latencies():
+            latencies = []
+            for _ in range(reads):
+                started = time.perf_counter()
+                response = await client.get("/api/skills/")
+                latencies.append(time.perf_counter() - started)
+                if response.status_code != 200:
+                    raise CommandError(f"GET /api/skills/ returned {response.status_code}")
+            return sorted(latencies)
+
+        async def login():
+            return await client.post(
+                "/api/login/", {"username": "alice", "password": PASSWORD}, content_type="application/json"
+            )
+
+        idle = await read_latencies()
+        storm = [asyncio.ensure_future(login()) for _ in range(logins)]
+        during = await read_latencies()
+        finished = sum(future.done() for future in storm)
+        responses = await asyncio.gather(*storm)
+        if {response.status_code for response in responses} != {200}:
+            raise CommandError("Some logins in the storm failed.")
+        return idle, during, finished
@@ -0,0 +1,36 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, identify_hasher, make_password
+
+# PBKDF2 spends its time inside hashlib, which releases the GIL, so a few
+# threads hash in parallel while the event loop (and every other request) runs.
+_executor = None
+
+
+def get_executor():
+    """The bounded pool every password hash runs in (PASSWORD_HASHING_WORKERS threads)."""
+    global _executor
+    if _executor is None:
+        workers = getattr(settings, "PASSWORD_HASHING_WORKERS", None) or min(4, os.cpu_count() or 1)
+        _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hashing")
+    return _executor
+
+
+async def run_in_pool(func, *args):
+    return await asyncio.get_running_loop().run_in_executor(get_executor(), func, *args)
+
+
+async def hash_password(raw_password):
+    return await run_in_pool(make_password, raw_password)
+
+
+async def verify_password(raw_password, encoded):
+    """(matches, rehashed): rehashed is a new hash when the stored one uses outdated parameters."""
+    if not await run_in_pool(check_password, raw_password, encoded):
+        return False, None
+    if identify_hasher(encoded).must_update(encoded):
+        return True, await hash_password(raw_password)
+    return True, None
@@ -1,3 +1,4 @@
+from django.db import transaction
 from rest_framework import serializers
 from .models import Profile, Skill, Item, Project, Proposal, Contract, Message, Review
 
@@ -34,25 +35,54 @@ class ProfileSerializer(serializers.ModelSerializer):
             "skill_names"
         ]
 
+    @transaction.atomic
     def create(self, validated_data):
-        skills = validated_data.pop("skill_names", [])
+        skills = clean_skill_names(validated_data.pop("skill_names", []))
         profile = Profile.objects.create(**validated_data)
-        for name in skills:
-            Skill.objects.create(profile=profile, name=name.strip())
+        Skill.objects.bulk_create([Skill(profile=profile, name=name) for name in skills])
         return profile
 
+    @transaction.atomic
     def update(self, instance, validated_data):
         skills = validated_data.pop("skill_names", None)
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
         instance.save()
         if skills is not None:
-            instance.skills.all().delete()
-            for name in skills:
-                if name.strip():
-                    Skill.objects.create(profile=instance, name=name.strip())
+            sync_skills(instance, clean_skill_names(skills))
         return instance
 
+
+# -------- Bulk Profile Serializer --------
+class ProfileBulkSerializer(ProfileSerializer):
+    """One row of POST /api/profiles/bulk/; email uniqueness is checked per batch in bulk.py."""
+
+    class Meta(ProfileSerializer.Meta):
+        extra_kwargs = {"email": {"validators": []}}
+
+
+def clean_skill_names(names):
+    """Stripped, non-empty skill names without duplicates, in the order given."""
+    return list(dict.fromkeys(name.strip() for name in names if name.strip()))
+
+
+def sync_skills(profile, names):
+    """
+    Make the profile's skills match `names` with one DELETE and one INSERT.
+    Skills that stay keep their row (and level / project links).
+    """
+    wanted = set(names)
+    kept, stale = set(), []
+    for pk, name in profile.skills.values_list("id", "name"):
+        if name in wanted and name not in kept:
+            kept.add(name)
+        else:
+            stale.append(pk)
+    if stale:
+        Skill.objects.filter(pk__in=stale).delete()
+    Skill.objects.bulk_create([Skill(profile=profile, name=name) for name in names if name not in kept])
+
+
 # -------- Item Serializer --------
 class ItemSerializer(serializers.ModelSerializer):
     class Meta:
@@ -1,3 +1,168 @@
-from django.test import TestCase
+import asyncio
+import csv
+import io
+import json
+import threading
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import AsyncClient, TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from . import passwords
+from .models import Message, Profile, Project, Proposal, Skill
+from .serializers import ProfileSerializer
+
+
+class ProfileSkillsTests(TestCase):
+    def test_create_inserts_skills_in_one_query(self):
+        serializer = ProfileSerializer(data={
+            "user_name": "asha", "email": "asha@example.com", "skill_names": ["Python", " Django ", "Python"],
+        })
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        with CaptureQueriesContext(connection) as queries:
+            profile = serializer.save()
+        skill_inserts = [q for q in queries if q["sql"].startswith('INSERT INTO "marketplace_skill"')]
+        self.assertEqual(len(skill_inserts), 1)
+        self.assertEqual(sorted(profile.skills.values_list("name", flat=True)), ["Django", "Python"])
+
+    def test_update_applies_a_diff(self):
+        profile = Profile.objects.create(user_name="ravi", email="ravi@example.com")
+        python = Skill.objects.create(profile=profile, name="Python", level="expert")
+        Skill.objects.create(profile=profile, name="PHP")
+
+        serializer = ProfileSerializer(profile, data={"skill_names": ["Python", "React"]}, partial=True)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        serializer.save()
+
+        skills = {skill.name: skill for skill in profile.skills.all()}
+        self.assertEqual(sorted(skills), ["Python", "React"])
+        # unchanged skills keep their row
+        self.assertEqual(skills["Python"].pk, python.pk)
+        self.assertEqual(skills["Python"].level, "expert")
+
+
+class ProfileBulkImportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        Profile.objects.create(user_name="taken", email="taken@example.com")
+
+    def test_bulk_import_reports_errors_per_row(self):
+        rows = [
+            {"user_name": "user%d" % i, "email": "user%d@example.com" % i, "skill_names": ["Python", "SQL"]}
+            for i in range(1200)
+        ]
+        rows[3] = {"user_name": "dupe", "email": "taken@example.com"}
+        rows[700] = {"user_name": "bad", "email": "not-an-email"}
+        rows[701] = {"user_name": "again", "email": "user5@example.com"}
+
+        response = self.client.post("/api/profiles/bulk/", {"profiles": rows}, format="json")
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["created"], 1197)
+        self.assertEqual([error["index"] for error in response.data["errors"]], [3, 700, 701])
+        self.assertIn("email", response.data["errors"][1]["errors"])
+        self.assertEqual(Profile.objects.count(), 1198)
+        self.assertEqual(Skill.objects.count(), 1197 * 2)
+
+    def test_bulk_import_rejects_non_list(self):
+        response = self.client.post("/api/profiles/bulk/", {"profiles": "nope"}, format="json")
+        self.assertEqual(response.status_code, 400)
+
+
+class StreamingExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.alice = Profile.objects.create(user_name="alice", email="alice@example.com")
+        cls.bob = Profile.objects.create(user_name="bob", email="bob@example.com")
+        project = Project.objects.create(title="Shop", description="x", owner=cls.alice, budget=100)
+        Proposal.objects.create(project=project, freelancer=cls.bob, description="Me, please", price="80.50")
+        for i in range(1203):
+            Message.objects.create(sender=cls.alice, receiver=cls.bob, content='line %d, "quoted"' % i)
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_ndjson_matches_json_list(self):
+        response = self.client.get("/api/messages/", {"format": "ndjson"})
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        rows = [json.loads(line) for line in b"".join(response.streaming_content).decode().splitlines()]
+        self.assertEqual(rows, self.client.get("/api/messages/").json())
+
+    def test_ndjson_keeps_decimals_as_strings(self):
+        response = self.client.get("/api/proposals/", {"format": "ndjson"})
+        row = json.loads(b"".join(response.streaming_content).decode().splitlines()[0])
+        listed = self.client.get("/api/proposals/").json()[0]
+        self.assertEqual(row["price"], "80.50")
+        self.assertEqual(row["price"], listed["price"])
+
+    def test_csv_export(self):
+        response = self.client.get("/api/proposals/", {"format": "csv"})
+        self.assertTrue(response.streaming)
+        rows = list(csv.reader(io.StringIO(b"".join(response.streaming_content).decode())))
+        self.assertEqual(rows[0], [
+            "id", "project", "freelancer", "description", "price", "status", "project_title", "freelancer_name",
+        ])
+        self.assertEqual(rows[1][3:], ["Me, please", "80.50", "pending", "Shop", "bob"])
+
+
+class AsyncAuthenticationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username="alice", password=make_password("s3cret-pass"))
+        Skill.objects.create(name="Django")
+
+    def post(self, path, data):
+        return self.client.post(path, json.dumps(data), content_type="application/json")
+
+    def test_register_then_login(self):
+        response = self.post("/api/register/", {"username": "bob", "email": "bob@example.com", "password": "pw-123456"})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["id"], Profile.objects.get(email="bob@example.com").pk)
+        self.assertTrue(User.objects.get(username="bob").check_password("pw-123456"))
+
+        response = self.post("/api/register/", {"username": "bob", "email": "other@example.com", "password": "x"})
+        self.assertEqual(response.json(), {"error": "Username already exists"})
+
+        response = self.post("/api/login/", {"username": "bob", "password": "pw-123456"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.json()), {"refresh", "access"})
+
+    def test_login_rejects_bad_credentials(self):
+        for data in ({"username": "alice", "password": "wrong"}, {"username": "nobody", "password": "x"}, {}):
+            self.assertEqual(self.post("/api/login/", data).status_code, 401)
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        self.assertEqual(self.post("/api/login/", {"username": "alice", "password": "s3cret-pass"}).status_code, 401)
+
+    async def test_hashing_runs_off_the_event_loop(self):
+        client = AsyncClient()
+        loop_thread = threading.current_thread()
+        hashed_on = []
+
+        def recorded(func):
+            def wrapper(*args, **kwargs):
+                hashed_on.append(threading.current_thread())
+                return func(*args, **kwargs)
+            return wrapper
+
+        async def post(path, data):
+            return await client.post(path, data, content_type="application/json")
+
+        with mock.patch.object(passwords, "make_password", recorded(passwords.make_password)), \
+                mock.patch.object(passwords, "check_password", recorded(passwords.check_password)):
+            responses = await asyncio.gather(
+                post("/api/register/", {"username": "bob", "email": "bob@example.com", "password": "pw-123456"}),
+                post("/api/login/", {"username": "alice", "password": "s3cret-pass"}),
+                post("/api/login/", {"username": "alice", "password": "wrong"}),
+                post("/api/login/", {"username": "nobody", "password": "x"}),
+            )
+
+        self.assertEqual([response.status_code for response in responses], [201, 200, 401, 401])
+        # one hash for the registration, one check per known user, one dummy hash for the unknown one
+        self.assertEqual(len(hashed_on), 4)
+        self.assertNotIn(loop_thread, hashed_on)
+        self.assertTrue(all(thread.name.startswith("password-hashing") for thread in hashed_on))
@@ -1,12 +1,21 @@
+import json
+
+from asgiref.sync import sync_to_async
 from rest_framework import viewsets, filters, status, serializers
-from django.contrib.auth import authenticate
 from django.contrib.auth.models import User
-from rest_framework.decorators import api_view
+from django.db import IntegrityError, transaction
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+from rest_framework.decorators import action, api_view
 from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import RefreshToken
 from django_filters.rest_framework import DjangoFilterBackend
 
+from .bulk import import_profiles
+from .exports import StreamingExportMixin
 from .models import Profile, Skill, Item, Project, Proposal, Contract, Message, Review
+from .passwords import hash_password, verify_password
 from .serializers import (
     ProfileSerializer, SkillSerializer, ItemSerializer,
     ProjectSerializer, ProposalSerializer, ContractSerializer,
@@ -18,6 +27,19 @@ class ProfileViewSet(viewsets.ModelViewSet):
     queryset = Profile.objects.all()
     serializer_class = ProfileSerializer
 
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        # accepts [{...}, ...] or {"profiles": [{...}, ...]}
+        rows = request.data.get("profiles") if isinstance(request.data, dict) else request.data
+        if not isinstance(rows, list):
+            return Response({"error": "Expected a list of profiles."}, status=status.HTTP_400_BAD_REQUEST)
+
+        created_ids, errors = import_profiles(rows)
+        return Response(
+            {"created": len(created_ids), "ids": created_ids, "errors": errors},
+            status=status.HTTP_201_CREATED if created_ids else status.HTTP_400_BAD_REQUEST
+        )
+
 
 # -------- Skill --------
 class SkillViewSet(viewsets.ModelViewSet):
@@ -46,9 +68,20 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework import status
 
-class ProposalViewSet(viewsets.ModelViewSet):
+class ProposalViewSet(StreamingExportMixin, viewsets.ModelViewSet):
     queryset = Proposal.objects.all()
     serializer_class = ProposalSerializer
+    export_name = "proposals"
+    export_fields = (
+        ("id", "id"),
+        ("project", "project_id"),
+        ("freelancer", "freelancer_id"),
+        ("description", "description"),
+        ("price", "price"),
+        ("status", "status"),
+        ("project_title", "project__title"),
+        ("freelancer_name", "freelancer__user_name"),
+    )
 
     @action(detail=True, methods=['post'])
     def accept(self, request, pk=None):
@@ -73,9 +106,17 @@ class ContractViewSet(viewsets.ModelViewSet):
 
 
 # -------- Message --------
-class MessageViewSet(viewsets.ModelViewSet):
+class MessageViewSet(StreamingExportMixin, viewsets.ModelViewSet):
     queryset = Message.objects.all()
     serializer_class = MessageSerializer
+    export_name = "messages"
+    export_fields = (
+        ("id", "id"),
+        ("sender", "sender_id"),
+        ("receiver", "receiver_id"),
+        ("content", "content"),
+        ("timestamp", "timestamp"),
+    )
 
 
 # -------- Review --------
@@ -85,41 +126,94 @@ class ReviewViewSet(viewsets.ModelViewSet):
 
 
 # -------- Authentication --------
-@api_view(['POST'])
-def register_user(request):
-    username = request.data.get('username')
-    email = request.data.get('email')
-    password = request.data.get('password')
+# Async views: under ASGI (talentlink/asgi.py) the PBKDF2 work runs in the
+# bounded pool of marketplace/passwords.py instead of the thread that serves
+# every sync view, so a burst of logins doesn't hold up the rest of the API.
+
+def json_response(data, status=200):
+    return JsonResponse(data, status=status, json_dumps_params={"ensure_ascii": False})
+
+
+def request_data(request):
+    """The JSON body (or form fields) as a dict, None if it can't be parsed."""
+    if request.content_type == "application/json":
+        try:
+            data = json.loads(request.body or b"{}")
+        except ValueError:
+            return None
+        return data if isinstance(data, dict) else None
+    return request.POST.dict()
+
+
+def create_account(username, email, password_hash):
+    with transaction.atomic():
+        user = User(
+            username=User.normalize_username(username),
+            email=User.objects.normalize_email(email),
+            password=password_hash,
+        )
+        user.save()
+        return Profile.objects.create(user_name=username, email=email)
+
+
+@csrf_exempt
+@require_POST
+async def register_user(request):
+    data = request_data(request)
+    if data is None:
+        return json_response({"error": "Invalid request body"}, status=status.HTTP_400_BAD_REQUEST)
+    username = data.get('username')
+    email = data.get('email')
+    password = data.get('password')
 
     if not username or not email or not password:
-        return Response({"error": "All fields are required"}, status=status.HTTP_400_BAD_REQUEST)
+        return json_response({"error": "All fields are required"}, status=status.HTTP_400_BAD_REQUEST)
 
-    if User.objects.filter(username=username).exists():
-        return Response({"error": "Username already exists"}, status=status.HTTP_400_BAD_REQUEST)
+    if await User.objects.filter(username=username).aexists():
+        return json_response({"error": "Username already exists"}, status=status.HTTP_400_BAD_REQUEST)
 
-    if Profile.objects.filter(email=email).exists():
-        return Response({"error": "Email already registered"}, status=status.HTTP_400_BAD_REQUEST)
+    if await Profile.objects.filter(email=email).aexists():
+        return json_response({"error": "Email already registered"}, status=status.HTTP_400_BAD_REQUEST)
 
-    user = User.objects.create_user(username=username, email=email, password=password)
-    profile = Profile.objects.create(user_name=username, email=email)
+    password_hash = await hash_password(password)
+    try:
+        profile = await sync_to_async(create_account)(username, email, password_hash)
+    except IntegrityError:
+        # registered by a concurrent request since the check above
+        return json_response({"error": "Username already exists"}, status=status.HTTP_400_BAD_REQUEST)
 
-    return Response(
+    return json_response(
         {"message": "User registered successfully ✅", "id": profile.id, "username": username, "email": email},
         status=status.HTTP_201_CREATED
     )
 
 
-@api_view(['POST'])
-def login_user(request):
-    username = request.data.get('username')
-    password = request.data.get('password')
-
-    user = authenticate(username=username, password=password)
-    if user is not None:
-        refresh = RefreshToken.for_user(user)
-        return Response({"refresh": str(refresh), "access": str(refresh.access_token)})
-    else:
-        return Response({"error": "Invalid credentials"}, status=status.HTTP_401_UNAUTHORIZED)
+@csrf_exempt
+@require_POST
+async def login_user(request):
+    # the check ModelBackend.authenticate() makes, with the hashing moved off-thread
+    data = request_data(request) or {}
+    username = data.get('username')
+    password = data.get('password')
+    invalid = json_response({"error": "Invalid credentials"}, status=status.HTTP_401_UNAUTHORIZED)
+    if not username or not password:
+        return invalid
+
+    user = await User.objects.filter(username=username).afirst()
+    if user is None:
+        # hash anyway, so an unknown username takes as long as a wrong password
+        await hash_password(password)
+        return invalid
+
+    matches, rehashed = await verify_password(password, user.password)
+    if not matches or not user.is_active:
+        return invalid
+    if rehashed:
+        user.password = rehashed
+        await user.asave(update_fields=["password"])
+
+    refresh = RefreshToken.for_user(user)
+    return json_response({"refresh": str(refresh), "access": str(refresh.access_token)})
 
 @api_view(['POST'])
 def set_user_role(request):
@@ -3,6 +3,11 @@ ASGI config for talentlink project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Serve the API with an ASGI server (e.g. ``uvicorn talentlink.asgi:application``)
+so the async login / register views run on the event loop and hash passwords in
+the pool from marketplace/passwords.py. Under WSGI they still work, but each
+one occupies a worker thread for the whole request.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
@@ -120,3 +120,7 @@ REST_FRAMEWORK = {
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ),
 }
+
+# Threads that hash / check passwords for the async login and register views
+# (marketplace/passwords.py); defaults to min(4, CPU count)
+PASSWORD_HASHING_WORKERS = None
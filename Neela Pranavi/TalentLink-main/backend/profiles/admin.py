@@ -1,6 +1,6 @@
 
 from django.contrib import admin
-from .models import Profile, Skill
+from .models import Profile, Review, Skill
 
 @admin.register(Skill)
 class SkillAdmin(admin.ModelAdmin):
@@ -13,3 +13,9 @@ class ProfileAdmin(admin.ModelAdmin):
     list_filter = ['availability', 'user__user_type', 'created_at']
     search_fields = ['user__username', 'user__email', 'location']
     filter_horizontal = ['skills']
+
+@admin.register(Review)
+class ReviewAdmin(admin.ModelAdmin):
+    list_display = ['freelancer', 'reviewer', 'project', 'rating', 'created_at']
+    search_fields = ['freelancer__username', 'reviewer__username', 'project__title']
+    # edits and deletes go through Review.save() / delete, which keep Profile.rating in step
@@ -0,0 +1,99 @@
+
+import hashlib
+import json
+from collections import Counter
+
+from django.core.cache import cache
+from django.db.models import BooleanField, Case, CharField, Count, Q, Value, When
+
+from .models import Profile
+
+FACETS = ('skills', 'hourly_rate', 'location', 'available')
+
+# (label, lower bound inclusive, upper bound exclusive) of the hourly-rate facet
+RATE_BANDS = (
+    ('0-25', 0, 25),
+    ('25-50', 25, 50),
+    ('50-100', 50, 100),
+    ('100+', 100, None),
+)
+
+FACET_CACHE_TIMEOUT = 30
+
+
+def rate_band():
+    """SQL CASE giving each profile's RATE_BANDS label (NULL without a rate)."""
+    whens = []
+    for label, low, high in RATE_BANDS:
+        condition = Q(hourly_rate__gte=low)
+        if high is not None:
+            condition &= Q(hourly_rate__lt=high)
+        whens.append(When(condition, then=Value(label)))
+    return Case(*whens, default=None, output_field=CharField())
+
+
+def facet_cache_key(filters, facets):
+    normalized = json.dumps([sorted(filters.items()), sorted(facets)])
+    return 'profile-facets:' + hashlib.md5(normalized.encode()).hexdigest()
+
+
+def compute_facets(queryset, facets):
+    """
+    Counts for the requested facets over the profiles in `queryset`, from one query.
+
+    Rate band, location and availability are grouped together (few distinct
+    combinations), skills per name over the profile / skill join; the two
+    groupings come back in one UNION ALL and are summed up here.
+    """
+    ids = queryset.order_by().values('pk')
+    combos = (
+        Profile.objects.filter(pk__in=ids).order_by()
+        .annotate(band=rate_band(), skill=Value(None, output_field=CharField()))
+        .values_list('band', 'location', 'availability', 'skill')
+        .annotate(n=Count('pk'))
+    )
+    if 'skills' in facets:
+        ProfileSkill = Profile.skills.through
+        skills = (
+            ProfileSkill.objects.filter(profile_id__in=ids).order_by()
+            .annotate(
+                band=Value(None, output_field=CharField()),
+                location=Value(None, output_field=CharField()),
+                availability=Value(None, output_field=BooleanField()),
+            )
+            .values_list('band', 'location', 'availability', 'skill__name')
+            .annotate(n=Count('pk'))
+        )
+        combos = combos.union(skills, all=True)
+
+    skill_counts, rates, locations = Counter(), Counter(), Counter()
+    available = 0
+    for band, location, availability, skill, n in combos:
+        if skill is not None:
+            skill_counts[skill] += n
+            continue
+        if band is not None:
+            rates[band] += n
+        location = location.strip()
+        if location:
+            locations[location] += n
+        if availability:
+            available += n
+
+    counted = {
+        'skills': dict(skill_counts.most_common()),
+        'hourly_rate': {label: rates[label] for label, _, _ in RATE_BANDS},
+        'location': dict(locations.most_common()),
+        'available': available,
+    }
+    return {name: counted[name] for name in facets}
+
+
+def cached_facets(queryset, filters, facets):
+    """compute_facets(), cached for FACET_CACHE_TIMEOUT seconds per normalized filter set."""
+    key = facet_cache_key(filters, facets)
+    result = cache.get(key)
+    if result is None:
+        result = compute_facets(queryset, facets)
+        cache.set(key, result, FACET_CACHE_TIMEOUT)
+    return result
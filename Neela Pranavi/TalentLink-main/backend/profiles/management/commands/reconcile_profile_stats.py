@@ -0,0 +1,74 @@
+
+from django.core.management.base import BaseCommand
+from django.db.models import Count, FloatField, IntegerField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Cast, Coalesce, NullIf
+from profiles.models import Profile, Review
+from proposals.models import Proposal
+
+
+def per_freelancer(queryset, aggregate):
+    """`aggregate` over the rows of `queryset` belonging to the profile's user, as a correlated subquery."""
+    return Coalesce(
+        Subquery(
+            queryset.filter(freelancer=OuterRef('user_id'))
+            .order_by()
+            .values('freelancer')
+            .annotate(total=aggregate)
+            .values('total'),
+            output_field=IntegerField(),
+        ),
+        0,
+    )
+
+
+class Command(BaseCommand):
+    help = "Recompute Profile.total_projects and the rating sum / count / average from the tables and fix any drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--dry-run', action='store_true', help="Only report drifted profiles.")
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        hired = Proposal.objects.filter(status=Proposal.HIRED_STATUS)
+        actual = {
+            'total_projects': per_freelancer(hired, Count('id')),
+            'rating_sum': per_freelancer(Review.objects.all(), Sum('rating')),
+            'rating_count': per_freelancer(Review.objects.all(), Count('id')),
+        }
+        fields = list(actual)
+        drifted = 0
+        last_id = 0
+
+        while True:
+            batch = list(
+                Profile.objects.filter(id__gt=last_id)
+                .order_by('id')
+                .annotate(**{f'actual_{field}': expression for field, expression in actual.items()})
+                .values('id', 'rating', *fields, *[f'actual_{field}' for field in fields])[:batch_size]
+            )
+            if not batch:
+                break
+            last_id = batch[-1]['id']
+
+            fix_ids = [row['id'] for row in batch if self.drifted(row, fields)]
+            drifted += len(fix_ids)
+            if fix_ids and not options['dry_run']:
+                # recount in the UPDATE itself so concurrent hires / reviews aren't lost
+                Profile.objects.filter(pk__in=fix_ids).update(
+                    **actual,
+                    rating=Coalesce(
+                        Cast(actual['rating_sum'], FloatField()) / NullIf(actual['rating_count'], Value(0)),
+                        Value(0.0),
+                    ),
+                )
+
+        verb = "Found" if options['dry_run'] else "Fixed"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {drifted} profile(s) with drifted project or rating totals."))
+
+    def drifted(self, row, fields):
+        if any(row[field] != row[f'actual_{field}'] for field in fields):
+            return True
+        count = row['actual_rating_count']
+        average = row['actual_rating_sum'] / count if count else 0.0
+        return abs(row['rating'] - average) > 1e-9
@@ -1,5 +1,10 @@
 
-from django.db import models
+from django.core.validators import MaxValueValidator, MinValueValidator
+from django.db import models, transaction
+from django.db.models import F, FloatField, Value
+from django.db.models.functions import Cast, Coalesce, NullIf
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -20,10 +25,76 @@ class Profile(models.Model):
     phone = models.CharField(max_length=20, blank=True)
     skills = models.ManyToManyField(Skill, blank=True)
     availability = models.BooleanField(default=True)
+    # average of the freelancer's reviews, stored next to the running sum and
+    # count it is derived from; all three change together in adjust_rating()
     rating = models.FloatField(default=0.0)
+    rating_sum = models.IntegerField(default=0, editable=False)
+    rating_count = models.IntegerField(default=0, editable=False)
+    # projects the freelancer was hired on (accepted proposals), kept up to date
+    # by proposals.models.Proposal; `manage.py reconcile_profile_stats` repairs drift
     total_projects = models.IntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"{self.user.username}'s Profile"
+
+
+def adjust_rating(user_id, sum_delta, count_delta):
+    """Move a freelancer's running rating sum / count and re-derive the average, in one UPDATE."""
+    new_sum = F('rating_sum') + sum_delta
+    new_count = F('rating_count') + count_delta
+    # every right-hand side reads the row as it was before this UPDATE
+    Profile.objects.filter(user_id=user_id).update(
+        rating_sum=new_sum,
+        rating_count=new_count,
+        rating=Coalesce(Cast(new_sum, FloatField()) / NullIf(new_count, Value(0)), Value(0.0)),
+    )
+
+
+def adjust_total_projects(user_id, delta):
+    Profile.objects.filter(user_id=user_id).update(total_projects=F('total_projects') + delta)
+
+
+class Review(models.Model):
+    project = models.ForeignKey('projects.Project', on_delete=models.CASCADE, related_name='reviews')
+    reviewer = models.ForeignKey(User, on_delete=models.CASCADE, related_name='reviews_given')
+    freelancer = models.ForeignKey(User, on_delete=models.CASCADE, related_name='reviews_received')
+    rating = models.PositiveSmallIntegerField(validators=[MinValueValidator(1), MaxValueValidator(5)])
+    comment = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ['project', 'reviewer']
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.rating}/5 for {self.freelancer.username} on {self.project.title}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if 'rating' in field_names:
+            instance._counted_rating = instance.rating
+        return instance
+
+    def save(self, *args, **kwargs):
+        # (sum, count) change for the freelancer's profile; moving a review to
+        # another freelancer isn't supported
+        if self._state.adding:
+            delta = (self.rating, 1)
+        else:
+            delta = (self.rating - getattr(self, '_counted_rating', self.rating), 0)
+        update_fields = kwargs.get('update_fields')
+        rating_saved = update_fields is None or 'rating' in update_fields
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if rating_saved and delta != (0, 0):
+                adjust_rating(self.freelancer_id, *delta)
+        if rating_saved:
+            self._counted_rating = self.rating
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    adjust_rating(instance.freelancer_id, -getattr(instance, '_counted_rating', instance.rating), -1)
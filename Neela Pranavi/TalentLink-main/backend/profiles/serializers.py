@@ -1,6 +1,6 @@
 
 from rest_framework import serializers
-from .models import Profile, Skill
+from .models import Profile, Review, Skill
 
 class SkillSerializer(serializers.ModelSerializer):
     class Meta:
@@ -40,3 +40,29 @@ class ProfileSerializer(serializers.ModelSerializer):
             instance.skills.set(skills)
 
         return instance
+
+class ReviewSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Review
+        fields = ['id', 'project', 'reviewer', 'freelancer', 'rating', 'comment', 'created_at']
+        read_only_fields = ['reviewer', 'freelancer', 'created_at']
+
+    def validate(self, data):
+        project = data['project']
+        reviewer = self.context['request'].user
+
+        if project.client_id != reviewer.id:
+            raise serializers.ValidationError("You can only review freelancers on your own projects.")
+
+        if project.status != 'completed':
+            raise serializers.ValidationError("Reviews can be added once the project is completed.")
+
+        freelancer_id = project.proposals.filter(status='accepted').values_list('freelancer_id', flat=True).first()
+        if freelancer_id is None:
+            raise serializers.ValidationError("No freelancer was hired for this project.")
+
+        if Review.objects.filter(project=project, reviewer=reviewer).exists():
+            raise serializers.ValidationError("You have already reviewed this project.")
+
+        data['freelancer_id'] = freelancer_id
+        return data
@@ -0,0 +1,167 @@
+
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from projects.models import Project
+from proposals.models import Proposal
+from .models import Profile, Review, Skill
+
+User = get_user_model()
+
+
+class ProfileFacetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        python, django, react = (Skill.objects.create(name=name) for name in ('Python', 'Django', 'React'))
+        for username, rate, location, available, skills in (
+            ('ana', 20, 'Pune', True, [python, django]),
+            ('ben', 45, 'Pune', False, [python]),
+            ('cy', 80, 'Delhi', True, [react]),
+            ('dee', None, '', True, [python, react]),
+            ('eli', 150, 'Delhi', True, []),
+        ):
+            user = User.objects.create_user(
+                username=username, email=f'{username}@example.com', password='pass12345', user_type='freelancer'
+            )
+            profile = Profile.objects.create(user=user, hourly_rate=rate, location=location, availability=available)
+            profile.skills.set(skills)
+
+    def setUp(self):
+        cache.clear()
+        self.api = APIClient()
+
+    def get(self, **params):
+        response = self.api.get('/api/profiles/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_all_facets_in_one_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            data = self.get(facets='skills,hourly_rate,location,available', page_size=1)
+        self.assertEqual(data['facets'], {
+            'skills': {'Python': 3, 'React': 2, 'Django': 1},
+            'hourly_rate': {'0-25': 1, '25-50': 1, '50-100': 1, '100+': 1},
+            'location': {'Pune': 2, 'Delhi': 2},
+            'available': 4,
+        })
+        facet_queries = [query for query in queries if '"profiles_profile_skills"' in query['sql']
+                         and 'IN (SELECT' in query['sql']]
+        self.assertEqual(len(facet_queries), 1)
+
+    def test_facets_follow_filters(self):
+        data = self.get(skills='Python', available='true', facets='location,skills')
+        self.assertEqual(list(data['facets']), ['location', 'skills'])
+        self.assertEqual(data['facets']['location'], {'Pune': 1})
+        self.assertEqual(data['facets']['skills'], {'Python': 2, 'Django': 1, 'React': 1})
+
+    def test_cached_per_normalized_filters(self):
+        self.get(skills='Python,Django', location='pune', facets='available')
+        with CaptureQueriesContext(connection) as queries:
+            data = self.get(skills=' Django,Python', location='Pune ', facets='available')
+        self.assertEqual(data['facets'], {'available': 1})
+        self.assertFalse(any('IN (SELECT' in query['sql'] for query in queries))
+
+    def test_without_facets(self):
+        self.assertNotIn('facets', self.get())
+
+    def test_unknown_facet(self):
+        self.assertEqual(self.api.get('/api/profiles/', {'facets': 'skills,colour'}).status_code, 400)
+
+
+class ProfileStatsTests(TestCase):
+    def setUp(self):
+        self.client_user = User.objects.create_user(
+            username='client', email='client@example.com', password='pass12345', user_type='client'
+        )
+        self.freelancer = User.objects.create_user(
+            username='free', email='free@example.com', password='pass12345', user_type='freelancer'
+        )
+        self.profile = Profile.objects.create(user=self.freelancer)
+        self.api = APIClient()
+        self.api.force_authenticate(self.client_user)
+
+    def hire(self, title='Site'):
+        project = Project.objects.create(
+            title=title, description='...', client=self.client_user, budget_type='fixed', duration='1_3_months'
+        )
+        proposal = Proposal.objects.create(
+            project=project, freelancer=self.freelancer, cover_letter='Hi', proposed_budget=100, proposed_timeline='2 weeks'
+        )
+        response = self.api.post(f'/api/proposals/{proposal.pk}/accept/')
+        self.assertEqual(response.status_code, 200)
+        return project, proposal
+
+    def stats(self):
+        self.profile.refresh_from_db()
+        return self.profile.total_projects, self.profile.rating_sum, self.profile.rating_count, self.profile.rating
+
+    def test_accepting_counts_a_project(self):
+        _, proposal = self.hire()
+        self.hire('Second')
+        self.assertEqual(self.stats()[0], 2)
+        Proposal.objects.get(pk=proposal.pk).delete()
+        self.assertEqual(self.stats()[0], 1)
+
+    def test_status_update_through_save(self):
+        project = Project.objects.create(
+            title='Patched', description='...', client=self.client_user, budget_type='fixed', duration='1_3_months'
+        )
+        proposal = Proposal.objects.create(
+            project=project, freelancer=self.freelancer, cover_letter='Hi', proposed_budget=100, proposed_timeline='2 weeks'
+        )
+        proposal.status = 'accepted'
+        proposal.save()
+        self.assertEqual(self.stats()[0], 1)
+        proposal.status = 'rejected'
+        proposal.save(update_fields=['status'])
+        self.assertEqual(self.stats()[0], 0)
+
+    def test_reviews_keep_a_running_average(self):
+        for title, rating in (('One', 5), ('Two', 4)):
+            project, _ = self.hire(title)
+            Project.objects.filter(pk=project.pk).update(status='completed')
+            response = self.api.post('/api/profiles/reviews/', {'project': project.pk, 'rating': rating})
+            self.assertEqual(response.status_code, 201)
+            self.assertEqual(response.data['freelancer'], self.freelancer.pk)
+        self.assertEqual(self.stats(), (2, 9, 2, 4.5))
+
+        review = Review.objects.get(rating=4)
+        review.rating = 1
+        review.save()
+        self.assertEqual(self.stats()[1:], (6, 2, 3.0))
+        review.delete()
+        self.assertEqual(self.stats()[1:], (5, 1, 5.0))
+
+    def test_review_rules(self):
+        project, _ = self.hire()
+        response = self.api.post('/api/profiles/reviews/', {'project': project.pk, 'rating': 5})
+        self.assertEqual(response.status_code, 400)
+        Project.objects.filter(pk=project.pk).update(status='completed')
+        self.assertEqual(self.api.post('/api/profiles/reviews/', {'project': project.pk, 'rating': 6}).status_code, 400)
+        self.assertEqual(self.api.post('/api/profiles/reviews/', {'project': project.pk, 'rating': 3}).status_code, 201)
+        self.assertEqual(self.api.post('/api/profiles/reviews/', {'project': project.pk, 'rating': 3}).status_code, 400)
+
+    def test_reconciler_repairs_drift(self):
+        project, _ = self.hire()
+        Project.objects.filter(pk=project.pk).update(status='completed')
+        self.api.post('/api/profiles/reviews/', {'project': project.pk, 'rating': 4})
+        Profile.objects.filter(pk=self.profile.pk).update(total_projects=7, rating=1.0)
+        other = User.objects.create_user(
+            username='other', email='other@example.com', password='pass12345', user_type='freelancer'
+        )
+        Profile.objects.create(user=other)
+
+        out = StringIO()
+        call_command('reconcile_profile_stats', '--dry-run', stdout=out)
+        self.assertIn('Found 1 profile(s)', out.getvalue())
+        self.assertEqual(self.stats()[0], 7)
+
+        call_command('reconcile_profile_stats', '--batch-size', '1', stdout=out)
+        self.assertEqual(self.stats(), (1, 4, 1, 4.0))
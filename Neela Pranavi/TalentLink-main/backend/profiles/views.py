@@ -2,9 +2,12 @@
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.decorators import api_view, permission_classes
+from rest_framework.exceptions import ValidationError
 from django.db.models import Q
+from talentlink.pagination import EstimatedCountPagination
+from .facets import FACETS, cached_facets
 from .models import Profile, Skill
-from .serializers import ProfileSerializer, SkillSerializer
+from .serializers import ProfileSerializer, ReviewSerializer, SkillSerializer
 
 class ProfileCreateUpdateView(generics.RetrieveUpdateAPIView):
     serializer_class = ProfileSerializer
@@ -17,29 +20,54 @@ class ProfileCreateUpdateView(generics.RetrieveUpdateAPIView):
 class ProfileListView(generics.ListAPIView):
     serializer_class = ProfileSerializer
     permission_classes = [permissions.AllowAny]
+    pagination_class = EstimatedCountPagination
+
+    def get_filters(self):
+        """The applied filters, normalized so equivalent queries share a facet cache entry."""
+        params = self.request.query_params
+        skills = params.get('skills')
+        return {
+            'user_type': params.get('user_type') or None,
+            'skills': sorted({name.strip() for name in skills.split(',') if name.strip()}) if skills else None,
+            'location': params.get('location', '').strip().lower() or None,
+            'available': params.get('available') == 'true',
+        }
 
     def get_queryset(self):
         queryset = Profile.objects.select_related('user').prefetch_related('skills')
-        user_type = self.request.query_params.get('user_type')
-        skills = self.request.query_params.get('skills')
-        location = self.request.query_params.get('location')
-        available = self.request.query_params.get('available')
+        filters = self.get_filters()
 
-        if user_type:
-            queryset = queryset.filter(user__user_type=user_type)
+        if filters['user_type']:
+            queryset = queryset.filter(user__user_type=filters['user_type'])
 
-        if skills:
-            skill_names = skills.split(',')
-            queryset = queryset.filter(skills__name__in=skill_names).distinct()
+        if filters['skills']:
+            queryset = queryset.filter(skills__name__in=filters['skills']).distinct()
 
-        if location:
-            queryset = queryset.filter(location__icontains=location)
+        if filters['location']:
+            queryset = queryset.filter(location__icontains=filters['location'])
 
-        if available == 'true':
+        if filters['available']:
             queryset = queryset.filter(availability=True)
 
         return queryset
 
+    def get_facets(self):
+        value = self.request.query_params.get('facets')
+        if not value:
+            return []
+        facets = list(dict.fromkeys(name.strip() for name in value.split(',') if name.strip()))
+        unknown = [name for name in facets if name not in FACETS]
+        if unknown:
+            raise ValidationError({'facets': f"Unknown facet(s): {', '.join(unknown)}. Choose from {', '.join(FACETS)}."})
+        return facets
+
+    def list(self, request, *args, **kwargs):
+        facets = self.get_facets()
+        response = super().list(request, *args, **kwargs)
+        if facets:
+            response.data['facets'] = cached_facets(self.get_queryset(), self.get_filters(), facets)
+        return response
+
 class SkillListCreateView(generics.ListCreateAPIView):
     queryset = Skill.objects.all()
     serializer_class = SkillSerializer
@@ -52,6 +80,14 @@ class SkillListCreateView(generics.ListCreateAPIView):
             queryset = queryset.filter(name__icontains=search)
         return queryset
 
+class ReviewCreateView(generics.CreateAPIView):
+    serializer_class = ReviewSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def perform_create(self, serializer):
+        # Review.save() adds the rating to the freelancer's profile
+        serializer.save(reviewer=self.request.user)
+
 @api_view(['GET'])
 @permission_classes([permissions.AllowAny])
 def profile_detail(request, user_id):
@@ -0,0 +1,151 @@
+
+import contextvars
+import os
+import random
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connections, router, transaction
+from django.db.backends.signals import connection_created
+from django.db.models import F
+from django.test.utils import override_settings
+from accounts.models import User
+from profiles.models import Skill
+from projects.models import Project
+from talentlink import db
+
+
+class Command(BaseCommand):
+    help = (
+        "Concurrent read / write benchmark for the read-only connection (talentlink/db.py): reader "
+        "threads list open projects while writer threads run short UPDATE transactions. Each mode "
+        "runs on its own temporary database; db.sqlite3 is never touched."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--mode', choices=('single', 'router', 'both'), default='both',
+            help="single: one alias, rollback journal. router: readonly alias + WAL, as configured.",
+        )
+        parser.add_argument('--projects', type=int, default=5000)
+        parser.add_argument('--readers', type=int, default=8)
+        parser.add_argument('--writers', type=int, default=2)
+        parser.add_argument('--seconds', type=float, default=8.0)
+
+    def handle(self, *args, **options):
+        modes = ('single', 'router') if options['mode'] == 'both' else (options['mode'],)
+        for mode in modes:
+            with self.temporary_database(mode):
+                # in a copy of the context, so the seeding writes don't pin this thread to default
+                project_ids = contextvars.copy_context().run(self.seed, options['projects'])
+                self.stdout.write(
+                    f"{mode}: {options['projects']} projects, {options['readers']} readers, "
+                    f"{options['writers']} writers, {options['seconds']:g} s (reads on {router.db_for_read(Project)})"
+                )
+                self.run(options['readers'], options['writers'], options['seconds'], project_ids)
+
+    @contextmanager
+    def temporary_database(self, mode):
+        aliases = [alias for alias in (db.DEFAULT_DB_ALIAS, db.READ_ALIAS) if alias in connections.settings]
+        old_names = {alias: connections.settings[alias]['NAME'] for alias in aliases}
+        connections.close_all()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'benchmark.sqlite3')
+            # the connections of every thread are opened from these dicts
+            connections.settings[db.DEFAULT_DB_ALIAS]['NAME'] = path
+            if db.READ_ALIAS in connections.settings:
+                connections.settings[db.READ_ALIAS]['NAME'] = Path(path).as_uri() + '?mode=ro'
+            try:
+                if mode == 'single':
+                    # no routing and none of the pragmas: SQLite's defaults
+                    connection_created.disconnect(db.tune_sqlite_connection)
+                    with override_settings(DATABASE_ROUTERS=[]):
+                        call_command('migrate', verbosity=0)
+                        yield
+                else:
+                    call_command('migrate', verbosity=0)
+                    yield
+            finally:
+                connection_created.connect(db.tune_sqlite_connection)
+                connections.close_all()
+                for alias, name in old_names.items():
+                    connections.settings[alias]['NAME'] = name
+
+    def seed(self, projects):
+        client = User.objects.create_user(
+            username='bench', email='bench@example.com', password='bench12345', user_type='client'
+        )
+        skills = Skill.objects.bulk_create([Skill(name=f'skill {i}') for i in range(50)])
+        rows = Project.objects.bulk_create([
+            Project(title=f'project {i}', description='benchmark', client=client,
+                    budget_type='fixed', duration='1_3_months')
+            for i in range(projects)
+        ], batch_size=1000)
+        Through = Project.skills_required.through
+        rnd = random.Random(0)
+        Through.objects.bulk_create([
+            Through(project_id=project.pk, skill_id=skill.pk)
+            for project in rows for skill in rnd.sample(skills, 3)
+        ], batch_size=5000)
+        connections.close_all()
+        return [project.pk for project in rows]
+
+    def run(self, readers, writers, seconds, project_ids):
+        stop = threading.Event()
+        read_latencies, totals = [], {'writes': 0, 'locked': 0}
+        lock = threading.Lock()
+
+        def reader():
+            latencies = []
+            try:
+                while not stop.is_set():
+                    started = time.perf_counter()
+                    list(Project.objects.filter(status='open').prefetch_related('skills_required')
+                         .order_by('-created_at')[:20])
+                    latencies.append(time.perf_counter() - started)
+            finally:
+                connections.close_all()
+            with lock:
+                read_latencies.extend(latencies)
+
+        def writer(seed):
+            rnd = random.Random(seed)
+            done = locked = 0
+            try:
+                while not stop.is_set():
+                    try:
+                        with transaction.atomic():
+                            Project.objects.filter(pk=rnd.choice(project_ids)).update(
+                                proposal_count=F('proposal_count') + 1
+                            )
+                        done += 1
+                    except OperationalError:
+                        locked += 1
+            finally:
+                connections.close_all()
+            with lock:
+                totals['writes'] += done
+                totals['locked'] += locked
+
+        threads = [threading.Thread(target=reader) for _ in range(readers)]
+        threads += [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+        for thread in threads:
+            thread.start()
+        time.sleep(seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+        read_latencies.sort()
+        pick = lambda q: read_latencies[min(len(read_latencies) - 1, int(len(read_latencies) * q))] * 1000
+        self.stdout.write(
+            f"  reads  {len(read_latencies) / seconds:7.1f}/s  p50 {pick(0.5):6.1f} ms  p99 {pick(0.99):6.1f} ms"
+        )
+        self.stdout.write(
+            f"  writes {totals['writes'] / seconds:7.1f}/s  \"database is locked\": {totals['locked']}"
+        )
@@ -0,0 +1,53 @@
+
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from projects.recommendations import SkillMatchIndex
+
+
+class Command(BaseCommand):
+    help = (
+        "Time SkillMatchIndex.recommend() over synthetic open projects. "
+        "The index is filled in memory; nothing is read from or written to the database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--projects', type=int, default=100_000)
+        parser.add_argument('--skills-per-project', type=int, default=10)
+        parser.add_argument('--catalogue', type=int, default=500, help="Number of distinct skills.")
+        parser.add_argument('--freelancer-skills', type=int, default=20)
+        parser.add_argument('--queries', type=int, default=50)
+        parser.add_argument('--limit', type=int, default=20)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        rnd = random.Random(options['seed'])
+        catalogue = range(1, options['catalogue'] + 1)
+
+        index = SkillMatchIndex(max_age=float('inf'), initial_capacity=options['projects'])
+        started = time.perf_counter()
+        with index.lock:
+            index._reset(index.initial_capacity)
+            for project_id in range(1, options['projects'] + 1):
+                hourly = rnd.random() < 0.5
+                low = rnd.randint(10, 80) if hourly else rnd.randint(100, 5000)
+                index._set_project(project_id, 'hourly' if hourly else 'fixed', low, low + rnd.randint(5, 50))
+                index._set_skills(project_id, rnd.sample(catalogue, options['skills_per_project']))
+            index.built_at = time.monotonic()
+        self.stdout.write(f"Filled {options['projects']} projects in {time.perf_counter() - started:.1f} s")
+
+        timings = []
+        for _ in range(options['queries']):
+            skill_ids = rnd.sample(catalogue, options['freelancer_skills'])
+            started = time.perf_counter()
+            index.recommend(skill_ids, hourly_rate=rnd.randint(10, 80), limit=options['limit'])
+            timings.append((time.perf_counter() - started) * 1000)
+
+        timings.sort()
+        p95 = timings[max(0, round(len(timings) * 0.95) - 1)]
+        self.stdout.write(self.style.SUCCESS(
+            f"recommend() top-{options['limit']}: median {statistics.median(timings):.1f} ms, "
+            f"p95 {p95:.1f} ms, max {timings[-1]:.1f} ms over {len(timings)} queries"
+        ))
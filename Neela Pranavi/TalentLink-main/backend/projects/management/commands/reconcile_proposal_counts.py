@@ -0,0 +1,50 @@
+
+from django.core.management.base import BaseCommand
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from projects.models import Project
+from proposals.models import Proposal
+
+
+class Command(BaseCommand):
+    help = "Recompute Project.proposal_count from the proposals table and fix any drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--dry-run', action='store_true', help="Only report drifted projects.")
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        live = ~Q(proposals__status__in=Proposal.UNCOUNTED_STATUSES)
+        live_count = (
+            Proposal.objects.filter(project=OuterRef('pk'))
+            .exclude(status__in=Proposal.UNCOUNTED_STATUSES)
+            .order_by()
+            .values('project')
+            .annotate(total=Count('id'))
+            .values('total')
+        )
+        drifted = 0
+        last_id = 0
+
+        while True:
+            batch = list(
+                Project.objects.filter(id__gt=last_id)
+                .order_by('id')
+                .annotate(actual=Count('proposals', filter=live))
+                .values_list('id', 'proposal_count', 'actual')[:batch_size]
+            )
+            if not batch:
+                break
+            last_id = batch[-1][0]
+
+            fix_ids = [pk for pk, stored, actual in batch if stored != actual]
+            drifted += len(fix_ids)
+            if fix_ids and not options['dry_run']:
+                # recount in the UPDATE itself so concurrent proposals aren't lost
+                Project.objects.filter(pk__in=fix_ids).update(
+                    proposal_count=Coalesce(Subquery(live_count), 0)
+                )
+
+        verb = "Found" if options['dry_run'] else "Fixed"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {drifted} project(s) with a drifted proposal_count."))
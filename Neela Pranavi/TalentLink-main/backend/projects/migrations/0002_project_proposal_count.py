@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:35
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def backfill_proposal_count(apps, schema_editor):
+    Project = apps.get_model('projects', 'Project')
+    projects = Project.objects.annotate(
+        live_proposals=Count('proposals', filter=~Q(proposals__status='withdrawn'))
+    ).filter(live_proposals__gt=0)
+    for project in projects.iterator():
+        Project.objects.filter(pk=project.pk).update(proposal_count=project.live_proposals)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0001_initial'),
+        ('proposals', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='proposal_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_proposal_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:26
+
+from decimal import Decimal
+from django.db import migrations, models
+
+
+def backfill_budget_range(apps, schema_editor):
+    # same rules as projects.models.budget_range
+    Project = apps.get_model('projects', 'Project')
+    projects = []
+    for project in Project.objects.only('budget_min', 'budget_max').iterator():
+        lo = Decimal('0') if project.budget_min is None else project.budget_min
+        hi = Decimal('99999999.99') if project.budget_max is None else project.budget_max
+        project.budget_lo, project.budget_hi = (lo, hi) if lo <= hi else (hi, lo)
+        projects.append(project)
+    Project.objects.bulk_update(projects, ['budget_lo', 'budget_hi'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0002_project_proposal_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='budget_hi',
+            field=models.DecimalField(decimal_places=2, default=Decimal('99999999.99'), editable=False, max_digits=10),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='budget_lo',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0'), editable=False, max_digits=10),
+        ),
+        migrations.RunPython(backfill_budget_range, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['budget_lo', 'budget_hi'], name='project_budget_range_idx'),
+        ),
+    ]
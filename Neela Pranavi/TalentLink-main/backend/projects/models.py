@@ -1,10 +1,23 @@
 
+from decimal import Decimal
+
 from django.db import models
 from django.contrib.auth import get_user_model
 from profiles.models import Skill
 
 User = get_user_model()
 
+# budget_lo / budget_hi stand-ins for a missing bound (the DecimalField limits)
+BUDGET_FLOOR = Decimal('0')
+BUDGET_CEILING = Decimal('99999999.99')
+
+
+def budget_range(budget_min, budget_max):
+    """(lo, hi) covered by a min / max pair; a missing bound leaves that side open."""
+    lo = BUDGET_FLOOR if budget_min is None else budget_min
+    hi = BUDGET_CEILING if budget_max is None else budget_max
+    return (lo, hi) if lo <= hi else (hi, lo)
+
 class Project(models.Model):
     BUDGET_TYPES = (
         ('fixed', 'Fixed Price'),
@@ -37,9 +50,26 @@ class Project(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     deadline = models.DateField(null=True, blank=True)
+    # denormalized count of live (non-withdrawn) proposals, kept up to date by
+    # proposals.models.Proposal; `manage.py reconcile_proposal_counts` repairs drift
+    proposal_count = models.IntegerField(default=0)
+    # budget_min / budget_max as a closed, ordered interval (see budget_range),
+    # so "overlaps [lo, hi]" is two range conditions on one index
+    budget_lo = models.DecimalField(max_digits=10, decimal_places=2, default=BUDGET_FLOOR, editable=False)
+    budget_hi = models.DecimalField(max_digits=10, decimal_places=2, default=BUDGET_CEILING, editable=False)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['budget_lo', 'budget_hi'], name='project_budget_range_idx'),
+        ]
 
     def __str__(self):
         return self.title
+
+    def save(self, *args, **kwargs):
+        self.budget_lo, self.budget_hi = budget_range(self.budget_min, self.budget_max)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'budget_min', 'budget_max'} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'budget_lo', 'budget_hi'}
+        super().save(*args, **kwargs)
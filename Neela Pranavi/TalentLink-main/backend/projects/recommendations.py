@@ -0,0 +1,222 @@
+
+import threading
+import time
+
+import numpy as np
+from django.db import transaction
+
+from .models import Project
+
+# Weights of the two parts of a recommendation score (both parts are 0..1)
+SKILL_WEIGHT = 0.8
+BUDGET_WEIGHT = 0.2
+# Score given to projects whose budget can't be compared with an hourly rate
+NEUTRAL_BUDGET_FIT = 0.5
+
+
+class SkillMatchIndex:
+    """
+    In-memory project x skill bitset for ranking open projects.
+
+    Each open project owns one row of a uint64 matrix; bit `s` of the row is set
+    when the project requires the skill mapped to column `s`. Scoring a freelancer
+    is a handful of vectorized shifts over the whole matrix, one per skill they
+    have, so no per-project queries are needed.
+
+    Rows are updated one project at a time from the signals in projects/signals.py.
+    Other worker processes don't see those updates, so each process also does a
+    full rebuild once the index is older than `max_age` seconds.
+    """
+
+    def __init__(self, max_age=300, initial_capacity=1024):
+        self.max_age = max_age
+        self.initial_capacity = initial_capacity
+        self.lock = threading.RLock()
+        self.built_at = None
+
+    def _reset(self, capacity, words=1):
+        self.bits = np.zeros((capacity, words), dtype=np.uint64)
+        self.required = np.zeros(capacity, dtype=np.int32)
+        self.is_hourly = np.zeros(capacity, dtype=bool)
+        self.budget_lo = np.full(capacity, np.nan)
+        self.budget_hi = np.full(capacity, np.nan)
+        self.active = np.zeros(capacity, dtype=bool)
+        self.project_ids = np.zeros(capacity, dtype=np.int64)
+        self.rows = {}        # project id -> row
+        self.free_rows = []
+        self.size = 0
+        self.columns = {}     # skill id -> bit column
+
+    # --- building -----------------------------------------------------
+
+    def rebuild(self):
+        projects = Project.objects.filter(status='open').values_list(
+            'id', 'budget_type', 'budget_min', 'budget_max'
+        )
+        through = Project.skills_required.through
+        skill_pairs = through.objects.filter(project__status='open').values_list('project_id', 'skill_id')
+
+        with self.lock:
+            self._reset(self.initial_capacity)
+            for project_id, budget_type, budget_min, budget_max in projects.iterator():
+                self._set_project(project_id, budget_type, budget_min, budget_max)
+
+            skills_by_project = {}
+            for project_id, skill_id in skill_pairs.iterator():
+                skills_by_project.setdefault(project_id, []).append(skill_id)
+            for project_id, skill_ids in skills_by_project.items():
+                self._set_skills(project_id, skill_ids)
+
+            self.built_at = time.monotonic()
+
+    def ensure_fresh(self):
+        with self.lock:
+            if self.built_at is None or time.monotonic() - self.built_at > self.max_age:
+                self.rebuild()
+
+    def _row_for(self, project_id):
+        row = self.rows.get(project_id)
+        if row is not None:
+            return row
+        if self.free_rows:
+            row = self.free_rows.pop()
+        else:
+            if self.size == len(self.active):
+                self._grow_rows(len(self.active) * 2)
+            row = self.size
+            self.size += 1
+        self.rows[project_id] = row
+        self.project_ids[row] = project_id
+        self.active[row] = True
+        return row
+
+    def _grow_rows(self, capacity):
+        extra = capacity - len(self.active)
+        self.bits = np.vstack([self.bits, np.zeros((extra, self.bits.shape[1]), dtype=np.uint64)])
+        self.required = np.concatenate([self.required, np.zeros(extra, dtype=np.int32)])
+        self.is_hourly = np.concatenate([self.is_hourly, np.zeros(extra, dtype=bool)])
+        self.budget_lo = np.concatenate([self.budget_lo, np.full(extra, np.nan)])
+        self.budget_hi = np.concatenate([self.budget_hi, np.full(extra, np.nan)])
+        self.active = np.concatenate([self.active, np.zeros(extra, dtype=bool)])
+        self.project_ids = np.concatenate([self.project_ids, np.zeros(extra, dtype=np.int64)])
+
+    def _column_for(self, skill_id):
+        column = self.columns.get(skill_id)
+        if column is None:
+            column = len(self.columns)
+            self.columns[skill_id] = column
+            if column // 64 >= self.bits.shape[1]:
+                self.bits = np.hstack([self.bits, np.zeros_like(self.bits)])
+        return column
+
+    def _set_project(self, project_id, budget_type, budget_min, budget_max):
+        row = self._row_for(project_id)
+        self.is_hourly[row] = budget_type == 'hourly'
+        self.budget_lo[row] = np.nan if budget_min is None else float(budget_min)
+        self.budget_hi[row] = np.nan if budget_max is None else float(budget_max)
+
+    def _set_skills(self, project_id, skill_ids):
+        row = self.rows.get(project_id)
+        if row is None:
+            return
+        self.bits[row] = 0
+        for skill_id in set(skill_ids):
+            column = self._column_for(skill_id)
+            self.bits[row, column // 64] |= np.uint64(1) << np.uint64(column % 64)
+        self.required[row] = len(set(skill_ids))
+
+    def _drop(self, project_id):
+        row = self.rows.pop(project_id, None)
+        if row is None:
+            return
+        self.active[row] = False
+        self.bits[row] = 0
+        self.required[row] = 0
+        self.free_rows.append(row)
+
+    # --- incremental updates (called from signals) ---------------------
+
+    def update_project(self, project_id):
+        """Reload one project's row; closed or deleted projects leave the index."""
+        if self.built_at is None:
+            return
+        project = (
+            Project.objects.filter(pk=project_id, status='open')
+            .values_list('budget_type', 'budget_min', 'budget_max')
+            .first()
+        )
+        skill_ids = []
+        if project is not None:
+            skill_ids = list(
+                Project.skills_required.through.objects.filter(project_id=project_id)
+                .values_list('skill_id', flat=True)
+            )
+        with self.lock:
+            if project is None:
+                self._drop(project_id)
+            else:
+                self._set_project(project_id, *project)
+                self._set_skills(project_id, skill_ids)
+
+    def update_projects_on_commit(self, project_ids):
+        project_ids = list(project_ids)
+
+        def apply():
+            for project_id in project_ids:
+                self.update_project(project_id)
+
+        transaction.on_commit(apply)
+
+    # --- scoring ------------------------------------------------------
+
+    def recommend(self, skill_ids, hourly_rate=None, exclude_ids=(), limit=20):
+        """Return [(project_id, score), ...] for the best `limit` open projects."""
+        self.ensure_fresh()
+        with self.lock:
+            n = self.size
+            if n == 0:
+                return []
+
+            overlap = np.zeros(n, dtype=np.int32)
+            for skill_id in set(skill_ids):
+                column = self.columns.get(skill_id)
+                if column is None:
+                    continue
+                word = self.bits[:n, column // 64]
+                overlap += ((word >> np.uint64(column % 64)) & np.uint64(1)).astype(np.int32)
+
+            required = self.required[:n]
+            skill_score = np.divide(overlap, required, out=np.zeros(n), where=required > 0)
+            score = SKILL_WEIGHT * skill_score + BUDGET_WEIGHT * self._budget_fit(n, hourly_rate)
+
+            candidates = self.active[:n].copy()
+            for project_id in exclude_ids:
+                row = self.rows.get(project_id)
+                if row is not None:
+                    candidates[row] = False
+            score = np.where(candidates, score, -np.inf)
+
+            limit = min(limit, int(candidates.sum()))
+            if limit <= 0:
+                return []
+            top = np.argpartition(-score, limit - 1)[:limit]
+            top = top[np.argsort(-score[top], kind='stable')]
+            return [(int(self.project_ids[row]), float(score[row])) for row in top]
+
+    def _budget_fit(self, n, hourly_rate):
+        fit = np.full(n, NEUTRAL_BUDGET_FIT)
+        if not hourly_rate:
+            return fit
+        rate = float(hourly_rate)
+        lo = np.nan_to_num(self.budget_lo[:n], nan=0.0)
+        hi = np.nan_to_num(self.budget_hi[:n], nan=np.inf)
+        has_range = ~(np.isnan(self.budget_lo[:n]) & np.isnan(self.budget_hi[:n]))
+        # 1.0 inside the project's hourly range, falling off with the distance to it
+        distance = np.maximum(lo - rate, 0) + np.maximum(rate - hi, 0)
+        hourly_fit = 1.0 / (1.0 + distance / rate)
+        comparable = self.is_hourly[:n] & has_range
+        fit[comparable] = hourly_fit[comparable]
+        return fit
+
+
+skill_match_index = SkillMatchIndex()
@@ -7,7 +7,6 @@ class ProjectSerializer(serializers.ModelSerializer):
     skills_required = SkillSerializer(many=True, read_only=True)
     skill_ids = serializers.ListField(child=serializers.IntegerField(), write_only=True, required=False)
     client_info = serializers.SerializerMethodField()
-    proposal_count = serializers.SerializerMethodField()
 
     class Meta:
         model = Project
@@ -16,7 +15,7 @@ class ProjectSerializer(serializers.ModelSerializer):
             'skill_ids', 'budget_type', 'budget_min', 'budget_max', 'duration',
             'status', 'deadline', 'proposal_count', 'created_at', 'updated_at'
         ]
-        read_only_fields = ['client', 'created_at', 'updated_at']
+        read_only_fields = ['client', 'proposal_count', 'created_at', 'updated_at']
 
     def get_client_info(self, obj):
         return {
@@ -26,9 +25,6 @@ class ProjectSerializer(serializers.ModelSerializer):
             'last_name': obj.client.last_name,
         }
 
-    def get_proposal_count(self, obj):
-        return obj.proposals.count()
-
     def create(self, validated_data):
         skill_ids = validated_data.pop('skill_ids', [])
         project = super().create(validated_data)
@@ -54,7 +50,6 @@ class ProjectSerializer(serializers.ModelSerializer):
 class ProjectListSerializer(serializers.ModelSerializer):
     skills_required = SkillSerializer(many=True, read_only=True)
     client_info = serializers.SerializerMethodField()
-    proposal_count = serializers.SerializerMethodField()
 
     class Meta:
         model = Project
@@ -63,12 +58,10 @@ class ProjectListSerializer(serializers.ModelSerializer):
             'budget_type', 'budget_min', 'budget_max', 'duration', 'status',
             'proposal_count', 'created_at'
         ]
+        read_only_fields = ['proposal_count']
 
     def get_client_info(self, obj):
         return {
             'id': obj.client.id,
             'username': obj.client.username,
         }
-
-    def get_proposal_count(self, obj):
-        return obj.proposals.count()
@@ -0,0 +1,40 @@
+
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from profiles.models import Skill
+from .models import Project
+from .recommendations import skill_match_index
+
+
+# Keep the recommendation bitset (projects/recommendations.py) in step with the tables
+
+@receiver(post_save, sender=Project)
+def project_saved(sender, instance, **kwargs):
+    skill_match_index.update_projects_on_commit([instance.pk])
+
+
+@receiver(post_delete, sender=Project)
+def project_deleted(sender, instance, **kwargs):
+    skill_match_index.update_projects_on_commit([instance.pk])
+
+
+@receiver(m2m_changed, sender=Project.skills_required.through)
+def project_skills_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            skill_match_index.update_projects_on_commit([instance.pk])
+        return
+
+    # skill.project_set.add/remove/clear: instance is the Skill, pk_set holds project ids
+    if action == 'pre_clear':
+        instance._cleared_project_ids = list(instance.project_set.values_list('id', flat=True))
+    elif action == 'post_clear':
+        skill_match_index.update_projects_on_commit(getattr(instance, '_cleared_project_ids', []))
+    elif action in ('post_add', 'post_remove'):
+        skill_match_index.update_projects_on_commit(pk_set or [])
+
+
+@receiver(pre_delete, sender=Skill)
+def skill_deleting(sender, instance, **kwargs):
+    # the through rows go away without an m2m_changed signal
+    skill_match_index.update_projects_on_commit(instance.project_set.values_list('id', flat=True))
@@ -0,0 +1,321 @@
+
+import random
+from types import SimpleNamespace
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import OperationalError, connection, connections
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from profiles.models import Profile, Skill
+from proposals.models import Proposal
+from talentlink import db
+from talentlink.pagination import EstimatedCountPagination
+from .models import BUDGET_CEILING, Project
+from .recommendations import BUDGET_WEIGHT, NEUTRAL_BUDGET_FIT, SKILL_WEIGHT, skill_match_index
+
+User = get_user_model()
+
+
+class EstimatedCountPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.client_user = User.objects.create_user(
+            username='client', email='client@example.com', password='pass12345', user_type='client'
+        )
+        python, django = Skill.objects.create(name='Python'), Skill.objects.create(name='Django')
+        for i in range(45):
+            project = Project.objects.create(
+                title=f'Project {i}', description='...', client=cls.client_user,
+                budget_type='fixed', duration='1_3_months',
+            )
+            project.skills_required.set([python, django])
+
+    def setUp(self):
+        cache.clear()
+        self.api = APIClient()
+        self.api.force_authenticate(self.client_user)
+
+    def get(self, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.api.get('/api/projects/', {'skills': 'Python,Django', **params})
+        self.assertEqual(response.status_code, 200)
+        counts = [query for query in queries if 'COUNT(' in query['sql']]
+        return response.data, counts
+
+    def test_last_page_needs_no_count(self):
+        data, counts = self.get(page=3)
+        self.assertEqual((data['count'], data['has_next'], len(data['results'])), (45, False, 5))
+        self.assertEqual(counts, [])
+
+    def test_capped_count_is_cached(self):
+        data, counts = self.get()
+        self.assertEqual((data['count'], data['has_next'], len(data['results'])), (45, True, 20))
+        self.assertEqual(len(counts), 1)
+        # bounded by the cap instead of counting every match
+        self.assertIn('LIMIT 1001', counts[0]['sql'])
+
+        data, counts = self.get(page=2)
+        self.assertEqual(data['count'], 45)
+        self.assertEqual(counts, [])
+
+    def test_counts_past_the_cap_are_approximate(self):
+        paginator = EstimatedCountPagination()
+        paginator.count_cap = 30
+        paginator.count = 31
+        self.assertEqual(paginator.get_count_display(), '30+')
+        paginator.count = 30
+        self.assertEqual(paginator.get_count_display(), 30)
+
+    def test_out_of_range_page_is_not_found(self):
+        response = self.api.get('/api/projects/', {'page': 9})
+        self.assertEqual(response.status_code, 404)
+
+
+class ReadOnlyRouterTests(SimpleTestCase):
+    def setUp(self):
+        self.router = db.ReadOnlyRouter()
+        self.default = SimpleNamespace(in_atomic_block=False)
+        patcher = mock.patch.object(db, 'connections', {'default': self.default})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # earlier writes in this thread (fixtures, other tests) pin it to default
+        token = db._pinned.set(False)
+        self.addCleanup(db._pinned.reset, token)
+
+    def read_alias(self, model=Project):
+        return self.router.db_for_read(model)
+
+    def run_request(self, method):
+        seen = []
+
+        def view(request):
+            seen.append(self.read_alias())
+            self.router.db_for_write(Proposal)
+            seen.append(self.read_alias())
+            return None
+
+        db.ReadAfterWriteMiddleware(view)(getattr(RequestFactory(), method)('/api/projects/'))
+        return seen
+
+    def test_reads_of_marketplace_apps_go_to_the_readonly_alias(self):
+        self.assertEqual(self.read_alias(Project), 'readonly')
+        self.assertEqual(self.read_alias(Proposal), 'readonly')
+        self.assertIsNone(self.read_alias(User))
+
+    def test_transactions_read_from_default(self):
+        self.default.in_atomic_block = True
+        self.assertEqual(self.read_alias(), 'default')
+
+    def test_reads_after_a_write_stay_on_default(self):
+        self.assertEqual(self.run_request('get'), ['readonly', 'default'])
+        # the pin ends with the request
+        self.assertEqual(self.read_alias(), 'readonly')
+        self.assertEqual(self.run_request('post'), ['default', 'default'])
+
+    def test_writes_never_use_the_readonly_alias(self):
+        self.assertEqual(self.router.db_for_write(Project, instance=SimpleNamespace(_state=SimpleNamespace(db='readonly'))), 'default')
+        self.assertFalse(self.router.allow_migrate('readonly', 'projects'))
+
+
+class ReadOnlyConnectionTests(TransactionTestCase):
+    """Real queries over both connections; the data is committed, as in production."""
+    databases = {'default', 'readonly'}
+
+    def setUp(self):
+        self.client_user = User.objects.create_user(
+            username='roclient', email='roclient@example.com', password='pass12345', user_type='client'
+        )
+        self.project = Project.objects.create(
+            title='Before', description='...', client=self.client_user, budget_type='fixed', duration='1_3_months'
+        )
+        self.api = APIClient()
+        self.api.force_authenticate(self.client_user)
+
+    def get_titles(self):
+        with CaptureQueriesContext(connections['readonly']) as reads:
+            response = self.api.get('/api/projects/')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(any('projects_project' in query['sql'] for query in reads.captured_queries))
+        return [project['title'] for project in response.data['results']]
+
+    def test_reads_on_the_readonly_alias_see_committed_writes(self):
+        self.assertEqual(self.get_titles(), ['Before'])
+        # a write on default, between two reads on readonly
+        with CaptureQueriesContext(connections['default']) as writes:
+            Project.objects.filter(pk=self.project.pk).update(title='After')
+        self.assertTrue(writes.captured_queries[-1]['sql'].startswith('UPDATE'))
+        self.assertEqual(self.get_titles(), ['After'])
+
+    def test_unsafe_requests_read_from_default(self):
+        with CaptureQueriesContext(connections['readonly']) as reads:
+            response = self.api.patch(f'/api/projects/{self.project.pk}/', {'title': 'Renamed'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(reads.captured_queries, [])
+        self.assertEqual(Project.objects.using('default').get(pk=self.project.pk).title, 'Renamed')
+
+    def test_readonly_connection_refuses_writes(self):
+        with self.assertRaises(OperationalError):
+            with connections['readonly'].cursor() as cursor:
+                cursor.execute("UPDATE projects_project SET title = 'nope'")
+        self.assertEqual(Project.objects.using('default').get(pk=self.project.pk).title, 'Before')
+
+
+class BudgetRangeFilterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.freelancer = User.objects.create_user(
+            username='freelancer', email='freelancer@example.com', password='pass12345', user_type='freelancer'
+        )
+        client = User.objects.create_user(
+            username='budgets', email='budgets@example.com', password='pass12345', user_type='client'
+        )
+        for title, budget_min, budget_max in (
+            ('small', 100, 300),
+            ('medium', 400, 900),
+            ('large', 2000, 5000),
+            ('from 800', 800, None),
+            ('up to 150', None, 150),
+            ('unspecified', None, None),
+        ):
+            Project.objects.create(
+                title=title, description='...', client=client, budget_type='fixed', duration='1_3_months',
+                budget_min=budget_min, budget_max=budget_max,
+            )
+
+    def setUp(self):
+        cache.clear()
+        self.api = APIClient()
+        self.api.force_authenticate(self.freelancer)
+
+    def titles(self, **params):
+        response = self.api.get('/api/projects/', params)
+        self.assertEqual(response.status_code, 200)
+        return [project['title'] for project in response.data['results']]
+
+    def test_range_is_normalized(self):
+        project = Project.objects.get(title='from 800')
+        self.assertEqual((project.budget_lo, project.budget_hi), (800, BUDGET_CEILING))
+        project.budget_min, project.budget_max = 50, 20
+        project.save(update_fields=['budget_min', 'budget_max'])
+        project.refresh_from_db()
+        self.assertEqual((project.budget_lo, project.budget_hi), (20, 50))
+
+    def test_overlap_with_open_bounds(self):
+        self.assertCountEqual(
+            self.titles(budget_min=250, budget_max=850),
+            ['small', 'medium', 'from 800', 'unspecified'],
+        )
+        self.assertCountEqual(self.titles(budget_min=4000), ['large', 'from 800', 'unspecified'])
+        self.assertCountEqual(self.titles(budget_max=120), ['small', 'up to 150', 'unspecified'])
+
+    def test_sort_by_budget_fit(self):
+        self.assertEqual(
+            self.titles(budget_min=350, budget_max=900, sort='budget_fit'),
+            ['medium', 'unspecified', 'from 800'],
+        )
+
+    def test_invalid_budget(self):
+        self.assertEqual(self.api.get('/api/projects/', {'budget_min': 'lots'}).status_code, 400)
+
+
+class SkillMatchIndexTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.client_user = User.objects.create_user(
+            username='recclient', email='recclient@example.com', password='pass12345', user_type='client'
+        )
+        cls.freelancer = User.objects.create_user(
+            username='recfree', email='recfree@example.com', password='pass12345', user_type='freelancer'
+        )
+        # more than 64 skills, so the bitset needs a second word
+        cls.skills = [Skill.objects.create(name=f'skill {i}') for i in range(80)]
+
+    def setUp(self):
+        skill_match_index.built_at = None
+
+    def make_project(self, skills, **fields):
+        project = Project.objects.create(
+            title=fields.pop('title', 'p'), description='...', client=self.client_user,
+            budget_type=fields.pop('budget_type', 'fixed'), duration='1_3_months', **fields
+        )
+        project.skills_required.set(skills)
+        return project
+
+    def naive_scores(self, skill_ids):
+        # the ranking spelled out: skill overlap share, neutral budget fit
+        scores = {}
+        for project in Project.objects.filter(status='open').prefetch_related('skills_required'):
+            required = {skill.id for skill in project.skills_required.all()}
+            share = len(required & set(skill_ids)) / len(required) if required else 0.0
+            scores[project.id] = SKILL_WEIGHT * share + BUDGET_WEIGHT * NEUTRAL_BUDGET_FIT
+        return scores
+
+    def test_matches_naive_skill_overlap_ranking(self):
+        rnd = random.Random(4)
+        for i in range(150):
+            self.make_project(rnd.sample(self.skills, rnd.randint(1, 8)), title=f'p{i}')
+        Project.objects.filter(title__in=['p1', 'p2']).update(status='closed')
+        skill_match_index.rebuild()
+
+        for _ in range(5):
+            skill_ids = [skill.id for skill in rnd.sample(self.skills, 12)]
+            naive = self.naive_scores(skill_ids)
+            ranked = skill_match_index.recommend(skill_ids, limit=20)
+
+            self.assertEqual(len(ranked), 20)
+            for project_id, score in ranked:
+                self.assertAlmostEqual(score, naive[project_id])
+            scores = [score for _, score in ranked]
+            self.assertEqual(scores, sorted(scores, reverse=True))
+            # nothing left out scores higher than what made the cut
+            left_out = [score for project_id, score in naive.items() if project_id not in dict(ranked)]
+            self.assertLessEqual(max(left_out), scores[-1] + 1e-9)
+
+    def test_signals_keep_the_index_current(self):
+        python, django, react = self.skills[:3]
+        skill_match_index.rebuild()
+        with self.captureOnCommitCallbacks(execute=True):
+            project = self.make_project([python])
+        self.assertEqual(skill_match_index.recommend([python.id], limit=1)[0][0], project.pk)
+
+        # a skill change moves its score
+        with self.captureOnCommitCallbacks(execute=True):
+            project.skills_required.add(django)
+        self.assertAlmostEqual(dict(skill_match_index.recommend([python.id]))[project.pk],
+                               SKILL_WEIGHT * 0.5 + BUDGET_WEIGHT * NEUTRAL_BUDGET_FIT)
+        with self.captureOnCommitCallbacks(execute=True):
+            react.project_set.add(project)
+        self.assertAlmostEqual(dict(skill_match_index.recommend([python.id, react.id]))[project.pk],
+                               SKILL_WEIGHT * 2 / 3 + BUDGET_WEIGHT * NEUTRAL_BUDGET_FIT)
+
+        # closing it takes it out
+        with self.captureOnCommitCallbacks(execute=True):
+            project.status = 'closed'
+            project.save()
+        self.assertEqual(skill_match_index.recommend([python.id]), [])
+
+    def test_recommended_view(self):
+        python, django = self.skills[:2]
+        profile = Profile.objects.create(user=self.freelancer)
+        profile.skills.set([python, django])
+        both = self.make_project([python, django], title='both')
+        half = self.make_project([python, self.skills[5]], title='half')
+        applied = self.make_project([python], title='applied')
+        Proposal.objects.create(project=applied, freelancer=self.freelancer, cover_letter='Hi',
+                                proposed_budget=100, proposed_timeline='2 weeks')
+        skill_match_index.rebuild()
+
+        api = APIClient()
+        api.force_authenticate(self.freelancer)
+        response = api.get('/api/projects/recommended/', {'limit': 5})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item['title'] for item in response.data], ['both', 'half'])
+        self.assertEqual(response.data[0]['id'], both.pk)
+        self.assertGreater(response.data[0]['match_score'], response.data[1]['match_score'])
+
+        api.force_authenticate(self.client_user)
+        self.assertEqual(api.get('/api/projects/recommended/').status_code, 403)
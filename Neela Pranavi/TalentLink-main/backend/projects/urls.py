@@ -1,9 +1,10 @@
 
 from django.urls import path
-from .views import ProjectListCreateView, ProjectDetailView, MyProjectsView
+from .views import ProjectListCreateView, ProjectDetailView, MyProjectsView, RecommendedProjectsView
 
 urlpatterns = [
     path('', ProjectListCreateView.as_view(), name='project-list-create'),
     path('<int:pk>/', ProjectDetailView.as_view(), name='project-detail'),
     path('my-projects/', MyProjectsView.as_view(), name='my-projects'),
+    path('recommended/', RecommendedProjectsView.as_view(), name='recommended-projects'),
 ]
@@ -1,12 +1,21 @@
 
+from decimal import Decimal, InvalidOperation
+
 from rest_framework import generics, permissions, status
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
-from django.db.models import Q
-from .models import Project
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.functions import Cast, Coalesce, Greatest, Least, NullIf
+from profiles.models import Profile
+from proposals.models import Proposal
+from talentlink.pagination import EstimatedCountPagination
+from .models import BUDGET_CEILING, BUDGET_FLOOR, Project
+from .recommendations import skill_match_index
 from .serializers import ProjectSerializer, ProjectListSerializer
 
 class ProjectListCreateView(generics.ListCreateAPIView):
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = EstimatedCountPagination
 
     def get_serializer_class(self):
         if self.request.method == 'GET':
@@ -18,8 +27,8 @@ class ProjectListCreateView(generics.ListCreateAPIView):
 
         # Filters
         skills = self.request.query_params.get('skills')
-        budget_min = self.request.query_params.get('budget_min')
-        budget_max = self.request.query_params.get('budget_max')
+        budget_min = self.budget_param('budget_min')
+        budget_max = self.budget_param('budget_max')
         duration = self.request.query_params.get('duration')
         status_filter = self.request.query_params.get('status', 'open')
         search = self.request.query_params.get('search')
@@ -31,11 +40,13 @@ class ProjectListCreateView(generics.ListCreateAPIView):
             skill_names = skills.split(',')
             queryset = queryset.filter(skills_required__name__in=skill_names).distinct()
 
-        if budget_min:
-            queryset = queryset.filter(Q(budget_min__gte=budget_min) | Q(budget_max__gte=budget_min))
-
-        if budget_max:
-            queryset = queryset.filter(Q(budget_min__lte=budget_max) | Q(budget_max__lte=budget_max))
+        # projects whose budget range overlaps [budget_min, budget_max]
+        if budget_min is not None and budget_max is not None and budget_min > budget_max:
+            budget_min, budget_max = budget_max, budget_min
+        if budget_min is not None:
+            queryset = queryset.filter(budget_hi__gte=budget_min)
+        if budget_max is not None:
+            queryset = queryset.filter(budget_lo__lte=budget_max)
 
         if duration:
             queryset = queryset.filter(duration=duration)
@@ -45,8 +56,41 @@ class ProjectListCreateView(generics.ListCreateAPIView):
                 Q(title__icontains=search) | Q(description__icontains=search)
             )
 
+        if self.request.query_params.get('sort') == 'budget_fit' and (budget_min, budget_max) != (None, None):
+            queryset = queryset.annotate(
+                budget_fit=self.budget_fit(budget_min, budget_max)
+            ).order_by('-budget_fit', '-created_at')
+
         return queryset
 
+    def budget_param(self, name):
+        value = self.request.query_params.get(name)
+        if not value:
+            return None
+        try:
+            amount = Decimal(value)
+        except InvalidOperation:
+            raise ValidationError({name: 'A number is required.'})
+        if not amount.is_finite():
+            raise ValidationError({name: 'A number is required.'})
+        return amount
+
+    @staticmethod
+    def budget_fit(budget_min, budget_max):
+        """
+        How well the project's range matches the requested one: the overlap
+        divided by the span of both (1 = the same range; open-ended ranges
+        score low). Computed on floats, since SQLite's MIN / MAX would
+        compare a decimal parameter as text.
+        """
+        lo = Value(float(BUDGET_FLOOR if budget_min is None else budget_min))
+        hi = Value(float(BUDGET_CEILING if budget_max is None else budget_max))
+        project_lo, project_hi = Cast(F('budget_lo'), FloatField()), Cast(F('budget_hi'), FloatField())
+        overlap = Least(project_hi, hi) - Greatest(project_lo, lo)
+        span = Greatest(project_hi, hi) - Least(project_lo, lo)
+        # an empty span means both ranges are the same single amount
+        return Coalesce(overlap / NullIf(span, Value(0.0)), Value(1.0), output_field=FloatField())
+
     def perform_create(self, serializer):
         serializer.save(client=self.request.user)
 
@@ -66,3 +110,37 @@ class MyProjectsView(generics.ListAPIView):
 
     def get_queryset(self):
         return Project.objects.filter(client=self.request.user).select_related('client').prefetch_related('skills_required')
+
+class RecommendedProjectsView(generics.ListAPIView):
+    """Open projects ranked for the logged-in freelancer by skill overlap and budget fit."""
+    serializer_class = ProjectListSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = None
+    default_limit = 20
+    max_limit = 100
+
+    def list(self, request, *args, **kwargs):
+        user = request.user
+        if user.user_type != 'freelancer':
+            return Response({'error': 'Only freelancers get project recommendations'},
+                          status=status.HTTP_403_FORBIDDEN)
+
+        try:
+            limit = min(int(request.query_params.get('limit', self.default_limit)), self.max_limit)
+        except ValueError:
+            limit = self.default_limit
+
+        profile = Profile.objects.filter(user=user).prefetch_related('skills').first()
+        skill_ids = [skill.id for skill in profile.skills.all()] if profile else []
+        hourly_rate = profile.hourly_rate if profile else None
+        applied = Proposal.objects.filter(freelancer=user).values_list('project_id', flat=True)
+
+        ranked = skill_match_index.recommend(skill_ids, hourly_rate, exclude_ids=set(applied), limit=limit)
+        scores = dict(ranked)
+        projects = Project.objects.filter(id__in=scores).select_related('client').prefetch_related('skills_required')
+        projects = sorted(projects, key=lambda project: -scores[project.id])
+
+        data = self.get_serializer(projects, many=True).data
+        for item in data:
+            item['match_score'] = round(scores[item['id']], 4)
+        return Response(data)
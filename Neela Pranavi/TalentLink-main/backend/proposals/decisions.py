@@ -0,0 +1,136 @@
+
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import status
+
+from profiles.models import adjust_total_projects
+from projects.models import Project
+from projects.recommendations import skill_match_index
+from .models import Proposal, adjust_proposal_count
+
+# Upper bound on decisions settled by one POST /api/proposals/batch-decide/
+MAX_BATCH_DECISIONS = 200
+
+
+class DecisionError(Exception):
+    def __init__(self, message, status_code=status.HTTP_400_BAD_REQUEST):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+
+# Accepting and rejecting only move proposals between counted statuses, so the
+# queryset updates below leave Project.proposal_count alone on purpose; only
+# withdraw() adjusts it. They skip Proposal.save(), so accept() bumps the hired
+# freelancer's total_projects itself.
+#
+# Each decision opens with a conditional UPDATE instead of a SELECT: the UPDATE
+# locks the row it changes and reports how many rows matched, so of two clients
+# racing on the same proposal or project exactly one sees a row. Reading first
+# would also make SQLite writers deadlock on the lock upgrade.
+
+def accept(proposal_id, client):
+    """Accept a pending proposal, reject its pending siblings and start the project."""
+    now = timezone.now()
+    with transaction.atomic():
+        accepted = Proposal.objects.filter(
+            pk=proposal_id, project__client=client, status='pending', project__status='open'
+        ).update(status='accepted', updated_at=now)
+        if not accepted:
+            raise _explain_failure(proposal_id, client)
+
+        project_id, freelancer_id = (
+            Proposal.objects.filter(pk=proposal_id).values_list('project_id', 'freelancer_id').get()
+        )
+        # a concurrent accept of a sibling proposal changed the project first
+        started = Project.objects.filter(pk=project_id, status='open').update(status='in_progress', updated_at=now)
+        if not started:
+            raise DecisionError('Another proposal has already been accepted for this project',
+                                status.HTTP_409_CONFLICT)
+
+        Proposal.objects.filter(project_id=project_id, status='pending').exclude(pk=proposal_id).update(
+            status='rejected', updated_at=now
+        )
+        adjust_total_projects(freelancer_id, 1)
+        # the project left the "open" recommendations (no post_save from .update())
+        skill_match_index.update_projects_on_commit([project_id])
+    return 'accepted'
+
+
+def reject(proposal_id, client):
+    with transaction.atomic():
+        rejected = Proposal.objects.filter(
+            pk=proposal_id, project__client=client, status='pending'
+        ).update(status='rejected', updated_at=timezone.now())
+        if not rejected:
+            raise _explain_failure(proposal_id, client)
+    return 'rejected'
+
+
+def withdraw(proposal_id, freelancer):
+    """The freelancer takes back a pending proposal; it stops counting towards Project.proposal_count."""
+    with transaction.atomic():
+        withdrawn = Proposal.objects.filter(
+            pk=proposal_id, freelancer=freelancer, status='pending'
+        ).update(status='withdrawn', updated_at=timezone.now())
+        if not withdrawn:
+            if not Proposal.objects.filter(pk=proposal_id, freelancer=freelancer).exists():
+                raise DecisionError('Proposal not found', status.HTTP_404_NOT_FOUND)
+            raise DecisionError('Only pending proposals can be withdrawn')
+        # only the request whose UPDATE matched gets here, so the count moves once
+        project_id = Proposal.objects.filter(pk=proposal_id).values_list('project_id', flat=True).get()
+        adjust_proposal_count(project_id, -1)
+    return 'withdrawn'
+
+
+ACTIONS = {'accept': accept, 'reject': reject}
+
+
+def decide_many(decisions, client):
+    """
+    Apply [{"proposal": id, "action": "accept" | "reject"}, ...] in order.
+
+    Every decision commits on its own, so a conflict on one project never
+    holds locks on, or rolls back, the others. Returns one result per decision.
+    """
+    results = []
+    for decision in decisions:
+        proposal_id, action = _parse_decision(decision)
+        if action is None:
+            results.append({
+                'proposal': proposal_id,
+                'error': 'Expected {"proposal": <id>, "action": "accept" or "reject"}',
+                'status_code': status.HTTP_400_BAD_REQUEST,
+            })
+            continue
+        try:
+            results.append({'proposal': proposal_id, 'status': action(proposal_id, client)})
+        except DecisionError as error:
+            results.append({'proposal': proposal_id, 'error': error.message, 'status_code': error.status_code})
+    return results
+
+
+def _parse_decision(decision):
+    if not isinstance(decision, dict):
+        return None, None
+    proposal_id, action = decision.get('proposal'), decision.get('action')
+    if type(proposal_id) is not int or not isinstance(action, str):
+        return proposal_id, None
+    return proposal_id, ACTIONS.get(action)
+
+
+def _explain_failure(proposal_id, client):
+    row = (
+        Proposal.objects.filter(pk=proposal_id, project__client=client)
+        .values_list('status', 'project__status')
+        .first()
+    )
+    if row is None:
+        return DecisionError('Proposal not found', status.HTTP_404_NOT_FOUND)
+    proposal_status, project_status = row
+    if proposal_status != 'pending':
+        return DecisionError('This proposal has already been processed')
+    if project_status == 'in_progress':
+        return DecisionError('Another proposal has already been accepted for this project',
+                             status.HTTP_409_CONFLICT)
+    return DecisionError('This project is no longer open', status.HTTP_409_CONFLICT)
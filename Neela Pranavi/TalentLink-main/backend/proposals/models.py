@@ -1,6 +1,10 @@
 
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
 from django.contrib.auth import get_user_model
+from profiles.models import adjust_total_projects
 from projects.models import Project
 
 User = get_user_model()
@@ -22,9 +26,58 @@ class Proposal(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # withdrawn proposals don't count towards Project.proposal_count
+    UNCOUNTED_STATUSES = ('withdrawn',)
+    # an accepted proposal is one of the freelancer's Profile.total_projects
+    HIRED_STATUS = 'accepted'
+
     class Meta:
         unique_together = ['project', 'freelancer']
         ordering = ['-created_at']
 
     def __str__(self):
         return f"Proposal by {self.freelancer.username} for {self.project.title}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._counted = instance.is_counted()
+        instance._hired = instance.is_hired()
+        return instance
+
+    def is_counted(self):
+        return self.status not in self.UNCOUNTED_STATUSES
+
+    def is_hired(self):
+        return self.status == self.HIRED_STATUS
+
+    def save(self, *args, **kwargs):
+        was_counted = getattr(self, '_counted', False) if not self._state.adding else False
+        was_hired = getattr(self, '_hired', False) if not self._state.adding else False
+        delta = int(self.is_counted()) - int(was_counted)
+        hired_delta = int(self.is_hired()) - int(was_hired)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'status' not in update_fields:
+            delta = hired_delta = 0
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if delta:
+                adjust_proposal_count(self.project_id, delta)
+            if hired_delta:
+                adjust_total_projects(self.freelancer_id, hired_delta)
+        if delta or hired_delta or update_fields is None:
+            self._counted = self.is_counted()
+            self._hired = self.is_hired()
+
+
+def adjust_proposal_count(project_id, delta):
+    Project.objects.filter(pk=project_id).update(proposal_count=F('proposal_count') + delta)
+
+
+@receiver(post_delete, sender=Proposal)
+def proposal_deleted(sender, instance, **kwargs):
+    # runs inside the deletion's transaction, cascades included
+    if getattr(instance, '_counted', instance.is_counted()):
+        adjust_proposal_count(instance.project_id, -1)
+    if getattr(instance, '_hired', instance.is_hired()):
+        adjust_total_projects(instance.freelancer_id, -1)
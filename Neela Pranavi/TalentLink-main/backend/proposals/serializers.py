@@ -13,7 +13,8 @@ class ProposalSerializer(serializers.ModelSerializer):
             'cover_letter', 'proposed_budget', 'proposed_timeline', 'status',
             'created_at', 'updated_at'
         ]
-        read_only_fields = ['freelancer', 'created_at', 'updated_at']
+        # status only changes through the accept / reject / withdraw endpoints
+        read_only_fields = ['freelancer', 'status', 'created_at', 'updated_at']
 
     def get_freelancer_info(self, obj):
         profile = getattr(obj.freelancer, 'profile', None)
@@ -67,6 +68,8 @@ class ProposalStatusUpdateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Proposal
         fields = ['status']
+        # the model has a default, which would make the field optional
+        extra_kwargs = {'status': {'required': True}}
 
     def validate_status(self, value):
         if value not in ['accepted', 'rejected']:
@@ -0,0 +1,232 @@
+
+import threading
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from rest_framework.test import APIClient
+
+from projects.models import Project
+from .models import Proposal
+
+User = get_user_model()
+
+
+def make_user(username, user_type):
+    return User.objects.create_user(
+        username=username, email=f'{username}@example.com', password='pass12345', user_type=user_type
+    )
+
+
+def make_project(client, title='Site'):
+    return Project.objects.create(
+        title=title, description='...', client=client, budget_type='fixed', duration='1_3_months'
+    )
+
+
+def make_proposal(project, freelancer):
+    return Proposal.objects.create(
+        project=project, freelancer=freelancer, cover_letter='Hi', proposed_budget=100, proposed_timeline='2 weeks'
+    )
+
+
+class ProposalDecisionTests(TestCase):
+    def setUp(self):
+        self.client_user = make_user('client', 'client')
+        self.freelancers = [make_user(f'free{i}', 'freelancer') for i in range(3)]
+        self.project = make_project(self.client_user)
+        self.proposals = [make_proposal(self.project, freelancer) for freelancer in self.freelancers]
+        self.api = APIClient()
+        self.api.force_authenticate(self.client_user)
+
+    def test_accept_rejects_siblings_and_starts_project(self):
+        response = self.api.post(f'/api/proposals/{self.proposals[0].pk}/accept/')
+
+        self.assertEqual(response.status_code, 200)
+        statuses = dict(Proposal.objects.values_list('pk', 'status'))
+        self.assertEqual(statuses, {
+            self.proposals[0].pk: 'accepted', self.proposals[1].pk: 'rejected', self.proposals[2].pk: 'rejected',
+        })
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.status, 'in_progress')
+        self.assertEqual(self.project.proposal_count, 3)
+
+    def test_second_decision_is_refused(self):
+        self.api.post(f'/api/proposals/{self.proposals[0].pk}/reject/')
+        response = self.api.post(f'/api/proposals/{self.proposals[0].pk}/accept/')
+        self.assertEqual(response.status_code, 400)
+
+    def test_other_clients_proposal_is_not_found(self):
+        other = APIClient()
+        other.force_authenticate(make_user('other', 'client'))
+        response = other.post(f'/api/proposals/{self.proposals[0].pk}/accept/')
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(Proposal.objects.get(pk=self.proposals[0].pk).status, 'pending')
+
+    def test_status_patch_goes_through_decisions(self):
+        response = self.api.patch(f'/api/proposals/{self.proposals[0].pk}/', {'status': 'accepted'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['status'], 'accepted')
+        self.assertEqual(Proposal.objects.get(pk=self.proposals[1].pk).status, 'rejected')
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.status, 'in_progress')
+
+        response = self.api.patch(f'/api/proposals/{self.proposals[1].pk}/', {'status': 'accepted'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Proposal.objects.filter(status='accepted').count(), 1)
+
+    def test_status_patch_requires_a_status(self):
+        for data in ({}, {'cover_letter': 'Updated'}):
+            response = self.api.patch(f'/api/proposals/{self.proposals[0].pk}/', data)
+            self.assertEqual(response.status_code, 400)
+            self.assertIn('status', response.data)
+        self.assertFalse(Proposal.objects.exclude(status='pending').exists())
+
+    def test_freelancer_cannot_set_status(self):
+        api = APIClient()
+        api.force_authenticate(self.freelancers[0])
+        response = api.patch(f'/api/proposals/{self.proposals[0].pk}/', {'status': 'accepted', 'cover_letter': 'Updated'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Proposal.objects.get(pk=self.proposals[0].pk).status, 'pending')
+
+    def test_batch_decide_across_projects(self):
+        second = make_project(self.client_user, 'App')
+        second_proposal = make_proposal(second, self.freelancers[0])
+
+        response = self.api.post('/api/proposals/batch-decide/', {'decisions': [
+            {'proposal': self.proposals[0].pk, 'action': 'reject'},
+            {'proposal': self.proposals[1].pk, 'action': 'accept'},
+            {'proposal': self.proposals[2].pk, 'action': 'accept'},
+            {'proposal': second_proposal.pk, 'action': 'accept'},
+            {'proposal': second_proposal.pk, 'action': 'bogus'},
+        ]}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['applied'], 3)
+        self.assertEqual(response.data['failed'], 2)
+        self.assertEqual([result.get('status') for result in response.data['results']],
+                         ['rejected', 'accepted', None, 'accepted', None])
+        self.assertEqual(response.data['results'][2]['status_code'], 400)
+        second.refresh_from_db()
+        self.assertEqual(second.status, 'in_progress')
+
+
+class ProposalCountTests(TestCase):
+    def setUp(self):
+        self.client_user = make_user('client', 'client')
+        self.freelancer = make_user('free', 'freelancer')
+        self.project = make_project(self.client_user)
+        self.api = APIClient()
+        self.api.force_authenticate(self.freelancer)
+
+    def count(self):
+        self.project.refresh_from_db()
+        return self.project.proposal_count
+
+    def test_create_withdraw_and_delete(self):
+        response = self.api.post('/api/proposals/', {
+            'project': self.project.pk, 'cover_letter': 'Hi', 'proposed_budget': 100, 'proposed_timeline': '2 weeks',
+        })
+        self.assertEqual(response.status_code, 201)
+        other = make_proposal(self.project, make_user('free2', 'freelancer'))
+        self.assertEqual(self.count(), 2)
+
+        proposal = Proposal.objects.get(freelancer=self.freelancer)
+        self.assertEqual(self.api.post(f'/api/proposals/{proposal.pk}/withdraw/').status_code, 200)
+        self.assertEqual(self.count(), 1)
+        # a second withdraw (e.g. a racing duplicate) finds nothing pending
+        self.assertEqual(self.api.post(f'/api/proposals/{proposal.pk}/withdraw/').status_code, 400)
+        self.assertEqual(self.count(), 1)
+
+        Proposal.objects.get(pk=proposal.pk).delete()  # withdrawn: not counted
+        self.assertEqual(self.count(), 1)
+        other.delete()
+        self.assertEqual(self.count(), 0)
+
+    def test_withdraw_only_own_proposal(self):
+        proposal = make_proposal(self.project, make_user('free2', 'freelancer'))
+        self.assertEqual(self.api.post(f'/api/proposals/{proposal.pk}/withdraw/').status_code, 404)
+        self.assertEqual(self.count(), 1)
+
+    def test_reconcile_proposal_counts(self):
+        make_proposal(self.project, self.freelancer)
+        withdrawn = make_proposal(self.project, make_user('free2', 'freelancer'))
+        withdrawn.status = 'withdrawn'
+        withdrawn.save()
+        untouched = make_project(self.client_user, 'App')
+        Project.objects.filter(pk=self.project.pk).update(proposal_count=5)
+
+        out = StringIO()
+        call_command('reconcile_proposal_counts', '--dry-run', stdout=out)
+        self.assertIn('Found 1 project(s)', out.getvalue())
+        self.assertEqual(self.count(), 5)
+
+        call_command('reconcile_proposal_counts', '--batch-size', '1', stdout=out)
+        self.assertEqual(self.count(), 1)
+        untouched.refresh_from_db()
+        self.assertEqual(untouched.proposal_count, 0)
+
+
+class ConcurrentWithdrawTests(TransactionTestCase):
+    def test_parallel_withdraws_decrement_once(self):
+        client_user = make_user('client', 'client')
+        freelancer = make_user('free', 'freelancer')
+        project = make_project(client_user)
+        proposal = make_proposal(project, freelancer)
+        make_proposal(project, make_user('free2', 'freelancer'))
+
+        barrier = threading.Barrier(4)
+        codes = []
+
+        def withdraw():
+            api = APIClient()
+            api.force_authenticate(freelancer)
+            try:
+                barrier.wait()
+                codes.append(api.post(f'/api/proposals/{proposal.pk}/withdraw/').status_code)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=withdraw) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(codes), [200, 400, 400, 400])
+        self.assertEqual(Project.objects.get().proposal_count, 1)
+
+
+class ConcurrentAcceptTests(TransactionTestCase):
+    def test_parallel_accepts_accept_exactly_one(self):
+        client_user = make_user('client', 'client')
+        project = make_project(client_user)
+        proposals = [make_proposal(project, make_user(f'free{i}', 'freelancer')) for i in range(8)]
+
+        barrier = threading.Barrier(len(proposals))
+        codes = []
+
+        def accept(proposal):
+            api = APIClient()
+            api.force_authenticate(client_user)
+            try:
+                barrier.wait()
+                codes.append(api.post(f'/api/proposals/{proposal.pk}/accept/').status_code)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=accept, args=(proposal,)) for proposal in proposals]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # losers either find their proposal already rejected by the winner (400)
+        # or lose the race for the project itself (409)
+        self.assertEqual(codes.count(200), 1)
+        self.assertTrue(set(codes) <= {200, 400, 409}, codes)
+        self.assertEqual(Proposal.objects.filter(status='accepted').count(), 1)
+        self.assertEqual(Proposal.objects.filter(status='rejected').count(), len(proposals) - 1)
+        self.assertEqual(Project.objects.get().status, 'in_progress')
@@ -2,13 +2,15 @@
 from django.urls import path
 from .views import (
     ProposalListCreateView, ProposalDetailView, ProjectProposalsView,
-    accept_proposal, reject_proposal
+    accept_proposal, reject_proposal, withdraw_proposal, batch_decide_proposals
 )
 
 urlpatterns = [
     path('', ProposalListCreateView.as_view(), name='proposal-list-create'),
     path('<int:pk>/', ProposalDetailView.as_view(), name='proposal-detail'),
     path('project/<int:project_id>/', ProjectProposalsView.as_view(), name='project-proposals'),
+    path('batch-decide/', batch_decide_proposals, name='batch-decide-proposals'),
     path('<int:proposal_id>/accept/', accept_proposal, name='accept-proposal'),
     path('<int:proposal_id>/reject/', reject_proposal, name='reject-proposal'),
+    path('<int:proposal_id>/withdraw/', withdraw_proposal, name='withdraw-proposal'),
 ]
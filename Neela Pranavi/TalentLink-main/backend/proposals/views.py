@@ -3,11 +3,14 @@ from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.decorators import api_view, permission_classes
 from django.db.models import Q
+from talentlink.pagination import EstimatedCountPagination
+from . import decisions
 from .models import Proposal
 from .serializers import ProposalSerializer, ProposalCreateSerializer, ProposalStatusUpdateSerializer
 
 class ProposalListCreateView(generics.ListCreateAPIView):
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = EstimatedCountPagination
 
     def get_serializer_class(self):
         if self.request.method == 'POST':
@@ -47,6 +50,23 @@ class ProposalDetailView(generics.RetrieveUpdateAPIView):
         else:
             return Proposal.objects.filter(freelancer=user)
 
+    def update(self, request, *args, **kwargs):
+        if request.user.user_type != 'client':
+            return super().update(request, *args, **kwargs)
+        # a client's status change is an accept / reject decision: it has to
+        # settle the siblings and the project the way decisions.py does
+        proposal = self.get_object()
+        # not partial, even for PATCH: there is no decision without a status
+        serializer = ProposalStatusUpdateSerializer(proposal, data=request.data)
+        serializer.is_valid(raise_exception=True)
+        action = 'accept' if serializer.validated_data['status'] == 'accepted' else 'reject'
+        try:
+            decisions.ACTIONS[action](proposal.pk, request.user)
+        except decisions.DecisionError as error:
+            return Response({'error': error.message}, status=error.status_code)
+        proposal.refresh_from_db()
+        return Response(ProposalStatusUpdateSerializer(proposal).data)
+
 class ProjectProposalsView(generics.ListAPIView):
     serializer_class = ProposalSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -62,49 +82,49 @@ class ProjectProposalsView(generics.ListAPIView):
 @permission_classes([permissions.IsAuthenticated])
 def accept_proposal(request, proposal_id):
     try:
-        proposal = Proposal.objects.get(id=proposal_id, project__client=request.user)
-
-        if proposal.status != 'pending':
-            return Response({'error': 'This proposal has already been processed'}, 
-                          status=status.HTTP_400_BAD_REQUEST)
-
-        # Accept this proposal
-        proposal.status = 'accepted'
-        proposal.save()
-
-        # Reject all other proposals for this project
-        Proposal.objects.filter(
-            project=proposal.project,
-            status='pending'
-        ).exclude(id=proposal_id).update(status='rejected')
-
-        # Update project status
-        proposal.project.status = 'in_progress'
-        proposal.project.save()
-
-        return Response({'message': 'Proposal accepted successfully'}, 
-                       status=status.HTTP_200_OK)
+        decisions.accept(proposal_id, request.user)
+    except decisions.DecisionError as error:
+        return Response({'error': error.message}, status=error.status_code)
 
-    except Proposal.DoesNotExist:
-        return Response({'error': 'Proposal not found'}, 
-                       status=status.HTTP_404_NOT_FOUND)
+    return Response({'message': 'Proposal accepted successfully'}, 
+                   status=status.HTTP_200_OK)
 
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
 def reject_proposal(request, proposal_id):
     try:
-        proposal = Proposal.objects.get(id=proposal_id, project__client=request.user)
+        decisions.reject(proposal_id, request.user)
+    except decisions.DecisionError as error:
+        return Response({'error': error.message}, status=error.status_code)
 
-        if proposal.status != 'pending':
-            return Response({'error': 'This proposal has already been processed'}, 
-                          status=status.HTTP_400_BAD_REQUEST)
+    return Response({'message': 'Proposal rejected successfully'}, 
+                   status=status.HTTP_200_OK)
 
-        proposal.status = 'rejected'
-        proposal.save()
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def batch_decide_proposals(request):
+    items = request.data.get('decisions') if isinstance(request.data, dict) else None
+    if not isinstance(items, list) or not items:
+        return Response({'error': 'Expected a non-empty "decisions" list'}, 
+                      status=status.HTTP_400_BAD_REQUEST)
+    if len(items) > decisions.MAX_BATCH_DECISIONS:
+        return Response({'error': f'At most {decisions.MAX_BATCH_DECISIONS} decisions per request'}, 
+                      status=status.HTTP_400_BAD_REQUEST)
+
+    results = decisions.decide_many(items, request.user)
+    return Response({
+        'applied': sum('status' in result for result in results),
+        'failed': sum('error' in result for result in results),
+        'results': results,
+    }, status=status.HTTP_200_OK)
 
-        return Response({'message': 'Proposal rejected successfully'}, 
-                       status=status.HTTP_200_OK)
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def withdraw_proposal(request, proposal_id):
+    try:
+        decisions.withdraw(proposal_id, request.user)
+    except decisions.DecisionError as error:
+        return Response({'error': error.message}, status=error.status_code)
 
-    except Proposal.DoesNotExist:
-        return Response({'error': 'Proposal not found'}, 
-                       status=status.HTTP_404_NOT_FOUND)
+    return Response({'message': 'Proposal withdrawn successfully'}, 
+                   status=status.HTTP_200_OK)
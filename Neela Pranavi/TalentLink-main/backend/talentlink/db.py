@@ -0,0 +1,93 @@
+
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+READ_ALIAS = 'readonly'
+READ_APP_LABELS = {'projects', 'profiles', 'proposals'}
+
+# Set once the current request (or thread, outside requests) has written;
+# its later reads then stay on `default`.
+_pinned = ContextVar('pinned_to_default', default=False)
+
+
+class ReadOnlyRouter:
+    """
+    Sends reads of projects / profiles / proposals models to the read-only
+    connection (settings.DATABASES['readonly']: the same SQLite file opened
+    with mode=ro), so list queries don't queue behind writers on `default`.
+
+    Reads stay on `default` inside a transaction, during unsafe requests
+    (ReadAfterWriteMiddleware) and after any write in the same request.
+    """
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label not in READ_APP_LABELS or READ_ALIAS not in settings.DATABASES:
+            return None
+        if _pinned.get() or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return READ_ALIAS
+
+    def db_for_write(self, model, **hints):
+        _pinned.set(True)
+        # explicit: Django would otherwise write back to the alias the instance was read from
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # both aliases are the same database
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == READ_ALIAS:
+            return False
+        return None
+
+
+class ReadAfterWriteMiddleware:
+    """Starts each request unpinned, except POST / PUT / PATCH / DELETE, which read from `default` throughout."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = _pinned.set(request.method not in ('GET', 'HEAD', 'OPTIONS'))
+        try:
+            return self.get_response(request)
+        finally:
+            _pinned.reset(token)
+
+
+# --- SQLite pragmas -----------------------------------------------------------
+# Registered when the router (or middleware) is first imported, i.e. before
+# the first routed query opens a connection.
+
+SHARED_PRAGMAS = (
+    'PRAGMA mmap_size = 268435456',     # read pages through a 256 MB memory map
+    'PRAGMA cache_size = -65536',       # 64 MB page cache per connection
+    'PRAGMA temp_store = MEMORY',
+)
+WRITER_PRAGMAS = (
+    # WAL lets the readers go on while a write commits; it is stored in the
+    # file, so only a writable connection can switch it on
+    'PRAGMA journal_mode = WAL',
+    'PRAGMA synchronous = NORMAL',
+)
+
+
+@receiver(connection_created)
+def tune_sqlite_connection(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for pragma in SHARED_PRAGMAS:
+            cursor.execute(pragma)
+        if connection.alias == READ_ALIAS:
+            cursor.execute('PRAGMA query_only = ON')
+            # have the writer open first, so the file is switched to WAL
+            connections[DEFAULT_DB_ALIAS].ensure_connection()
+        elif not connection.is_in_memory_db():
+            for pragma in WRITER_PRAGMAS:
+                cursor.execute(pragma)
@@ -0,0 +1,110 @@
+
+import hashlib
+from collections import OrderedDict
+
+from django.core.cache import cache
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class EstimatedCountPagination(PageNumberPagination):
+    """
+    Page-number pagination without the exact COUNT(*).
+
+    Each page fetches page_size + 1 rows; the extra row only tells whether
+    there is a next page. The total in "count" is exact whenever the rows
+    seen so far settle it (the last page, or a single short page). Otherwise it
+    comes from a COUNT over at most `count_cap` + 1 rows, cached for
+    `count_cache_timeout` seconds per query, and is reported as e.g. "1000+"
+    once it reaches the cap.
+    """
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    count_cap = 1000
+    count_cache_timeout = 60
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        page_number = request.query_params.get(self.page_query_param) or 1
+        if page_number in self.last_page_strings:
+            # "last" would need the exact count this class avoids
+            self.invalid_page(page_number, 'Last page is not supported.')
+        try:
+            page_number = int(page_number)
+        except (TypeError, ValueError):
+            page_number = 0
+        if page_number < 1:
+            self.invalid_page(page_number, 'That page number is not a valid integer.')
+
+        offset = (page_number - 1) * page_size
+        rows = list(queryset[offset:offset + page_size + 1])
+        if not rows and page_number > 1:
+            self.invalid_page(page_number, 'That page contains no results')
+
+        self.page_number = page_number
+        self.has_next = len(rows) > page_size
+        self.results = rows[:page_size]
+        if self.has_next:
+            # at least one more row than this page ends at
+            self.count = max(self.estimate_count(queryset), offset + page_size + 1)
+        else:
+            self.count = offset + len(self.results)
+        return self.results
+
+    def invalid_page(self, page_number, message):
+        raise NotFound(self.invalid_page_message.format(page_number=page_number, message=message))
+
+    def estimate_count(self, queryset):
+        sql, params = queryset.query.sql_with_params()
+        key = 'estimated-count:' + hashlib.md5((sql + repr(params)).encode()).hexdigest()
+        count = cache.get(key)
+        if count is None:
+            # COUNT(*) FROM (... LIMIT cap + 1): bounded however big the result is
+            count = queryset.order_by()[:self.count_cap + 1].count()
+            cache.set(key, count, self.count_cache_timeout)
+        return count
+
+    def get_count_display(self):
+        if self.count > self.count_cap:
+            return f'{self.count_cap}+'
+        return self.count
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.replace_page(self.page_number + 1)
+
+    def get_previous_link(self):
+        if self.page_number == 1:
+            return None
+        return self.replace_page(self.page_number - 1)
+
+    def replace_page(self, page_number):
+        url = self.request.build_absolute_uri()
+        if page_number == 1:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.page_query_param, page_number)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('count', self.get_count_display()),
+            ('has_next', self.has_next),
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema['properties']['count'] = {
+            'oneOf': [{'type': 'integer'}, {'type': 'string'}],
+            'example': f'{self.count_cap}+',
+        }
+        response_schema['properties']['has_next'] = {'type': 'boolean'}
+        return response_schema
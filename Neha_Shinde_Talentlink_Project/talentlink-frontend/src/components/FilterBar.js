@@ -22,7 +22,7 @@ function FilterBar({ onFilter }) {
     <div style={{ marginBottom: '20px' }}>
       <input
         type="text"
-        placeholder="Skill"
+        placeholder="Skills, e.g. python, django"
         value={skill}
         onChange={e => setSkill(e.target.value)}
       />
@@ -2,7 +2,7 @@ from django.contrib import admin
 
 # Register your models here.
 
-from .models import Skill, Profile, Project, Proposal, Contract, Message, Review
+from .models import Skill, Profile, Project, Proposal, Contract, Message, Review, Thread
 
 admin.site.register(Skill)
 admin.site.register(Profile)
@@ -10,5 +10,6 @@ admin.site.register(Project)
 admin.site.register(Proposal)
 admin.site.register(Contract)
 admin.site.register(Message)
+admin.site.register(Thread)
 admin.site.register(Review)
 
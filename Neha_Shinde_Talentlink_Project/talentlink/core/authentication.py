@@ -0,0 +1,57 @@
+from django.contrib.auth.models import User
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from .models import Profile
+
+
+class ProfileJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that loads the user and their profile in one query and
+    leaves the profile on the request for request_profile().
+    """
+
+    def authenticate(self, request):
+        result = super().authenticate(request)
+        if result is not None:
+            # filled in (possibly with None) by the select_related below
+            request.profile = getattr(result[0], 'profile', None)
+        return result
+
+    def get_user(self, validated_token):
+        # JWTAuthentication.get_user, plus the profile join
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+
+        user = User.objects.select_related('profile').filter(**{api_settings.USER_ID_FIELD: user_id}).first()
+        if user is None:
+            raise AuthenticationFailed(_('User not found'), code='user_not_found')
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code='password_changed')
+        return user
+
+
+def request_profile(request):
+    """
+    The caller's Profile, or None if they are anonymous or have none yet.
+
+    Looked up at most once per request: ProfileJWTAuthentication sets it while
+    authenticating, other authentication (sessions, tests) on first use.
+    """
+    try:
+        return request.profile
+    except AttributeError:
+        pass
+    profile = None
+    if request.user.is_authenticated:
+        profile = Profile.objects.select_related('user').filter(user=request.user).first()
+    request.profile = profile
+    return profile
@@ -0,0 +1,101 @@
+import random
+import time
+from types import SimpleNamespace
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Q
+from django.http import QueryDict
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from core.models import Profile, Project, Skill, normalize_skill_name
+from core.views import ProjectViewSet
+
+CASES = ('', 'skill=python', 'skill=python,django', 'skill=python,django&match=all')
+
+
+def old_queryset(params):
+    """The ?skill= filter before normalized names: icontains over a join, made distinct."""
+    queryset = Project.objects.all()
+    names = [name.strip() for name in params.get('skill', '').split(',') if name.strip()]
+    if params.get('match') == 'all':
+        for name in names:
+            queryset = queryset.filter(skills_required__name__icontains=name)
+    elif names:
+        condition = Q()
+        for name in names:
+            condition |= Q(skills_required__name__icontains=name)
+        queryset = queryset.filter(condition)
+    return queryset.distinct()
+
+
+def new_queryset(params):
+    view = ProjectViewSet()
+    view.request = SimpleNamespace(query_params=params)
+    return view.get_queryset()
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the SQL of ProjectViewSet's ?skill= filter against the old icontains join "
+        "on a throwaway test database filled with projects (never the real one)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--projects', type=int, default=100_000)
+        parser.add_argument('--skills-per-project', type=int, default=10)
+        parser.add_argument('--catalogue', type=int, default=200, help="Number of distinct skills.")
+        parser.add_argument('--repeat', type=int, default=3, help="Runs per query; the best one is reported.")
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            started = time.perf_counter()
+            self.seed(options['projects'], options['skills_per_project'], options['catalogue'])
+            self.stdout.write('Seeded %d projects x %d skills in %.0f s' % (
+                options['projects'], options['skills_per_project'], time.perf_counter() - started))
+            for case in CASES:
+                params = QueryDict(case)
+                old = self.best_time(old_queryset(params), options['repeat'])
+                new = self.best_time(new_queryset(params), options['repeat'])
+                self.stdout.write('%-32s old %5.0f ms   new %5.0f ms' % (case or 'no filter', old, new))
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+    def seed(self, projects, skills_per_project, catalogue):
+        user = User.objects.create_user(username='benchmark', password='benchmark')
+        client = Profile.objects.create(user=user, role='client')
+        names = ['Python', 'Django'] + ['Skill %d' % i for i in range(catalogue - 2)]
+        skills = Skill.objects.bulk_create([
+            Skill(name=name, normalized_name=normalize_skill_name(name)) for name in names
+        ])
+        rnd = random.Random(0)
+        Through = Project.skills_required.through
+        batch = 5000
+        for start in range(0, projects, batch):
+            created = Project.objects.bulk_create([
+                Project(client=client, title='Project %d' % i, description='Benchmark project',
+                        budget=rnd.randint(100, 10000), duration_weeks=rnd.randint(1, 26))
+                for i in range(start, min(start + batch, projects))
+            ])
+            Through.objects.bulk_create([
+                Through(project_id=project.pk, skill_id=skill.pk)
+                for project in created for skill in rnd.sample(skills, skills_per_project)
+            ], batch_size=batch)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def best_time(self, queryset, repeat):
+        sql, params = queryset.query.sql_with_params()
+        timings = []
+        with connection.cursor() as cursor:
+            for _ in range(repeat):
+                started = time.perf_counter()
+                cursor.execute(sql, params)
+                cursor.fetchall()
+                timings.append((time.perf_counter() - started) * 1000)
+        return min(timings)
@@ -0,0 +1,72 @@
+# Generated by Django 5.2.6 on 2026-10-18 08:08
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def build_threads(apps, schema_editor):
+    # existing messages count as read; only new ones bump the unread counters
+    Message = apps.get_model('core', 'Message')
+    Thread = apps.get_model('core', 'Thread')
+    threads = {}
+    for message in Message.objects.order_by('timestamp', 'id').iterator():
+        pair = tuple(sorted((message.sender_id, message.receiver_id)))
+        thread = threads.get(pair)
+        if thread is None:
+            thread = threads[pair] = Thread.objects.create(user_low_id=pair[0], user_high_id=pair[1])
+        thread.last_message_id, thread.last_message_at = message.id, message.timestamp
+    for (low, high), thread in threads.items():
+        thread.save(update_fields=['last_message', 'last_message_at'])
+        Message.objects.filter(
+            models.Q(sender_id=low, receiver_id=high) | models.Q(sender_id=high, receiver_id=low)
+        ).update(thread=thread)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_profile_portfolio'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Thread',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_message_at', models.DateTimeField(blank=True, null=True)),
+                ('unread_low', models.PositiveIntegerField(default=0)),
+                ('unread_high', models.PositiveIntegerField(default=0)),
+                ('last_message', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='core.message')),
+                ('user_high', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('user_low', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='message',
+            name='thread',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='messages', to='core.thread'),
+        ),
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['thread', 'timestamp'], name='message_thread_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='thread',
+            index=models.Index(fields=['user_low', '-last_message_at'], name='thread_inbox_low_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='thread',
+            index=models.Index(fields=['user_high', '-last_message_at'], name='thread_inbox_high_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='thread',
+            constraint=models.UniqueConstraint(fields=('user_low', 'user_high'), name='unique_thread_pair'),
+        ),
+        migrations.AddConstraint(
+            model_name='thread',
+            constraint=models.CheckConstraint(condition=models.Q(('user_low__lte', models.F('user_high'))), name='thread_pair_ordered'),
+        ),
+        migrations.RunPython(build_threads, migrations.RunPython.noop),
+    ]
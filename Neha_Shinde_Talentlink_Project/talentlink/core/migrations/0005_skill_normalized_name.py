@@ -0,0 +1,28 @@
+# Generated by Django 5.2.6 on 2026-10-18 08:24
+
+from django.db import migrations, models
+
+
+def normalize_names(apps, schema_editor):
+    Skill = apps.get_model('core', 'Skill')
+    skills = list(Skill.objects.all())
+    for skill in skills:
+        # same as core.models.normalize_skill_name
+        skill.normalized_name = ' '.join(skill.name.split()).casefold()
+    Skill.objects.bulk_update(skills, ['normalized_name'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_message_threads'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='skill',
+            name='normalized_name',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=100),
+        ),
+        migrations.RunPython(normalize_names, migrations.RunPython.noop),
+    ]
@@ -1,13 +1,27 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F, Q
 from django.contrib.auth.models import User
 
+def normalize_skill_name(name):
+    """'  Machine   Learning ' -> 'machine learning': the form skill filters compare."""
+    return ' '.join(name.split()).casefold()
+
 # Skill model
 class Skill(models.Model):
     name = models.CharField(max_length=100)
+    # kept in step with name by save(); the project skill filter looks it up
+    normalized_name = models.CharField(max_length=100, editable=False, db_index=True, default='')
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        self.normalized_name = normalize_skill_name(self.name)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'name' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'normalized_name'}
+        super().save(*args, **kwargs)
+
     class Meta:
         verbose_name_plural = "Skills"
 
@@ -71,16 +85,86 @@ class Contract(models.Model):
     def __str__(self):
         return f"Contract for {self.proposal.project.title}"
 
+# Thread model (one conversation per pair of users)
+class Thread(models.Model):
+    # the pair is stored ordered, user_low.id <= user_high.id, so (a, b) and (b, a) share a row
+    user_low = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    user_high = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    last_message = models.ForeignKey('Message', on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    last_message_at = models.DateTimeField(null=True, blank=True)
+    unread_low = models.PositiveIntegerField(default=0)   # unread by user_low
+    unread_high = models.PositiveIntegerField(default=0)  # unread by user_high
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user_low', 'user_high'], name='unique_thread_pair'),
+            models.CheckConstraint(condition=Q(user_low__lte=F('user_high')), name='thread_pair_ordered'),
+        ]
+        indexes = [
+            models.Index(fields=['user_low', '-last_message_at'], name='thread_inbox_low_idx'),
+            models.Index(fields=['user_high', '-last_message_at'], name='thread_inbox_high_idx'),
+        ]
+
+    def __str__(self):
+        return f"Thread between {self.user_low_id} and {self.user_high_id}"
+
+    @staticmethod
+    def pair(user_a_id, user_b_id):
+        return (user_a_id, user_b_id) if user_a_id <= user_b_id else (user_b_id, user_a_id)
+
+    @classmethod
+    def for_users(cls, user_a_id, user_b_id):
+        user_low_id, user_high_id = cls.pair(user_a_id, user_b_id)
+        thread, _ = cls.objects.get_or_create(user_low_id=user_low_id, user_high_id=user_high_id)
+        return thread
+
+    @classmethod
+    def for_participant(cls, user):
+        return cls.objects.filter(Q(user_low=user) | Q(user_high=user))
+
+    def other_user(self, user):
+        return self.user_high if self.user_low_id == user.id else self.user_low
+
+    def unread_for(self, user):
+        return self.unread_low if self.user_low_id == user.id else self.unread_high
+
+    def mark_read(self, user):
+        field = 'unread_low' if self.user_low_id == user.id else 'unread_high'
+        Thread.objects.filter(pk=self.pk).update(**{field: 0})
+        setattr(self, field, 0)
+
 # Message model
 class Message(models.Model):
     sender = models.ForeignKey(User, on_delete=models.CASCADE, related_name='sent_messages')
     receiver = models.ForeignKey(User, on_delete=models.CASCADE, related_name='received_messages')
+    thread = models.ForeignKey(Thread, on_delete=models.CASCADE, related_name='messages', null=True, blank=True)
     content = models.TextField()
     timestamp = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['thread', 'timestamp'], name='message_thread_time_idx'),
+        ]
+
     def __str__(self):
         return f"Message from {self.sender.username} to {self.receiver.username}"
 
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            return super().save(*args, **kwargs)
+        # a new message and its thread's summary are written together
+        with transaction.atomic():
+            self.thread = Thread.for_users(self.sender_id, self.receiver_id)
+            super().save(*args, **kwargs)
+            threads = Thread.objects.filter(pk=self.thread_id)
+            # a concurrent, newer message may already be the thread's last one
+            threads.filter(Q(last_message_at__isnull=True) | Q(last_message_at__lte=self.timestamp)).update(
+                last_message=self, last_message_at=self.timestamp
+            )
+            if self.sender_id != self.receiver_id:
+                unread = 'unread_low' if self.receiver_id == self.thread.user_low_id else 'unread_high'
+                threads.update(**{unread: F(unread) + 1})
+
 # Review model
 class Review(models.Model):
     reviewer = models.ForeignKey(Profile, on_delete=models.CASCADE, related_name='given_reviews')
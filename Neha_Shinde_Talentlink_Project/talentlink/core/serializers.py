@@ -1,11 +1,11 @@
 from rest_framework import serializers
-from .models import Skill, Profile, Project, Proposal, Contract, Message, Review
+from .models import Skill, Profile, Project, Proposal, Contract, Message, Review, Thread
 from django.contrib.auth.models import User
 
 class SkillSerializer(serializers.ModelSerializer):
     class Meta:
         model = Skill
-        fields = '__all__'
+        exclude = ['normalized_name']
 
 class ProfileSerializer(serializers.ModelSerializer):
     user = serializers.StringRelatedField()
@@ -48,6 +48,31 @@ class MessageSerializer(serializers.ModelSerializer):
     class Meta:
         model = Message
         fields = '__all__'
+        read_only_fields = ['sender', 'thread', 'timestamp']
+
+    def get_extra_kwargs(self):
+        extra_kwargs = super().get_extra_kwargs()
+        if self.instance is not None:
+            # Message.save() files a message under its thread only once; a new
+            # receiver would leave it in the old pair's thread
+            extra_kwargs['receiver'] = {**extra_kwargs.get('receiver', {}), 'read_only': True}
+        return extra_kwargs
+
+class ThreadSerializer(serializers.ModelSerializer):
+    other_user = serializers.SerializerMethodField()
+    last_message = MessageSerializer(read_only=True)
+    unread = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Thread
+        fields = ['id', 'other_user', 'last_message', 'last_message_at', 'unread']
+
+    def get_other_user(self, obj):
+        user = obj.other_user(self.context['request'].user)
+        return {'id': user.id, 'username': user.username}
+
+    def get_unread(self, obj):
+        return obj.unread_for(self.context['request'].user)
 
 class ReviewSerializer(serializers.ModelSerializer):
     class Meta:
@@ -1,3 +1,211 @@
+from django.contrib.auth.models import User
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
 
-# Create your tests here.
+from .models import Message, Profile, Project, Proposal, Skill, Thread
+
+
+class MessageThreadTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.alice = User.objects.create_user(username='alice', password='pass')
+        cls.bob = User.objects.create_user(username='bob', password='pass')
+        cls.carol = User.objects.create_user(username='carol', password='pass')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.alice)
+
+    def send(self, sender, receiver, content):
+        return Message.objects.create(sender=sender, receiver=receiver, content=content)
+
+    def test_both_directions_share_one_thread(self):
+        first = self.send(self.bob, self.alice, 'hi')
+        reply = self.send(self.alice, self.bob, 'hello')
+
+        self.assertEqual(Thread.objects.count(), 1)
+        thread = Thread.objects.get()
+        self.assertEqual(first.thread_id, thread.pk)
+        self.assertEqual(reply.thread_id, thread.pk)
+        self.assertEqual(thread.last_message_id, reply.pk)
+        self.assertEqual((thread.unread_for(self.alice), thread.unread_for(self.bob)), (1, 1))
+
+    def test_inbox_lists_threads_newest_first(self):
+        for i in range(3):
+            self.send(self.bob, self.alice, 'bob %d' % i)
+        self.send(self.carol, self.alice, 'carol')
+        self.send(self.bob, self.carol, 'not for alice')
+
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/threads/')
+
+        self.assertEqual(response.status_code, 200)
+        inbox = [(row['other_user']['username'], row['last_message']['content'], row['unread']) for row in response.data]
+        self.assertEqual(inbox, [('carol', 'carol', 1), ('bob', 'bob 2', 3)])
+
+    def test_history_is_cursor_paginated(self):
+        for i in range(60):
+            self.send(self.alice if i % 2 else self.bob, self.bob if i % 2 else self.alice, 'm%d' % i)
+        thread = Thread.objects.get()
+
+        page = self.client.get('/api/threads/%d/messages/' % thread.pk).data
+        self.assertEqual(len(page['results']), 50)
+        self.assertEqual(page['results'][0]['content'], 'm59')
+        rest = self.client.get(page['next']).data
+        self.assertEqual([row['content'] for row in rest['results']], ['m%d' % i for i in range(9, -1, -1)])
+        self.assertIsNone(rest['next'])
+
+    def test_read_resets_only_the_callers_counter(self):
+        self.send(self.bob, self.alice, 'one')
+        self.send(self.alice, self.bob, 'two')
+        thread = Thread.objects.get()
+
+        response = self.client.post('/api/threads/%d/read/' % thread.pk)
+
+        self.assertEqual(response.status_code, 200)
+        thread.refresh_from_db()
+        self.assertEqual((thread.unread_for(self.alice), thread.unread_for(self.bob)), (0, 1))
+
+    def test_outsiders_cannot_open_a_thread(self):
+        self.send(self.bob, self.carol, 'private')
+        thread = Thread.objects.get()
+        self.assertEqual(self.client.get('/api/threads/%d/messages/' % thread.pk).status_code, 404)
+
+    def test_posting_a_message_uses_the_caller_as_sender(self):
+        response = self.client.post('/api/messages/', {'receiver': self.bob.pk, 'content': 'hey', 'sender': self.carol.pk})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['sender'], self.alice.pk)
+        self.assertEqual(Thread.objects.get().unread_for(self.bob), 1)
+
+    def test_receiver_cannot_be_changed(self):
+        message = self.send(self.alice, self.bob, 'draft')
+        response = self.client.patch('/api/messages/%d/' % message.pk, {'receiver': self.carol.pk, 'content': 'edited'})
+        self.assertEqual(response.status_code, 200)
+
+        message.refresh_from_db()
+        self.assertEqual((message.receiver_id, message.content), (self.bob.pk, 'edited'))
+        self.assertEqual(Thread.objects.count(), 1)
+        self.assertEqual(message.thread.unread_for(self.bob), 1)
+
+
+class RequestProfileTests(TestCase):
+    """The caller's profile is read once, together with the user, while authenticating."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.skill = Skill.objects.create(name='Python')
+        cls.client_profile = Profile.objects.create(
+            user=User.objects.create_user(username='client', password='pass'), role='client'
+        )
+        cls.freelancer = Profile.objects.create(
+            user=User.objects.create_user(username='freelancer', password='pass'), role='freelancer'
+        )
+        cls.project = Project.objects.create(
+            client=cls.client_profile, title='API', description='...', budget=500, duration_weeks=4
+        )
+        Proposal.objects.create(freelancer=cls.freelancer, project=cls.project, message='me', proposed_rate=20)
+
+    def api_for(self, user):
+        api = APIClient()
+        api.credentials(HTTP_AUTHORIZATION='Bearer %s' % AccessToken.for_user(user))
+        return api
+
+    def assertProfileQueries(self, queries):
+        profile_columns = '"%s".' % Profile._meta.db_table
+        reads = [query['sql'] for query in queries if query['sql'].startswith('SELECT') and profile_columns in query['sql']]
+        # just the authentication join
+        self.assertEqual(len(reads), 1, reads)
+
+    def test_proposal_list(self):
+        api = self.api_for(self.freelancer.user)
+        with CaptureQueriesContext(connection) as queries:
+            response = api.get('/api/proposals/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 1)
+        # authentication (user + profile), proposals
+        self.assertEqual(len(queries), 2)
+        self.assertProfileQueries(queries)
+
+    def test_proposal_create(self):
+        api = self.api_for(self.freelancer.user)
+        with CaptureQueriesContext(connection) as queries:
+            response = api.post('/api/proposals/', {'project': self.project.pk, 'message': 'again', 'proposed_rate': '25.00'})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['freelancer'], self.freelancer.pk)
+        # authentication, project lookup, insert
+        self.assertEqual(len(queries), 3)
+        self.assertProfileQueries(queries)
+
+    def test_project_create(self):
+        api = self.api_for(self.client_profile.user)
+        payload = {'title': 'Site', 'description': '...', 'budget': '900.00', 'duration_weeks': 2, 'skills_required': [self.skill.pk]}
+        with CaptureQueriesContext(connection) as queries:
+            response = api.post('/api/projects/', payload)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['client'], self.client_profile.pk)
+        self.assertProfileQueries(queries)
+
+    def test_profile_create(self):
+        newcomer = User.objects.create_user(username='newcomer', password='pass')
+        api = self.api_for(newcomer)
+        with CaptureQueriesContext(connection) as queries:
+            response = api.post('/api/profiles/', {'role': 'freelancer', 'skills': [self.skill.pk]})
+        self.assertEqual(response.status_code, 201)
+        # the authentication join already found no profile
+        self.assertProfileQueries(queries)
+
+        response = api.post('/api/profiles/', {'role': 'freelancer', 'skills': [self.skill.pk]})
+        self.assertEqual(response.status_code, 400)
+
+    def test_user_without_profile_sees_no_proposals(self):
+        api = self.api_for(User.objects.create_user(username='nobody', password='pass'))
+        with self.assertNumQueries(1):
+            response = api.get('/api/proposals/')
+        self.assertEqual(response.data, [])
+
+
+class ProjectSkillFilterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='client', password='pass')
+        client = Profile.objects.create(user=cls.user, role='client')
+        python, django, react = (Skill.objects.create(name=name) for name in ('Python', ' Django ', 'React'))
+        cls.projects = {}
+        for title, skills in (('api', [python, django]), ('scripts', [python]), ('ui', [react]), ('site', [django, react])):
+            project = Project.objects.create(client=client, title=title, description='...', budget=100, duration_weeks=2)
+            project.skills_required.set(skills)
+            cls.projects[title] = project
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def titles(self, **params):
+        response = self.client.get('/api/projects/', params)
+        self.assertEqual(response.status_code, 200)
+        return sorted(project['title'] for project in response.data)
+
+    def test_any_skill_matches_each_project_once(self):
+        self.assertEqual(self.titles(skill='python,django'), ['api', 'scripts', 'site'])
+
+    def test_all_skills(self):
+        self.assertEqual(self.titles(skill='python,django', match='all'), ['api'])
+        self.assertEqual(self.titles(skill='python,react', match='all'), [])
+
+    def test_names_are_normalized(self):
+        self.assertEqual(Skill.objects.get(name=' Django ').normalized_name, 'django')
+        self.assertEqual(self.titles(skill=' PYTHON , , Django', match='all'), ['api'])
+        # whole names, not substrings
+        self.assertEqual(self.titles(skill='py'), [])
+
+    def test_unknown_match_is_rejected(self):
+        self.assertEqual(self.client.get('/api/projects/', {'skill': 'python', 'match': 'some'}).status_code, 400)
+
+    def test_renaming_keeps_the_normalized_name(self):
+        skill = Skill.objects.get(name='React')
+        skill.name = 'React Native'
+        skill.save(update_fields=['name'])
+        self.assertEqual(self.titles(skill='react native'), ['site', 'ui'])
@@ -5,7 +5,7 @@ from .views import budget_view
 
 from .views import (
     SkillViewSet, ProfileViewSet, ProjectViewSet,
-    ProposalViewSet, ContractViewSet, MessageViewSet, ReviewViewSet,budget_view
+    ProposalViewSet, ContractViewSet, MessageViewSet, ReviewViewSet, ThreadViewSet, budget_view
 )
 
 router = DefaultRouter()
@@ -15,6 +15,7 @@ router.register(r'projects', ProjectViewSet)
 router.register(r'proposals', ProposalViewSet)
 router.register(r'contracts', ContractViewSet)
 router.register(r'messages', MessageViewSet)
+router.register(r'threads', ThreadViewSet)
 router.register(r'reviews', ReviewViewSet)
 
 urlpatterns = [
@@ -8,11 +8,16 @@ from rest_framework.permissions import AllowAny
 from django.db.models import Q
 
 
-from rest_framework import viewsets
-from .models import Skill, Profile, Project, Proposal, Contract, Message, Review
+from rest_framework import serializers, viewsets
+from rest_framework.decorators import action
+from rest_framework.pagination import CursorPagination
+from django.db.models import Exists, F, OuterRef
+from .authentication import request_profile
+from .models import Skill, Profile, Project, Proposal, Contract, Message, Review, Thread, normalize_skill_name
 from .serializers import (
     SkillSerializer, ProfileSerializer, ProjectSerializer,
-    ProposalSerializer, ContractSerializer, MessageSerializer, ReviewSerializer
+    ProposalSerializer, ContractSerializer, MessageSerializer, ReviewSerializer,
+    ThreadSerializer
 )
 
 class SkillViewSet(viewsets.ModelViewSet):
@@ -25,10 +30,9 @@ class ProfileViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
 
     def perform_create(self, serializer):
-       user = self.request.user
-       if Profile.objects.filter(user=user).exists():
+       if request_profile(self.request) is not None:
         raise serializers.ValidationError("Profile already exists for this user.")
-       serializer.save(user=user)
+       self.request.profile = serializer.save(user=self.request.user)
 
 
     def create(self, request, *args, **kwargs):
@@ -46,12 +50,21 @@ class ProjectViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         queryset = Project.objects.all()
         skill = self.request.query_params.get('skill')
+        match = self.request.query_params.get('match', 'any')
         budget_min = self.request.query_params.get('budget_min')
         budget_max = self.request.query_params.get('budget_max')
         duration_max = self.request.query_params.get('duration_max')
 
         if skill:
-            queryset = queryset.filter(skills_required__name__icontains=skill)
+            # ?skill=python,django: projects needing any of them (all of them with &match=all)
+            names = {normalize_skill_name(name) for name in skill.split(',')} - {''}
+            if match not in ('any', 'all'):
+                raise serializers.ValidationError({'match': "Use 'any' or 'all'."})
+            if match == 'all':
+                for name in names:
+                    queryset = queryset.filter(self.requires_skills([name]))
+            elif names:
+                queryset = queryset.filter(self.requires_skills(names))
 
         if budget_min:
             queryset = queryset.filter(budget__gte=budget_min)
@@ -62,19 +75,23 @@ class ProjectViewSet(viewsets.ModelViewSet):
         if duration_max:
             queryset = queryset.filter(duration_weeks__lte=duration_max)
 
-        return queryset.distinct()
+        # EXISTS instead of joins: one row per project, no DISTINCT needed
+        return queryset
+
+    @staticmethod
+    def requires_skills(names):
+        # correlated on the (project, skill) index of the m2m table
+        return Exists(
+            Project.skills_required.through.objects.filter(
+                project_id=OuterRef('pk'), skill__normalized_name__in=names
+            )
+        )
     
     def perform_create(self, serializer):
-       try:
-        profile = Profile.objects.get(user=self.request.user)
-        print("Creating project for:", profile)
-        serializer.save(client=profile)
-       except Profile.DoesNotExist:
-        print("No profile found for user:", self.request.user)
+       profile = request_profile(self.request)
+       if profile is None:
         raise serializers.ValidationError("Client profile not found.")
-       except Exception as e:
-        print("Unexpected error during project creation:", e)
-        raise
+       serializer.save(client=profile)
 
 class ProposalViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
@@ -82,26 +99,21 @@ class ProposalViewSet(viewsets.ModelViewSet):
     queryset = Proposal.objects.all()
 
     def perform_create(self, serializer):
-        try:
-            profile = Profile.objects.get(user=self.request.user)
-            print("Profile found:", profile)
-            serializer.save(freelancer=profile)
-        except Profile.DoesNotExist:
-            print("No profile found for user:", self.request.user)
+        profile = request_profile(self.request)
+        if profile is None:
             raise serializers.ValidationError("Freelancer profile not found.")
+        serializer.save(freelancer=profile)
 
     def get_queryset(self):
-        try:
-            profile = Profile.objects.get(user=self.request.user)
-            print(f"Fetching proposals for role: {profile.role}")
-            if profile.role == 'client':
-                return Proposal.objects.filter(project__client=profile)
-            elif profile.role == 'freelancer':
-                return Proposal.objects.filter(freelancer=profile)
-            else:
-                return Proposal.objects.none()
-        except Profile.DoesNotExist:
-            print("No profile found for user:", self.request.user)
+        # the same profile perform_create sees; loaded once per request
+        profile = request_profile(self.request)
+        if profile is None:
+            return Proposal.objects.none()
+        if profile.role == 'client':
+            return Proposal.objects.filter(project__client=profile)
+        elif profile.role == 'freelancer':
+            return Proposal.objects.filter(freelancer=profile)
+        else:
             return Proposal.objects.none()
 
 class ContractViewSet(viewsets.ModelViewSet):
@@ -112,6 +124,44 @@ class MessageViewSet(viewsets.ModelViewSet):
     queryset = Message.objects.all()
     serializer_class = MessageSerializer
 
+    def get_queryset(self):
+        user = self.request.user
+        return Message.objects.filter(Q(sender=user) | Q(receiver=user))
+
+    def perform_create(self, serializer):
+        # Message.save() files the message under its thread
+        serializer.save(sender=self.request.user)
+
+class ThreadHistoryPagination(CursorPagination):
+    page_size = 50
+    ordering = '-timestamp'
+
+class ThreadViewSet(viewsets.ReadOnlyModelViewSet):
+    """Inbox: one row per conversation, newest first, with the caller's unread count."""
+    queryset = Thread.objects.all()
+    serializer_class = ThreadSerializer
+
+    def get_queryset(self):
+        return (
+            Thread.for_participant(self.request.user)
+            .select_related('user_low', 'user_high', 'last_message')
+            .order_by(F('last_message_at').desc(nulls_last=True), '-id')
+        )
+
+    @action(detail=True)
+    def messages(self, request, pk=None):
+        # walks the (thread, timestamp) index, newest first
+        thread = self.get_object()
+        paginator = ThreadHistoryPagination()
+        page = paginator.paginate_queryset(thread.messages.all(), request, view=self)
+        return paginator.get_paginated_response(MessageSerializer(page, many=True).data)
+
+    @action(detail=True, methods=['post'])
+    def read(self, request, pk=None):
+        thread = self.get_object()
+        thread.mark_read(request.user)
+        return Response({'unread': 0})
+
 class ReviewViewSet(viewsets.ModelViewSet):
     queryset = Review.objects.all()
     serializer_class = ReviewSerializer